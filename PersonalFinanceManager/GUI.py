@@ -3,23 +3,294 @@ Author - CodeVaanar
 Date - 25-10-2025
 Desc - A clean and interactive Tkinter-based interface that allows users to easily add, view, and search financial transactions. The design focuses on simplicity and usability, with organized windows, dropdowns, and summaries to make expense tracking intuitive and visually clear
 '''
+import time
+#--startup-time measures time-to-first-window from here, so the imports below are included
+_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk,messagebox
-import pft 
-import pandas as pd 
+import tkinter.font as tkfont
+import pft
 import datetime
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 import sys
-from tkcalendar import DateEntry
+#tkcalendar is imported by open_win1 the first time a date is picked, not at startup
+
+#--startup-time warns when the first window takes longer than this
+STARTUP_BUDGET_MS = 1000
 
 
+def row_values(row):
+    '''the strings a transaction is shown with in a table'''
+    if isinstance(row, dict):
+        date_val = row.get("Date", "")
+        if isinstance(date_val, datetime.date):
+            date_val = date_val.strftime("%d-%m-%Y")
 
-def start_gui():
+        amount_val = row.get("Amount", "")
+        if isinstance(amount_val, Decimal):
+            amount_val = str(amount_val)
+
+        return (
+            date_val,
+            amount_val,
+            row.get("Type", ""),
+            row.get("Description", "")
+        )
+    return tuple(row)  # In case it’s already a tuple/list
+
+
+def breakdown_columns(by, metrics):
+    '''the Breakdown table's columns - the groups picked in the comboboxes as aggregate spells them in its rows, then the metrics'''
+    return pft.group_keys(by) + list(metrics)
+
+
+def breakdown_values(row, columns):
+    '''the strings an aggregate row is shown with in the Breakdown table'''
+    return tuple(str(row[col]) for col in columns)
+
+
+class PagedTable(tk.Frame):
+    '''
+    a Treeview that only holds the rows currently on screen. rows is any sequence of
+    transactions (the TransactionStore itself or a search result) and is read page by page
+    as the user scrolls, so opening a window costs one page of inserts however long the
+    ledger is. call refresh() after the rows changed to redraw the visible page in place.
+    other rows can be shown by passing their columns and a values(row) function.
+    rows the worker thread can change are read only while holding lock (Worker.lock)
+    '''
+
+    #used only when neither the theme nor the font tells the row height
+    ROW_HEIGHT = 20
+    #a redraw the worker's lock put off is tried again after this long
+    RETRY_MS = 50
+
+    def __init__(self, master, rows, index = False, width = 120,
+                 columns = ("Date","Amount","Type","Description"), values = row_values, lock = None):
+        super().__init__(master)
+        self.lock = lock
+        self._retry = None
+        self.total = 0
+        self.rows = rows
+        self.index = index
+        self.values = values
+        self.top = 0
+        self.page = 20
+        self.row_height = self._row_height()
+
+        columns = (("Index",) if index else ()) + tuple(columns)
+        self.tree = ttk.Treeview(self, columns = columns, show ="headings", height = self.page)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor="center")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        #the tree never scrolls itself, wheel and resize events move the page instead
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e : self._scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e : self._scroll(-3))
+        self.tree.bind("<Button-5>", lambda e : self._scroll(3))
+        self.refresh()
+
+    def yview(self, *args):
+        '''scrollbar command - "moveto fraction" or "scroll n units|pages"'''
+        if args[0] == "moveto":
+            #the row count of the last redraw, the rows themselves are only read by _draw
+            self.top = int(float(args[1]) * self.total)
+            self.refresh()
+        elif args[0] == "scroll":
+            step = self.page if args[2] == "pages" else 1
+            self._scroll(int(args[1]) * step)
+
+    def _scroll(self, rows):
+        self.top += rows
+        self.refresh()
+        return "break"
+
+    def _row_height(self):
+        '''pixel height of one tree row - the theme's rowheight, else the line height of its font'''
+        style = ttk.Style(self)
+        try:
+            height = int(style.lookup("Treeview", "rowheight") or 0)
+        except (ValueError, tk.TclError):
+            height = 0
+        if height <= 0:
+            try:
+                height = tkfont.Font(root = self, font = style.lookup("Treeview", "font") or "TkDefaultFont").metrics("linespace")
+            except tk.TclError:
+                height = 0
+        return height if height > 0 else self.ROW_HEIGHT
+
+    def _on_resize(self, event):
+        #one row is taken by the headings. a page taller than the tree would leave the last rows out of reach
+        page = max(1, event.height // self.row_height - 1)
+        if page != self.page:
+            self.page = page
+            self.refresh()
+
+    def refresh(self):
+        '''redraws the visible page from rows - only the on-screen items are touched'''
+        if self.lock is None:
+            self._draw()
+            return
+        #the Tk thread never waits on a running job, the redraw is put off until the worker is idle
+        if not self.lock.acquire(blocking = False):
+            if self._retry is None:
+                self._retry = self.after(self.RETRY_MS, self._retry_refresh)
+            return
+        try:
+            self._draw()
+        finally:
+            self.lock.release()
+
+    def _retry_refresh(self):
+        self._retry = None
+        if self.winfo_exists():
+            self.refresh()
+
+    def _draw(self):
+        total = self.total = len(self.rows)
+        self.top = max(0, min(self.top, total - self.page))
+        end = min(self.top + self.page, total)
+
+        items = self.tree.get_children()
+        for slot, i in enumerate(range(self.top, end)):
+            values = self.values(self.rows[i])
+            if self.index:
+                values = (i,) + values
+            if slot < len(items):
+                self.tree.item(items[slot], values=values)
+            else:
+                self.tree.insert("", tk.END, values=values)
+        if len(items) > end - self.top:
+            self.tree.delete(*items[end - self.top:])
+
+        if total:
+            self.scrollbar.set(self.top / total, end / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+
+class Worker:
+    '''
+    runs ledger work off the Tk thread. jobs run one at a time and in order on a single
+    background thread, so a search never races a write. results and info messages are
+    queued and handed to the Tk thread by a poll scheduled with root.after - tkinter
+    widgets are only ever touched from the Tk thread. every job runs holding lock, which
+    the Tk thread takes too before it reads the store (see PagedTable)
+    '''
+
+    POLL_MS = 50
+
+    def __init__(self, root):
+        self.root = root
+        self.lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers = 1)
+        self._results = queue.Queue()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def post(self, func, *args):
+        '''runs func(*args) on the Tk thread'''
+        self._results.put((func, args))
+
+    def info_callback(self, msg):
+        '''info callback for pft calls made on the worker - the message box opens on the Tk thread'''
+        self.post(messagebox.showinfo, "Info", msg)
+
+    def submit(self, job, on_done = None):
+        '''runs job() on the worker thread and then on_done(result) on the Tk thread'''
+        def run():
+            try:
+                with self.lock:
+                    result = job()
+            except Exception as e :
+                self.post(messagebox.showerror, "Error", f"Unexpected error : {e}")
+                return
+            if on_done:
+                self.post(on_done, result)
+        return self._pool.submit(run)
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    func, args = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+        finally:
+            self.root.after(self.POLL_MS, self._poll)
+
+    def shutdown(self):
+        self._pool.shutdown(wait = False, cancel_futures = True)
+
+
+def import_costs(module = "GUI"):
+    '''
+    imports module in a fresh interpreter with -X importtime and returns [(name, cumulative ms)]
+    for each module it imports directly, most expensive first
+    '''
+    import subprocess
+
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output = True, text = True, cwd = sys.path[0] or None)
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        #the nesting of an import is shown by two spaces of indent per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1000))
+
+    #entries are listed after their own imports, so the direct imports of module are the
+    #depth 1 entries in the block just above its own depth 0 line
+    costs = []
+    for i, (depth, name, ms) in enumerate(entries):
+        if depth == 0 and name == module:
+            j = i - 1
+            while j >= 0 and entries[j][0] > 0:
+                if entries[j][0] == 1:
+                    costs.append(entries[j][1:])
+                j -= 1
+            costs.append(("total", ms))
+            break
+    return sorted(costs, key = lambda cost : cost[1], reverse = True)
+
+
+def startup_report():
+    '''prints the cost of each import of the GUI module, measured in a cold interpreter'''
+    print("Import costs (cumulative, fresh interpreter) :")
+    for name, ms in import_costs():
+        print(f"  {name:<30} {ms:8.1f} ms")
+
+
+def start_gui(startup_time = False):
     root = tk.Tk()
     root.title("Personal Finance Tracker")
     tk.Label(root, text = "Personal Finance Tracker", font =("helvetica",20)).pack(pady=10)
 
-    transactions = pft.load_transaction()  
+    worker = Worker(root)
+    #the window opens right away with an empty store, the ledger is loaded on the worker
+    transactions = pft.TransactionStore()
+
+    def search_rows(search, positions, key, info_callback):
+        #the store answers from its indexes without decoding the matches, anything else goes through pft
+        if isinstance(transactions, pft.TransactionStore):
+            #the view re-runs the query after a delete moves the rows, fixed positions would go stale
+            view = pft.TransactionView(transactions, lambda : positions(key))
+            if len(view):
+                return view
+        return search(transactions, key, info_callback)
 
     def open_win1():
         win1 = tk.Toplevel(root)
@@ -31,6 +302,8 @@ def start_gui():
         tk.Label(win1, text = "Enter the type of transaction :").grid(row=2)
         tk.Label(win1,text = "Enter the Description of transaction :").grid(row =3)
         
+        from tkcalendar import DateEntry
+
         date_entry = DateEntry(win1, date_pattern="dd-mm-yyyy", background="darkblue",foreground="white", borderwidth=2,state = "readonly")
         date_entry.grid(row=0,column=1)
 
@@ -47,10 +320,11 @@ def start_gui():
 
         
         def submit():
-            pft.add_transaction(transactions,
-                date_entry.get(), e2.get(),e3.get(),e4.get(),
-                info_callback = lambda msg : messagebox.showinfo("Info",msg)
-            )        
+            entry = (date_entry.get(), e2.get(),e3.get(),e4.get())
+            worker.submit(lambda : pft.add_transaction(transactions,
+                *entry,
+                info_callback = worker.info_callback
+            ))
 
             win1.destroy()
 
@@ -62,11 +336,14 @@ def start_gui():
         win2.title("View summary")
         win2.geometry("400x300")
 
-        results = pft.view_summary(transactions,info_callback = lambda msg : messagebox.showinfo("Info",msg))
+        def show(results):
+            if results is None or not win2.winfo_exists():
+                return
+            tk.Label(win2 , text = f"Net Income : {results[0]}" , font = ("Arial", 15 )).pack(pady=15)
+            tk.Label(win2 , text = f"Net Expense : {results[1]}" , font = ("Arial", 15 )).pack(pady=15)
+            tk.Label(win2 , text = f"Net Balance : {results[2]}" , font =("Arial", 15 )).pack(pady=15)
 
-        tk.Label(win2 , text = f"Net Income : {results[0]}" , font = ("Arial", 15 )).pack(pady=15)
-        tk.Label(win2 , text = f"Net Expense : {results[1]}" , font = ("Arial", 15 )).pack(pady=15)
-        tk.Label(win2 , text = f"Net Balance : {results[2]}" , font =("Arial", 15 )).pack(pady=15)
+        worker.submit(lambda : pft.view_summary(transactions,info_callback = worker.info_callback), show)
 
         
 
@@ -89,45 +366,21 @@ def start_gui():
             win301.title("Transaction based on type")
             win301.geometry("500x600")
 
-            result = pft.search_by_type(transactions,selected_type,info_callback = lambda msg : messagebox.showinfo("Info",msg))
-
-            if not result:
-                tk.Label(win301, text = "No transactions records were found on the given type").pack(pady=20)
-                return 
-            
-            column = ("Date","Amount","Type","Description")
-            tree = ttk.Treeview(win301,columns = column , show ="headings")
-
-            for col in column:
-                tree.heading(col, text=col)
-                tree.column(col, width=120, anchor="center")
-
-            for row in result:
-                if isinstance(row, dict):
-                    date_val = row.get("Date", "")
-                    if isinstance(date_val, datetime.date):
-                        date_val = date_val.strftime("%d-%m-%Y")
-
-                    amount_val = row.get("Amount", "")
-                    if isinstance(amount_val, Decimal):
-                        amount_val = str(amount_val)
-
-                    values = (
-                        date_val,
-                        amount_val,
-                        row.get("Type", ""),
-                        row.get("Description", "")
-                    )
-                else:
-                    values = row  # In case it’s already a tuple/list
-
-                tree.insert("", tk.END, values=values)
+            status = tk.Label(win301, text = "Searching ...")
+            status.pack(pady=20)
 
-            scrollbar = ttk.Scrollbar(win301, orient="vertical", command=tree.yview)
-            tree.configure(yscrollcommand=scrollbar.set)
+            def show(result):
+                if not win301.winfo_exists():
+                    return
+                if not result:
+                    status.config(text = "No transactions records were found on the given type")
+                    return
+                status.destroy()
+                table = PagedTable(win301, result, lock = worker.lock)
+                table.pack(fill="both", expand=True, padx=10, pady=10)
 
-            tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-            scrollbar.pack(side="right", fill="y")
+            worker.submit(lambda : search_rows(pft.search_by_type, transactions.positions_by_type, selected_type,
+                                               info_callback = worker.info_callback), show)
 
 
         tk.Button(win3, text="Search", command = open_win301, bg="#B82222", fg="white", font=("Arial", 12, "bold"), activebackground="#45a049").grid(row=5, column=2)
@@ -152,45 +405,21 @@ def start_gui():
             win401.title("Transaction based on Description")
             win401.geometry("500x600")
 
-            result = pft.search_by_desc(transactions,selected_desc,info_callback = lambda msg : messagebox.showinfo("Info",msg))
-
-            if not result:
-                tk.Label(win401, text = "No transactions records were found on the given Description").pack(pady=20)
-                return 
-            
-            column = ("Date","Amount","Type","Description")
-            tree = ttk.Treeview(win401,columns = column , show ="headings")
-
-            for col in column:
-                tree.heading(col, text=col)
-                tree.column(col, width=120, anchor="center")
-
-            for row in result:
-                if isinstance(row, dict):
-                    date_val = row.get("Date", "")
-                    if isinstance(date_val, datetime.date):
-                        date_val = date_val.strftime("%d-%m-%Y")
-
-                    amount_val = row.get("Amount", "")
-                    if isinstance(amount_val, Decimal):
-                        amount_val = str(amount_val)
-
-                    values = (
-                        date_val,
-                        amount_val,
-                        row.get("Type", ""),
-                        row.get("Description", "")
-                    )
-                else:
-                    values = row  # In case it’s already a tuple/list
-
-                tree.insert("", tk.END, values=values)
+            status = tk.Label(win401, text = "Searching ...")
+            status.pack(pady=20)
 
-            scrollbar = ttk.Scrollbar(win401, orient="vertical", command=tree.yview)
-            tree.configure(yscrollcommand=scrollbar.set)
+            def show(result):
+                if not win401.winfo_exists():
+                    return
+                if not result:
+                    status.config(text = "No transactions records were found on the given Description")
+                    return
+                status.destroy()
+                table = PagedTable(win401, result, lock = worker.lock)
+                table.pack(fill="both", expand=True, padx=10, pady=10)
 
-            tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-            scrollbar.pack(side="right", fill="y")
+            worker.submit(lambda : search_rows(pft.search_by_desc, transactions.positions_by_desc, selected_desc,
+                                               info_callback = worker.info_callback), show)
 
         tk.Button(win4, text="Search", command = open_win401, bg="#B82222", fg="white", font=("Arial", 12, "bold"), activebackground="#45a049").grid(row=5, column=2)
 
@@ -214,33 +443,14 @@ def start_gui():
         delete_btn = tk.Button(win5, text="Delete", bg="red", fg="white")
         delete_btn.grid(row=0, column=2, padx=10, pady=10, sticky="w")
 
-        # --- Table (Treeview) Setup ---
-        d1 = pd.DataFrame(transactions)
-        columns = ["Index"] + list(d1.columns)
-
-        tree = ttk.Treeview(win5, columns=columns, show="headings")
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, anchor='center', width=110)
-        tree.grid(row=1, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")
-
-        scrollbar = ttk.Scrollbar(win5, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.grid(row=1, column=3, sticky='ns')
-
-        # --- Load All Data At Once ---
-        for idx, row in d1.iterrows():
-            tree.insert("", "end", values=[idx] + list(row))
+        # --- Table Setup - rows are read from the store as they scroll into view ---
+        table = PagedTable(win5, transactions, index = True, width = 110, lock = worker.lock)
+        table.grid(row=1, column=0, columnspan=4, padx=10, pady=10, sticky="nsew")
 
         # --- Backend Functions ---
-        def info_callback(msg):
-            messagebox.showinfo("Info", msg)
-
         def reload_table():
-            tree.delete(*tree.get_children())
-            new_df = pd.DataFrame(transactions)
-            for idx, row in new_df.iterrows():
-                tree.insert("", "end", values=[idx] + list(row))
+            #the store is updated in place, so only the visible page needs redrawing
+            table.refresh()
 
         def delete_from_backend():
             try:
@@ -250,8 +460,9 @@ def start_gui():
                     return
                 confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete transaction {idx}?")
                 if confirm:
-                    pft.delete_transaction(transactions, int(idx), info_callback)
-                    reload_table()
+                    index = int(idx)
+                    worker.submit(lambda : pft.delete_transaction(transactions, index, worker.info_callback),
+                                  lambda result : reload_table())
             except ValueError:
                 messagebox.showinfo("Error", "Please enter a valid numeric Index")
 
@@ -259,11 +470,53 @@ def start_gui():
 
 
     def open_win6():
-        def info_callback(msg):
-            messagebox.showinfo("Info", msg)
         confirm = messagebox.askyesno("Confirm Delete", "Are you Sure you want to delete all the transactions")
         if confirm:
-            pft.delete_all(transactions, info_callback)
+            worker.submit(lambda : pft.delete_all(transactions, worker.info_callback))
+
+
+    def open_win7():
+        win7 = tk.Toplevel(root)
+        win7.title("Breakdown")
+        win7.geometry("700x500")
+
+        win7.grid_rowconfigure(1, weight=1)
+        win7.grid_columnconfigure(4, weight=1)
+
+        groups = ["Month","Year","Type","Description"]
+        tk.Label(win7, text ="Group by :").grid(row=0, column=0, padx=10, pady=10, sticky="w")
+        e1 = ttk.Combobox(win7, values = groups, state = "readonly", width = 12)
+        e1.set("Month")
+        e1.grid(row=0, column=1, padx=5)
+
+        tk.Label(win7, text ="then by :").grid(row=0, column=2, padx=10, sticky="w")
+        e2 = ttk.Combobox(win7, values = ["None"] + groups, state = "readonly", width = 12)
+        e2.set("Description")
+        e2.grid(row=0, column=3, padx=5)
+
+        metrics = ["sum","count","mean"]
+        shown = []
+
+        def show(by, result):
+            if not win7.winfo_exists() or not result:
+                return
+            for table in shown:
+                table.destroy()
+            columns = breakdown_columns(by, metrics)
+            table = PagedTable(win7, result, width = 100, columns = columns,
+                               values = lambda row : breakdown_values(row, columns))
+            table.grid(row=1, column=0, columnspan=6, padx=10, pady=10, sticky="nsew")
+            shown[:] = [table]
+
+        def run():
+            by = [e1.get()]
+            if e2.get() not in ("None", e1.get()):
+                by.append(e2.get())
+            worker.submit(lambda : pft.aggregate(transactions, by, metrics, worker.info_callback),
+                          lambda result : show(by, result))
+
+        tk.Button(win7, text="Show", command = run, bg="#4CAF50", fg="white", font=("Arial", 12, "bold"), activebackground="#45a049").grid(row=0, column=5, padx=10)
+        run()
         
 
 
@@ -277,6 +530,79 @@ def start_gui():
     tk.Button(btn_frame,text ="Search by Type", command = open_win4).grid(row=1,column = 0,padx = 10, pady = 10)
     tk.Button(btn_frame,text ="Delete", command = open_win5).grid(row=1,column = 1,padx = 10, pady = 10)
     tk.Button(btn_frame,text ="Delete All", command = open_win6).grid(row=1,column = 2,padx = 10, pady = 10)
+    tk.Button(btn_frame,text ="Breakdown", command = open_win7).grid(row=2,column = 1,padx = 10)
+
+    # --- Background load with progress and cancel ---
+    status_frame = tk.Frame(root)
+    status_frame.pack(fill = "x", padx = 10, pady = 10)
+    status = tk.Label(status_frame, text = "Loading transactions ...")
+    status.pack(side = "left")
+    progress = ttk.Progressbar(status_frame, mode = "determinate", maximum = 100, length = 200)
+    progress.pack(side = "left", padx = 10)
+    load_btn = tk.Button(status_frame, text = "Cancel")
+    load_btn.pack(side = "left")
+    cancel = threading.Event()
+
+    def set_buttons(state):
+        for button in btn_frame.winfo_children():
+            button.config(state = state)
+
+    def on_progress(done, total):
+        #called on the worker - only the value is handed over, the bar is set on the Tk thread
+        worker.post(progress.config, {"value" : done * 100 / max(total, 1)})
+
+    def on_loaded(loaded):
+        nonlocal transactions
+        if loaded is None:
+            #the buttons stay disabled, nothing should run against a ledger that was not loaded
+            status.config(text = "Loading cancelled - no transactions loaded")
+            load_btn.config(text = "Load", command = start_load)
+            return
+        transactions = loaded
+        set_buttons("normal")
+        progress.config(value = 100)
+        status.config(text = f"{len(transactions)} transactions loaded")
+        load_btn.config(text = "Reload", command = reload)
+
+    def reload():
+        #picks up rows other processes appended - in place, so open windows keep working on the same store
+        load_btn.config(state = "disabled")
+
+        def done(added):
+            load_btn.config(state = "normal")
+            status.config(text = f"{len(transactions)} transactions loaded")
+
+        worker.submit(lambda : pft.reload_transaction(transactions, worker.info_callback), done)
+
+    def start_load():
+        cancel.clear()
+        set_buttons("disabled")
+        progress.config(value = 0)
+        status.config(text = "Loading transactions ...")
+        load_btn.config(text = "Cancel", command = cancel.set)
+        worker.submit(lambda : pft.load_transaction(worker.info_callback, snapshot = True,
+                                                    progress = on_progress, cancel = cancel), on_loaded)
+
+    def on_close():
+        cancel.set()
+        worker.shutdown()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    start_load()
+
+    if startup_time:
+        def on_first_map(event):
+            if event.widget is not root:
+                return
+            root.unbind("<Map>")
+            elapsed = (time.perf_counter() - _STARTED) * 1000
+            print(f"Time to first window : {elapsed:.1f} ms")
+            if elapsed > STARTUP_BUDGET_MS:
+                print(f"Warning : over the startup budget of {STARTUP_BUDGET_MS} ms")
+            root.after_idle(on_close)
+
+        root.bind("<Map>", on_first_map)
 
 
     root.mainloop()
@@ -284,4 +610,10 @@ def start_gui():
 
 
 if __name__ == "__main__":
-    start_gui()
+    #python GUI.py --startup-time : reports import costs and time-to-first-window, then exits
+    if "--startup-time" in sys.argv:
+        #the window is timed first, the import report starts a subprocess that would land inside that time
+        start_gui(startup_time = True)
+        startup_report()
+    else:
+        start_gui()
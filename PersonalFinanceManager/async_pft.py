@@ -0,0 +1,203 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - asyncio facade for pft. every call runs the blocking pft function on a bounded thread pool, readers share the ledger and the in-memory transactions while writers get them to themselves, so an async service can serve hundreds of concurrent requests without blocking its event loop
+'''
+
+import os
+import asyncio
+import weakref
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pft
+
+#threads the blocking pft calls run on. requests above this wait their turn in the pool queue
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_executor = None
+_executor_lock = threading.Lock()
+#one lock per event loop - asyncio primitives cannot be shared between loops
+_locks = weakref.WeakKeyDictionary()
+#lock releases scheduled for jobs whose caller was cancelled, held here so they are not garbage collected
+_releasing = set()
+
+
+class ReadWriteLock:
+    '''
+    asyncio readers-writer lock. any number of readers hold it together, a writer holds it alone.
+    a waiting writer stops new readers from getting in, so a steady stream of reads cannot starve it
+    '''
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    async def acquire_read(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda : not self._writer and not self._waiting_writers)
+            self._readers += 1
+
+    async def release_read(self):
+        async with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    async def acquire_write(self):
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(lambda : not self._writer and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+
+    async def release_write(self):
+        async with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+def _lock():
+    loop = asyncio.get_running_loop()
+    lock = _locks.get(loop)
+    if lock is None:
+        lock = _locks[loop] = ReadWriteLock()
+    return lock
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers = MAX_WORKERS, thread_name_prefix = "pft-async")
+        return _executor
+
+
+def shutdown(wait = True):
+    '''stops the worker threads. the next call starts a fresh pool'''
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait = wait)
+
+
+def _release_when_done(fut, release):
+    #the awaiting task was cancelled while the job still runs on its thread, keep the lock until the job ends
+    def done(fut):
+        if not fut.cancelled():
+            fut.exception()
+        task = asyncio.ensure_future(release())
+        _releasing.add(task)
+        task.add_done_callback(_releasing.discard)
+    fut.add_done_callback(done)
+
+
+async def _run(release, func, *args, **kwargs):
+    #the lock is already held. it is given up once the executor job itself has finished, not when the caller stops waiting
+    loop = asyncio.get_running_loop()
+    try:
+        fut = loop.run_in_executor(_pool(), functools.partial(func, *args, **kwargs))
+    except BaseException:
+        await release()
+        raise
+    try:
+        return await asyncio.shield(fut)
+    finally:
+        if fut.done():
+            await release()
+        else:
+            _release_when_done(fut, release)
+
+
+async def _read(func, *args, **kwargs):
+    lock = _lock()
+    await lock.acquire_read()
+    return await _run(lock.release_read, func, *args, **kwargs)
+
+
+async def _write(func, *args, **kwargs):
+    lock = _lock()
+    await lock.acquire_write()
+    return await _run(lock.release_write, func, *args, **kwargs)
+
+
+#info_callback is called on the worker thread, use loop.call_soon_threadsafe in it to reach the loop
+
+async def async_load_transaction(info_callback = None, workers = None, snapshot = False):
+    return await _read(pft.load_transaction, info_callback, workers = workers, snapshot = snapshot)
+
+
+async def async_reload_transaction(transactions, info_callback = None):
+    #refills transactions in place, so no reader may be walking it meanwhile
+    return await _write(pft.reload_transaction, transactions, info_callback)
+
+
+async def async_save_transaction(new_transaction, info_callback = None):
+    return await _write(pft.save_transaction, new_transaction, info_callback)
+
+
+async def async_add_transaction(transactions, date_input, amt, type_, desc, info_callback = None):
+    return await _write(pft.add_transaction, transactions, date_input, amt, type_, desc, info_callback)
+
+
+async def async_add_transactions(transactions, entries, info_callback = None, fsync = False):
+    return await _write(pft.add_transactions, transactions, entries, info_callback, fsync = fsync)
+
+
+async def async_view_summary(transactions, info_callback = None, verify = False):
+    if isinstance(transactions, pft.TransactionStore) and not verify:
+        #answered from the running totals, cheaper than the hop to a worker thread
+        lock = _lock()
+        await lock.acquire_read()
+        try:
+            return pft.view_summary(transactions, info_callback)
+        finally:
+            await lock.release_read()
+    return await _read(pft.view_summary, transactions, info_callback, verify = verify)
+
+
+async def async_search_by_type(transactions, type_, info_callback = None):
+    return await _read(pft.search_by_type, transactions, type_, info_callback)
+
+
+async def async_search_by_desc(transactions, desc, info_callback = None):
+    return await _read(pft.search_by_desc, transactions, desc, info_callback)
+
+
+async def async_search_by_date_range(transactions, start, end, info_callback = None):
+    return await _read(pft.search_by_date_range, transactions, start, end, info_callback)
+
+
+async def async_summary_between(transactions, start, end, info_callback = None):
+    return await _read(pft.summary_between, transactions, start, end, info_callback)
+
+
+async def async_aggregate(transactions, by = ("month",), metrics = ("sum", "count"), info_callback = None):
+    return await _read(pft.aggregate, transactions, by, metrics, info_callback)
+
+
+async def async_build_rollup(transactions = None, info_callback = None):
+    return await _write(pft.build_rollup, transactions, info_callback)
+
+
+async def async_rollup(by = ("month", "Type", "Description"), info_callback = None):
+    #rebuilds the rollup file when it is out of date, so it counts as a write
+    return await _write(pft.rollup, by, info_callback)
+
+
+async def async_delete_transaction(transactions, index_val, info_callback = None):
+    return await _write(pft.delete_transaction, transactions, index_val, info_callback)
+
+
+async def async_delete_all(transactions, info_callback = None):
+    return await _write(pft.delete_all, transactions, info_callback)
+
+
+async def async_compact_ledger(info_callback = None):
+    return await _write(pft.compact_ledger, info_callback)
@@ -0,0 +1,272 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - Reproducible benchmark harness for pft. Generates deterministic synthetic ledgers (10k to 10M rows, skewed Type/Description mix, a chosen share of malformed rows), times the main pft operations on them, records throughput and peak memory as JSON and fails the run when results regress against a saved baseline
+'''
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pft
+
+#realistic skew - mostly debits, a few rows typed in other cases like hand edited ledgers
+TYPES = ["DEBIT", "CREDIT", "debit", "Credit"]
+TYPE_WEIGHTS = [70, 20, 6, 4]
+#the GUI categories, zipf weighted so a few descriptions dominate
+DESCRIPTIONS = ["fun", "grocery", "takeout", "bills", "travel", "shopping", "rent", "medicine", "salary", "gifting", "others"]
+DESC_WEIGHTS = [1 / rank for rank in range(1, len(DESCRIPTIONS) + 1)]
+START_DATE = date(2020, 1, 1)
+DAYS = 5 * 365
+
+#broken rows of each kind the loader skips
+MALFORMED = [
+    "{date},{amount},{type},",
+    "{date},12a.5,{type},{desc}",
+    "31-02-2024,{amount},{type},{desc}",
+    "2024/01/05,{amount},{type},{desc}",
+]
+
+OPERATIONS = ("load_transaction", "view_summary", "search_by_type", "search_by_desc",
+              "save_transaction", "add_transaction", "delete_transaction", "delete_all")
+#calls made for the operations that touch one transaction at a time
+CALLS = 1000
+DELETES = 100
+
+#ledger codecs to compare - smaller files cost less disk I/O but more CPU to decode
+CODECS = {"none" : "", "gzip" : ".gz", "bz2" : ".bz2", "xz" : ".xz"}
+
+#slower than the baseline by more than this fraction (and MIN_DELTA seconds) is a regression
+TOLERANCE = 0.25
+MIN_DELTA = 0.005
+#so is a peak above the baseline's by more than the tolerance and MIN_BYTES - smaller peaks are allocator noise
+MIN_BYTES = 64 * 1024
+
+
+def generate_ledger(path, rows, malformed = 0.01, seed = 0):
+    '''
+    writes a ledger of rows data rows to path. the same rows, malformed share and seed always
+    give the same file. returns the number of malformed rows written
+    '''
+    rng = random.Random(seed)
+    dates = [(START_DATE + timedelta(days = d)).strftime("%d-%m-%Y") for d in range(DAYS)]
+    bad = 0
+    with open(path, mode ="w", newline ="", encoding ="utf-8") as file :
+        file.write(",".join(pft.EXPECTED_FIELDS) + "\n")
+        for start in range(0, rows, 100000):
+            count = min(100000, rows - start)
+            types = rng.choices(TYPES, weights = TYPE_WEIGHTS, k = count)
+            descs = rng.choices(DESCRIPTIONS, weights = DESC_WEIGHTS, k = count)
+            lines = []
+            for type_, desc in zip(types, descs):
+                row = {
+                    "date" : dates[rng.randrange(DAYS)],
+                    "amount" : f"{min(rng.lognormvariate(4, 1.3), 99999):.2f}",
+                    "type" : type_,
+                    "desc" : desc
+                }
+                if malformed and rng.random() < malformed:
+                    lines.append(rng.choice(MALFORMED).format(**row))
+                    bad += 1
+                else:
+                    lines.append(f"{row['date']},{row['amount']},{row['type']},{row['desc']}")
+            file.write("\n".join(lines) + "\n")
+    return bad
+
+
+def _operations(rng, path):
+    '''(name, run(state) -> work done, unit) for every operation on the ledger at path, in the order they are run'''
+    skipped = []
+
+    def load(state):
+        state["transactions"] = pft.load_transaction(skipped.append, filename = path)
+        return len(state["transactions"])
+
+    def summary(state):
+        for _ in range(CALLS):
+            pft.view_summary(state["transactions"])
+        return CALLS
+
+    def by_type(state):
+        return len(pft.search_by_type(state["transactions"], "debit") or [])
+
+    def by_desc(state):
+        return len(pft.search_by_desc(state["transactions"], "fun") or [])
+
+    def save(state):
+        transaction = {"Date" : date(2025, 1, 1), "Amount" : Decimal("10.50"), "Type" : "DEBIT", "Description" : "fun"}
+        for _ in range(CALLS):
+            pft.save_transaction(transaction, skipped.append, filename = path)
+        return CALLS
+
+    def add(state):
+        for _ in range(CALLS):
+            pft.add_transaction(state["transactions"], "01-01-2025", "10.50", "debit", "fun", skipped.append,
+                                filename = path)
+        return CALLS
+
+    def delete(state):
+        for _ in range(DELETES):
+            pft.delete_transaction(state["transactions"], rng.randrange(len(state["transactions"])), skipped.append,
+                                   filename = path)
+        return DELETES
+
+    def delete_all(state):
+        count = len(state["transactions"])
+        pft.delete_all(state["transactions"], skipped.append, filename = path)
+        return count
+
+    return [
+        ("load_transaction", load, "rows"),
+        ("view_summary", summary, "calls"),
+        ("search_by_type", by_type, "rows"),
+        ("search_by_desc", by_desc, "rows"),
+        ("save_transaction", save, "calls"),
+        ("add_transaction", add, "calls"),
+        ("delete_transaction", delete, "calls"),
+        ("delete_all", delete_all, "rows"),
+    ]
+
+
+def compress_ledger(path, codec):
+    '''writes a compressed copy of the ledger at path next to it, returns the new path'''
+    target = path + CODECS[codec]
+    with open(path, mode ="rb") as source, pft._codec_module(codec).open(target, mode ="wb") as file :
+        shutil.copyfileobj(source, file, 1024 * 1024)
+    return target
+
+
+def _run_pass(ledger, workdir, seed, ops, memory, suffix = ""):
+    #every pass works on its own copy of the ledger, as the operations change it
+    path = os.path.join(workdir, ("memory.csv" if memory else "timing.csv") + suffix)
+    shutil.copyfile(ledger, path)
+    state = {}
+    results = {}
+    for name, run, unit in _operations(random.Random(seed), path):
+        if name not in ops and name != "load_transaction":
+            continue
+        if memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            run(state)
+            results[name] = tracemalloc.get_traced_memory()[1] - base
+        else:
+            start = time.perf_counter()
+            work = run(state)
+            seconds = time.perf_counter() - start
+            results[name] = {
+                "seconds" : round(seconds, 6),
+                "work" : work,
+                "unit" : unit,
+                "throughput" : round(work / seconds, 1) if seconds else None
+            }
+    return results
+
+
+def run_benchmark(rows, malformed = 0.01, seed = 0, ops = OPERATIONS, memory = True, codec = "none"):
+    '''
+    generates a ledger of rows rows, stored with codec, and measures ops on it.
+    returns {operation : measurements} - load_transaction also gets the ledger size on disk
+    '''
+    with tempfile.TemporaryDirectory() as workdir :
+        ledger = os.path.join(workdir, "ledger.csv")
+        generate_ledger(ledger, rows, malformed, seed)
+        if codec != "none":
+            ledger = compress_ledger(ledger, codec)
+        suffix = CODECS[codec]
+        results = _run_pass(ledger, workdir, seed, ops, memory = False, suffix = suffix)
+        results["load_transaction"]["ledger_bytes"] = os.path.getsize(ledger)
+        if memory:
+            tracemalloc.start()
+            try:
+                peaks = _run_pass(ledger, workdir, seed, ops, memory = True, suffix = suffix)
+            finally:
+                tracemalloc.stop()
+            for name, peak in peaks.items():
+                results[name]["peak_bytes"] = peak
+    return {name : results[name] for name in OPERATIONS if name in ops}
+
+
+def compare(report, baseline, tolerance = TOLERANCE):
+    '''
+    messages for every operation that got slower, or peaked higher in memory, than in the baseline
+    report. peaks are only compared when both runs measured them
+    '''
+    regressions = []
+    for size, results in report["runs"].items():
+        base_results = baseline.get("runs", {}).get(size, {})
+        for name, result in results.items():
+            base = base_results.get(name)
+            if not base:
+                continue
+            limit = base["seconds"] * (1 + tolerance)
+            if result["seconds"] > limit and result["seconds"] - base["seconds"] > MIN_DELTA:
+                regressions.append(f"{name} at {size} rows : {result['seconds']:.4f}s against "
+                                   f"{base['seconds']:.4f}s in the baseline")
+            if "peak_bytes" in result and "peak_bytes" in base:
+                limit = base["peak_bytes"] * (1 + tolerance)
+                if result["peak_bytes"] > limit and result["peak_bytes"] - base["peak_bytes"] > MIN_BYTES:
+                    regressions.append(f"{name} at {size} rows : {result['peak_bytes']:,} bytes peak against "
+                                       f"{base['peak_bytes']:,} bytes in the baseline")
+    return regressions
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "benchmark the pft operations on synthetic ledgers")
+    parser.add_argument("--rows", type = int, nargs ="+", default = [10000, 100000], help = "ledger sizes to run")
+    parser.add_argument("--malformed", type = float, default = 0.01, help = "share of malformed rows (0 - 1)")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--ops", nargs ="+", choices = OPERATIONS, default = list(OPERATIONS))
+    parser.add_argument("--codec", nargs ="+", choices = list(CODECS), default = ["none"],
+                        help = "store the ledger compressed - several show the disk I/O against CPU trade-off")
+    parser.add_argument("--no-memory", action ="store_true", help = "skip the tracemalloc pass")
+    parser.add_argument("--output", help = "write the results to this JSON file")
+    parser.add_argument("--baseline", help = "JSON results to compare against - regressions fail the run")
+    parser.add_argument("--tolerance", type = float, default = TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta" : {
+            "seed" : args.seed,
+            "malformed" : args.malformed,
+            "python" : platform.python_version(),
+            "platform" : platform.platform()
+        },
+        "runs" : {}
+    }
+    for rows in args.rows:
+        for codec in args.codec:
+            results = run_benchmark(rows, args.malformed, args.seed, args.ops, not args.no_memory, codec)
+            #plain runs keep the bare row count as their key so older baselines still compare
+            report["runs"][str(rows) if codec == "none" else f"{rows}-{codec}"] = results
+            for name, result in results.items():
+                peak = f"{result['peak_bytes'] / 1024 / 1024:9.1f} MiB" if "peak_bytes" in result else ""
+                disk = f"  {result['ledger_bytes'] / 1024 / 1024:9.1f} MiB on disk" if "ledger_bytes" in result else ""
+                print(f"{rows:>9} rows  {codec:<5} {name:<20} {result['seconds']:10.4f}s  "
+                      f"{result['throughput'] or 0:14,.0f} {result['unit']}/s  {peak}{disk}")
+
+    if args.output:
+        with open(args.output, mode ="w", encoding ="utf-8") as file :
+            json.dump(report, file, indent = 2)
+
+    if args.baseline:
+        with open(args.baseline, mode ="r", encoding ="utf-8") as file :
+            regressions = compare(report, json.load(file), args.tolerance)
+        for msg in regressions:
+            print(f"Regression : {msg}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
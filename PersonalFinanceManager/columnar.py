@@ -0,0 +1,205 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - Read-only columnar export of the ledger. Dates, amounts and category codes are stored as packed fixed-width arrays and opened with mmap, so analysis processes read the columns straight from the shared page cache instead of each loading its own copy of the transactions
+'''
+
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import pft
+
+_MAGIC = b"PFTCOL01"
+#magic, row count, header length
+_PREFIX = struct.Struct("<8sQQ")
+
+
+def _pad(length):
+    return -length % 8
+
+
+def export_columnar(transactions, path, info_callback = None):
+    '''
+    writes the transactions to a columnar file at path, ordered by date so range
+    queries can bisect the date column. returns True when the file was written
+    '''
+    if not isinstance(transactions, pft.TransactionStore):
+        transactions = pft.TransactionStore(transactions)
+    if not isinstance(transactions.amounts, array):
+        pft.call_info("Error : amounts beyond the int64 range cannot be exported",info_callback)
+        return False
+
+    transactions.build_date_index()
+    order = transactions._date_rows
+    columns = [
+        array("i", [transactions.dates[p] for p in order]),
+        array("q", [transactions.amounts[p] for p in order]),
+        array("I", [transactions.types[p] for p in order]),
+        array("I", [transactions.descs[p] for p in order]),
+    ]
+    header = json.dumps({
+        "byteorder" : sys.byteorder,
+        "type_values" : transactions.type_values,
+        "desc_values" : transactions.desc_values,
+        "income" : transactions.income,
+        "expense" : transactions.expense
+    }).encode("utf-8")
+
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, mode ="wb") as file :
+            file.write(_PREFIX.pack(_MAGIC, len(order), len(header)))
+            file.write(header + bytes(_pad(_PREFIX.size + len(header))))
+            for column in columns:
+                data = column.tobytes()
+                file.write(data + bytes(_pad(len(data))))
+        os.replace(temp_path, path)
+    except OSError as e :
+        pft.call_info(f"Error : could not export to {path} - {e}",info_callback)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+class ColumnarLedger:
+    '''
+    a columnar file opened with mmap. the columns are memoryviews over the mapping,
+    so every scan reads the mapped pages directly without copying them into Python objects
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, mode ="rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a columnar ledger")
+        self._view = memoryview(self._map)
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self):
+        magic, rows, header_len = _PREFIX.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a columnar ledger")
+        offset = _PREFIX.size
+        header = json.loads(bytes(self._view[offset:offset + header_len]).decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{self.path} was written with a different byte order")
+        offset += header_len + _pad(offset + header_len)
+
+        columns = []
+        for typecode in ("i", "q", "I", "I"):
+            size = rows * array(typecode).itemsize
+            columns.append(self._view[offset:offset + size].cast(typecode))
+            offset += size + _pad(size)
+        self.dates, self.amounts, self.types, self.descs = columns
+
+        self.type_values = header["type_values"]
+        self.desc_values = header["desc_values"]
+        self.income = header["income"]
+        self.expense = header["expense"]
+        self._type_kinds = []
+        for value in self.type_values:
+            kind = value.upper()
+            self._type_kinds.append(1 if kind == "CREDIT" else -1 if kind == "DEBIT" else 0)
+
+    def close(self):
+        for name in ("dates", "amounts", "types", "descs"):
+            column = getattr(self, name, None)
+            if column is not None:
+                column.release()
+                setattr(self, name, None)
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, i):
+        return {
+            "Date" : date.fromordinal(self.dates[i]),
+            "Amount" : pft.from_minor_units(self.amounts[i]),
+            "Type" : self.type_values[self.types[i]],
+            "Description" : self.desc_values[self.descs[i]]
+        }
+
+    def _totals(self, lo, hi):
+        income = expense = 0
+        kinds = self._type_kinds
+        types, amounts = self.types, self.amounts
+        for i in range(lo, hi):
+            kind = kinds[types[i]]
+            if kind == 1:
+                income += amounts[i]
+            elif kind == -1:
+                expense += amounts[i]
+        return [pft.from_minor_units(income), pft.from_minor_units(expense), pft.from_minor_units(income - expense)]
+
+    def _range(self, start, end, info_callback = None):
+        bounds = pft._date_range(start, end, info_callback)
+        if bounds is None:
+            return None
+        return bisect_left(self.dates, bounds[0]), bisect_right(self.dates, bounds[1])
+
+    def _matching(self, codes, column, empty_msg, info_callback = None):
+        if codes:
+            match = [self[i] for i, code in enumerate(column) if code in codes]
+            if match:
+                return match
+        pft.call_info(empty_msg,info_callback)
+        return None
+
+    def view_summary(self, info_callback = None):
+        '''income, expense and balance - stored with the file, so O(1)'''
+        if not len(self):
+            pft.call_info("No transaction records found",info_callback)
+            return None
+        return [pft.from_minor_units(self.income), pft.from_minor_units(self.expense),
+                pft.from_minor_units(self.income - self.expense)]
+
+    def summary_between(self, start, end, info_callback = None):
+        bounds = self._range(start, end, info_callback)
+        if bounds is None:
+            return None
+        if bounds[0] == bounds[1]:
+            pft.call_info("No records found in the given date range",info_callback)
+            return None
+        return self._totals(*bounds)
+
+    def search_by_date_range(self, start, end, info_callback = None):
+        bounds = self._range(start, end, info_callback)
+        if bounds is None:
+            return None
+        if bounds[0] == bounds[1]:
+            pft.call_info("No records found in the given date range",info_callback)
+            return None
+        return [self[i] for i in range(*bounds)]
+
+    def search_by_type(self, type_, info_callback = None):
+        wanted = type_.upper()
+        codes = {code for code, value in enumerate(self.type_values) if value.upper() == wanted}
+        return self._matching(codes, self.types, "No records found of the type", info_callback)
+
+    def search_by_desc(self, desc, info_callback = None):
+        codes = {code for code, value in enumerate(self.desc_values) if value == desc}
+        return self._matching(codes, self.descs, "No records found of the given decription", info_callback)
@@ -0,0 +1,50 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - Shared pytest fixtures for the test files of the tracker
+'''
+
+import pft
+import pytest
+
+
+@pytest.fixture
+def info_msg():
+    return []
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    '''
+    factory - ledger(rows) writes a ledger file with the usual header and the given csv lines
+    into tmp_path, makes it pft's default ledger for the rest of the test and returns its path.
+    codec writes it compressed ("gzip", "bz2", "xz"), header = False leaves the header out
+    '''
+    def write(rows = (), name = "transaction.csv", codec = None, header = True):
+        path = tmp_path / name
+        text = ("Date,Amount,Type,Description\n" if header else "") + "".join(row + "\n" for row in rows)
+        if codec:
+            with pft._open_codec(str(path), "w", codec) as file:
+                file.write(text)
+        else:
+            path.write_text(text, encoding="utf-8")
+        monkeypatch.setattr(pft, "FILENAME", str(path))
+        return path
+    return write
+
+
+@pytest.fixture
+def make_store():
+    '''
+    factory - make_store(rows) builds a TransactionStore from (date, amount, type, description)
+    tuples. bulk = True appends them like the loaders do, leaving an out of order date index dirty
+    '''
+    def make(rows, bulk = False):
+        store = pft.TransactionStore()
+        for day, amount, type_, desc in rows:
+            if bulk:
+                store.append_parsed(day.toordinal(), pft.to_minor_units(amount), type_, desc)
+            else:
+                store.append({"Date": day, "Amount": amount, "Type": type_, "Description": desc})
+        return store
+    return make
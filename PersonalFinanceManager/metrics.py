@@ -0,0 +1,225 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - Opt-in instrumentation for pft. enable() wraps the pft entry points to count calls, errors and latency (as a histogram) and collects the rows scanned, rows skipped and bytes read and written that pft reports while they run. snapshot() returns the numbers, to_json() and to_prometheus() dump them. while disabled pft runs unwrapped and every report is a single None check
+'''
+
+import json
+import time
+import inspect
+import threading
+from functools import wraps
+
+import pft
+
+#the operations worth watching. per row helpers (parse_date, to_minor_units, valid_date ...) are
+#left out on purpose, wrapping them would cost more than the work they do
+ENTRY_POINTS = (
+    "load_transaction", "reload_transaction", "iter_transactions", "read_snapshot", "write_snapshot",
+    "save_transaction", "add_transaction", "add_transactions", "view_summary",
+    "search_by_type", "search_by_desc", "search_by_date_range", "summary_between",
+    "aggregate", "rollup", "build_rollup", "delete_transaction", "delete_all",
+    "compact_ledger", "compact_in_background",
+)
+
+COUNTERS = ("rows_scanned", "rows_skipped", "bytes_read", "bytes_written")
+
+#upper bounds of the latency histogram buckets in seconds, +Inf is implied
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+
+#counters reported outside any entry point (e.g. a LedgerWriter used directly) land here
+OTHER = "other"
+
+
+class Registry:
+    '''thread safe store of the per function numbers'''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._functions = {}
+
+    def _entry(self, name):
+        entry = self._functions.get(name)
+        if entry is None:
+            entry = {"calls" : 0, "errors" : 0, "seconds" : 0.0, "buckets" : [0] * (len(BUCKETS) + 1)}
+            entry.update((counter, 0) for counter in COUNTERS)
+            self._functions[name] = entry
+        return entry
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, name):
+        #a frame is a one item list so it can be removed by identity - generators do not end in stack order
+        frame = [name]
+        self._stack().append(frame)
+        return frame
+
+    def end(self, frame, seconds, failed):
+        stack = self._stack()
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i] is frame:
+                del stack[i]
+                break
+        bucket = len(BUCKETS)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                bucket = i
+                break
+        with self._lock:
+            entry = self._entry(frame[0])
+            entry["calls"] += 1
+            entry["errors"] += failed
+            entry["seconds"] += seconds
+            entry["buckets"][bucket] += 1
+
+    def add(self, counter, amount):
+        '''called by pft - adds amount to counter of the innermost entry point running on this thread'''
+        if not amount:
+            return
+        stack = self._stack()
+        name = stack[-1][0] if stack else OTHER
+        with self._lock:
+            self._entry(name)[counter] += amount
+
+    def reset(self):
+        with self._lock:
+            self._functions.clear()
+
+    def snapshot(self):
+        with self._lock:
+            functions = {}
+            for name, entry in sorted(self._functions.items()):
+                data = dict(entry)
+                data["seconds"] = round(entry["seconds"], 6)
+                cumulative = 0
+                data["buckets"] = {}
+                for bound, count in zip(BUCKETS + ("+Inf",), entry["buckets"]):
+                    cumulative += count
+                    data["buckets"][str(bound)] = cumulative
+                functions[name] = data
+        return {"enabled" : is_enabled(), "functions" : functions}
+
+
+_registry = Registry()
+_originals = {}
+_enable_lock = threading.Lock()
+
+
+def _wrap(name, func):
+    registry = _registry
+
+    if inspect.isgeneratorfunction(func):
+        #timed from the call until the stream is exhausted or closed
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            frame = registry.begin(name)
+            start = time.perf_counter()
+            failed = False
+            try:
+                yield from func(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                registry.end(frame, time.perf_counter() - start, failed)
+        return wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        frame = registry.begin(name)
+        start = time.perf_counter()
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            registry.end(frame, time.perf_counter() - start, failed)
+    return wrapper
+
+
+def enable():
+    '''starts recording. pft functions looked up after this (pft.load_transaction ...) are the timed ones'''
+    with _enable_lock:
+        if _originals:
+            return
+        for name in ENTRY_POINTS:
+            func = getattr(pft, name)
+            _originals[name] = func
+            setattr(pft, name, _wrap(name, func))
+        pft._metrics = _registry
+
+
+def disable():
+    '''stops recording and puts the plain pft functions back. the numbers so far are kept'''
+    with _enable_lock:
+        pft._metrics = None
+        for name, func in _originals.items():
+            setattr(pft, name, func)
+        _originals.clear()
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def reset():
+    '''forgets every number recorded so far'''
+    _registry.reset()
+
+
+def snapshot():
+    '''
+    {"enabled" : bool, "functions" : {name : numbers}} where numbers holds calls, errors, seconds
+    (total), the cumulative latency buckets keyed by their upper bound and the rows and bytes counters
+    '''
+    return _registry.snapshot()
+
+
+def to_json(indent = 2):
+    return json.dumps(snapshot(), indent = indent)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def to_prometheus():
+    '''the snapshot in the Prometheus text exposition format'''
+    functions = snapshot()["functions"]
+    lines = [
+        "# HELP pft_calls_total Calls of each pft entry point.",
+        "# TYPE pft_calls_total counter",
+    ]
+    for name, data in functions.items():
+        lines.append(f'pft_calls_total{{function="{_label(name)}"}} {data["calls"]}')
+    lines += [
+        "# HELP pft_errors_total Calls of each pft entry point that raised.",
+        "# TYPE pft_errors_total counter",
+    ]
+    for name, data in functions.items():
+        lines.append(f'pft_errors_total{{function="{_label(name)}"}} {data["errors"]}')
+    lines += [
+        "# HELP pft_call_duration_seconds Latency of each pft entry point.",
+        "# TYPE pft_call_duration_seconds histogram",
+    ]
+    for name, data in functions.items():
+        label = _label(name)
+        for bound, count in data["buckets"].items():
+            lines.append(f'pft_call_duration_seconds_bucket{{function="{label}",le="{bound}"}} {count}')
+        lines.append(f'pft_call_duration_seconds_sum{{function="{label}"}} {data["seconds"]}')
+        lines.append(f'pft_call_duration_seconds_count{{function="{label}"}} {data["calls"]}')
+    for counter in COUNTERS:
+        lines += [
+            f"# HELP pft_{counter}_total {counter.replace('_', ' ').capitalize()} by each pft entry point.",
+            f"# TYPE pft_{counter}_total counter",
+        ]
+        for name, data in functions.items():
+            lines.append(f'pft_{counter}_total{{function="{_label(name)}"}} {data[counter]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,425 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - Optional time-partitioned layout for the ledger. transactions are sharded into one CSV per year (or per month) under LEDGER_DIR, next to a manifest holding the row count and totals of every partition. date-bounded queries and summaries open only the partitions that overlap the range, and a delete rewrites only the partition holding the row
+'''
+
+import os
+import csv
+import json
+
+import pft
+
+LEDGER_DIR = "ledger"
+MANIFEST = "manifest.json"
+GRANULARITY = "year"
+GRANULARITIES = ("year", "month")
+
+
+def partition_key(day, granularity = GRANULARITY):
+    '''name of the partition holding day - "2025" by year, "2025-01" by month'''
+    day = pft.parse_date(day) if isinstance(day, str) else day
+    if granularity == "month":
+        return f"{day.year:04d}-{day.month:02d}"
+    return f"{day.year:04d}"
+
+
+def partition_bounds(key):
+    '''first and last day ordinal a partition can hold'''
+    if "-" in key:
+        year, month = map(int, key.split("-"))
+        first, last = pft.month_bounds(year, month)
+    else:
+        first, last = pft.year_bounds(int(key))
+    return first.toordinal(), last.toordinal()
+
+
+def _manifest_path(ledger_dir):
+    return os.path.join(ledger_dir, MANIFEST)
+
+
+def _partition_path(ledger_dir, key):
+    return os.path.join(ledger_dir, f"{key}.csv")
+
+
+def _file_state(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_manifest(ledger_dir):
+    '''
+    {"granularity" : "year" | "month", "partitions" : {key : entry}} where an entry holds rows,
+    income and expense (minor units) and the size and mtime of the file they were counted from.
+    None when there is no readable manifest
+    '''
+    try:
+        with open(_manifest_path(ledger_dir), mode ="r", encoding ="utf-8") as file :
+            manifest = json.load(file)
+        if manifest.get("granularity") in GRANULARITIES and isinstance(manifest.get("partitions"), dict):
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _write_manifest(ledger_dir, manifest):
+    temp_path = _manifest_path(ledger_dir) + ".tmp"
+    try:
+        with open(temp_path, mode ="w", encoding ="utf-8") as file :
+            json.dump(manifest, file, indent = 1, sort_keys = True)
+        os.replace(temp_path, _manifest_path(ledger_dir))
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _read_partition(ledger_dir, key, info_callback = None):
+    '''TransactionStore of one partition, rows in file order. same skip rules as load_transaction'''
+    store = pft.TransactionStore()
+    path = _partition_path(ledger_dir, key)
+    if not os.path.isfile(path):
+        return store
+    with open(path, mode ="r", newline ="", encoding ="utf-8") as file :
+        reader = csv.DictReader(file)
+        if not pft._check_header(reader.fieldnames, info_callback):
+            return store
+        for parsed in pft._parse_records(reader, info_callback):
+            store.append_parsed(*parsed)
+    return store
+
+
+def _count(ledger_dir, manifest, key, info_callback = None):
+    #recounts a partition from its file
+    path = _partition_path(ledger_dir, key)
+    if not os.path.isfile(path):
+        manifest["partitions"].pop(key, None)
+        return
+    store = _read_partition(ledger_dir, key, info_callback)
+    manifest["partitions"][key] = {"rows" : len(store), "income" : store.income,
+                                   "expense" : store.expense, "state" : _file_state(path)}
+
+
+def _is_current(ledger_dir, manifest, key):
+    entry = manifest["partitions"].get(key)
+    path = _partition_path(ledger_dir, key)
+    if entry is None:
+        return not os.path.isfile(path)
+    return os.path.isfile(path) and entry.get("state") == _file_state(path)
+
+
+def _refresh(ledger_dir, manifest, info_callback = None):
+    '''recounts partitions edited behind the manifest's back. returns True when any was'''
+    stale = [key for key in manifest["partitions"] if not _is_current(ledger_dir, manifest, key)]
+    for key in stale:
+        _count(ledger_dir, manifest, key, info_callback)
+    if stale:
+        try:
+            _write_manifest(ledger_dir, manifest)
+        except OSError:
+            pass
+    return bool(stale)
+
+
+def _kind(type_):
+    kind = str(type_).upper()
+    return 1 if kind == "CREDIT" else -1 if kind == "DEBIT" else 0
+
+
+def _account(entry, transaction, sign):
+    minor = pft.to_minor_units(transaction["Amount"])
+    kind = _kind(transaction["Type"])
+    entry["rows"] += sign
+    if kind == 1:
+        entry["income"] += sign * minor
+    elif kind == -1:
+        entry["expense"] += sign * minor
+
+
+def _keys_between(manifest, start, end):
+    #partition pruning - only the partitions whose days overlap [start, end]
+    keys = []
+    for key in sorted(manifest["partitions"]):
+        first, last = partition_bounds(key)
+        if first <= end and start <= last:
+            keys.append(key)
+    return keys
+
+
+def _write_partition(ledger_dir, manifest, key, rows):
+    '''replaces a whole partition with rows (dicts in the load format)'''
+    path = _partition_path(ledger_dir, key)
+    if not rows:
+        if os.path.isfile(path):
+            os.remove(path)
+        manifest["partitions"].pop(key, None)
+        return
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, mode ="w", newline ="", encoding ="utf-8") as file :
+            writer = csv.DictWriter(file, fieldnames = pft.EXPECTED_FIELDS)
+            writer.writeheader()
+            writer.writerows(pft._format_row(row) for row in rows)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    entry = {"rows" : 0, "income" : 0, "expense" : 0}
+    for row in rows:
+        _account(entry, row, 1)
+    entry["state"] = _file_state(path)
+    manifest["partitions"][key] = entry
+
+
+def _append_partition(ledger_dir, manifest, key, rows):
+    path = _partition_path(ledger_dir, key)
+    current = _is_current(ledger_dir, manifest, key)
+    file_exists = os.path.isfile(path)
+    with open(path, mode ="a", newline ="", encoding ="utf-8") as file :
+        writer = csv.DictWriter(file, fieldnames = pft.EXPECTED_FIELDS)
+        if not file_exists:
+            writer.writeheader()
+        writer.writerows(pft._format_row(row) for row in rows)
+    if not current:
+        _count(ledger_dir, manifest, key)
+        return
+    entry = manifest["partitions"].setdefault(key, {"rows" : 0, "income" : 0, "expense" : 0})
+    for row in rows:
+        _account(entry, row, 1)
+    entry["state"] = _file_state(path)
+
+
+def _remove_row(ledger_dir, manifest, key, transaction, occurrence = 0):
+    '''
+    rewrites one partition without the row equal to transaction - the copy numbered occurrence
+    among its identical rows, the same row a tombstone would cancel. returns False when the
+    partition holds no such row
+    '''
+    path = _partition_path(ledger_dir, key)
+    if not os.path.isfile(path):
+        return False
+    current = _is_current(ledger_dir, manifest, key)
+    target = pft._row_key(transaction)
+    temp_path = path + ".tmp"
+    found = False
+    try:
+        with open(path, mode ="r", newline ="", encoding ="utf-8") as source, \
+                open(temp_path, mode ="w", newline ="", encoding ="utf-8") as target_file :
+            reader = csv.DictReader(source)
+            writer = csv.DictWriter(target_file, fieldnames = pft.EXPECTED_FIELDS, extrasaction ="ignore")
+            writer.writeheader()
+            for row in reader:
+                if not found and pft._parse_row(row)[0] == target:
+                    if not occurrence:
+                        found = True
+                        continue
+                    occurrence -= 1
+                #rows the loader would skip are kept as they are
+                writer.writerow(row)
+        if found:
+            os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    if not found:
+        return False
+    if not current:
+        _count(ledger_dir, manifest, key)
+    else:
+        entry = manifest["partitions"][key]
+        _account(entry, transaction, -1)
+        entry["state"] = _file_state(path)
+    return True
+
+
+def partition_ledger(granularity = GRANULARITY, info_callback = None, filename = None, ledger_dir = None):
+    '''
+    splits the ledger (filename, pft.FILENAME by default) into partitions under ledger_dir
+    (LEDGER_DIR by default), replacing any earlier partitioned copy. the ledger file itself is
+    left alone. returns the number of partitions
+    '''
+    if granularity not in GRANULARITIES:
+        pft.call_info(f"Invalid granularity : {granularity} - use year or month",info_callback)
+        return None
+
+    ledger_dir = ledger_dir or LEDGER_DIR
+    transactions = pft.load_transaction(info_callback, filename = filename)
+    groups = {}
+    for row in transactions:
+        groups.setdefault(partition_key(row["Date"], granularity), []).append(row)
+
+    with pft._ledger_lock:
+        try:
+            os.makedirs(ledger_dir, exist_ok = True)
+            old = _read_manifest(ledger_dir)
+            manifest = {"granularity" : granularity, "partitions" : {}}
+            for key in (old["partitions"] if old else ()):
+                if key not in groups and os.path.isfile(_partition_path(ledger_dir, key)):
+                    os.remove(_partition_path(ledger_dir, key))
+            for key in sorted(groups):
+                _write_partition(ledger_dir, manifest, key, groups[key])
+            _write_manifest(ledger_dir, manifest)
+        except (OSError, csv.Error) as e :
+            pft.call_info(f"Error : could not write the partitions - {e}",info_callback)
+            return None
+
+    pft.call_info(f"{len(transactions)} transactions split into {len(groups)} partitions",info_callback)
+    return len(groups)
+
+
+def load_partitions(start = None, end = None, info_callback = None, ledger_dir = None):
+    '''
+    loads the partitioned ledger under ledger_dir (LEDGER_DIR by default) into a TransactionStore.
+    with start and end only the partitions overlapping that range are read (whole - filter with
+    search_by_date_range for exact bounds)
+    '''
+    ledger_dir = ledger_dir or LEDGER_DIR
+    manifest = _read_manifest(ledger_dir)
+    if manifest is None:
+        pft.call_info("No partitioned ledger was found - Starting Fresh",info_callback)
+        return pft.TransactionStore()
+
+    if start is None and end is None:
+        keys = sorted(manifest["partitions"])
+    else:
+        bounds = pft._date_range(start, end, info_callback)
+        if bounds is None:
+            return None
+        keys = _keys_between(manifest, *bounds)
+
+    transactions = pft.TransactionStore()
+    try:
+        for key in keys:
+            transactions.merge(_read_partition(ledger_dir, key, info_callback))
+    except Exception as e :
+        pft._report_load_error(e, ledger_dir, info_callback)
+        return pft.TransactionStore()
+    transactions.build_date_index()
+    return transactions
+
+
+def search_by_date_range(start, end, info_callback = None, ledger_dir = None):
+    '''pft.search_by_date_range over only the partitions the range touches'''
+    if pft._date_range(start, end, info_callback) is None:
+        return None
+    transactions = load_partitions(start, end, info_callback, ledger_dir)
+    return pft.search_by_date_range(transactions, start, end, info_callback)
+
+
+def summary_between(start, end, info_callback = None, ledger_dir = None):
+    '''
+    income, expense and balance of the transactions dated between start and end. partitions
+    wholly inside the range are answered from the manifest, only the two edge partitions are read
+    '''
+    bounds = pft._date_range(start, end, info_callback)
+    if bounds is None:
+        return None
+    ledger_dir = ledger_dir or LEDGER_DIR
+    manifest = _read_manifest(ledger_dir)
+    if manifest is None or not manifest["partitions"]:
+        pft.call_info("No transaction records found",info_callback)
+        return None
+
+    keys = _keys_between(manifest, *bounds)
+    stale = [key for key in keys if not _is_current(ledger_dir, manifest, key)]
+    if stale:
+        _refresh(ledger_dir, manifest, info_callback)
+        keys = _keys_between(manifest, *bounds)
+    income = expense = rows = 0
+    for key in keys:
+        first, last = partition_bounds(key)
+        if bounds[0] <= first and last <= bounds[1]:
+            entry = manifest["partitions"][key]
+            income += entry["income"]
+            expense += entry["expense"]
+            rows += entry["rows"]
+            continue
+        store = _read_partition(ledger_dir, key, info_callback)
+        positions = store.positions_between(*bounds)
+        totals = store.totals_of(positions)
+        income += pft.to_minor_units(totals[0])
+        expense += pft.to_minor_units(totals[1])
+        rows += len(positions)
+
+    if not rows:
+        pft.call_info("No records found in the given date range",info_callback)
+        return None
+    return [pft.from_minor_units(income), pft.from_minor_units(expense), pft.from_minor_units(income - expense)]
+
+
+def view_summary(info_callback = None, ledger_dir = None):
+    '''income, expense and balance of the whole partitioned ledger, straight from the manifest'''
+    ledger_dir = ledger_dir or LEDGER_DIR
+    manifest = _read_manifest(ledger_dir)
+    if manifest is not None:
+        _refresh(ledger_dir, manifest, info_callback)
+    if manifest is None or not any(entry["rows"] for entry in manifest["partitions"].values()):
+        pft.call_info("No transaction records found",info_callback)
+        return None
+    income = sum(entry["income"] for entry in manifest["partitions"].values())
+    expense = sum(entry["expense"] for entry in manifest["partitions"].values())
+    return [pft.from_minor_units(income), pft.from_minor_units(expense), pft.from_minor_units(income - expense)]
+
+
+def add_transaction(transactions, date_input, amt, type_, desc, info_callback = None, ledger_dir = None):
+    '''
+    validates and appends one transaction to its partition, updating the manifest.
+    transactions (a store from load_partitions, or None) gets the row too
+    '''
+    date_input = pft.valid_date(date_input,info_callback)
+    amt = pft.valid_amount(amt,info_callback)
+    if date_input is None or amt is None:
+        return None
+
+    new_transaction = {
+        "Date" : date_input.strftime("%d-%m-%Y"),
+        "Amount" : amt,
+        "Type" : type_.upper(),
+        "Description" : desc.lower()
+    }
+
+    ledger_dir = ledger_dir or LEDGER_DIR
+    with pft._ledger_lock:
+        try:
+            os.makedirs(ledger_dir, exist_ok = True)
+            manifest = _read_manifest(ledger_dir) or {"granularity" : GRANULARITY, "partitions" : {}}
+            _append_partition(ledger_dir, manifest, partition_key(date_input, manifest["granularity"]), [new_transaction])
+            _write_manifest(ledger_dir, manifest)
+        except (OSError, csv.Error) as e :
+            pft.call_info(f"Error : could not save the transaction - {e}",info_callback)
+            return None
+
+    if transactions is not None:
+        transactions.append(new_transaction)
+    pft.call_info("transaction added successfully ",info_callback)
+
+
+def delete_transaction(transactions, index_val, info_callback = None, ledger_dir = None):
+    '''
+    deletes transactions[index_val] (a store from load_partitions). only the partition
+    holding the row is rewritten
+    '''
+    index_val = pft._check_index(transactions, index_val, info_callback)
+    if index_val is None:
+        return None
+    removed = transactions[index_val]
+    #identical rows share a date and so a partition, which holds them in the store's order
+    occurrence = pft._occurrence(transactions, index_val)
+
+    ledger_dir = ledger_dir or LEDGER_DIR
+    with pft._ledger_lock:
+        manifest = _read_manifest(ledger_dir)
+        if manifest is None:
+            pft.call_info("No partitioned ledger was found",info_callback)
+            return None
+        try:
+            if not _remove_row(ledger_dir, manifest, partition_key(removed["Date"], manifest["granularity"]), removed, occurrence):
+                pft.call_info("Error : transaction not found in its partition",info_callback)
+                return None
+            _write_manifest(ledger_dir, manifest)
+        except (OSError, csv.Error) as e :
+            pft.call_info(f"Error : could not record the deletion - {e}",info_callback)
+            return None
+
+    del transactions[index_val]
+    pft.call_info("Transaction deleted successfully",info_callback)
@@ -4,88 +4,1230 @@ Date - 17-10-2025
 Desc- A Python-based application designed to help users track and manage their daily expenses and income. It allows adding, viewing, and searching transactions by expense or type, offering a clear summary of financial activity. Simple, efficient, and perfect for gaining better control over personal finances
 '''
 
-import os 
+import os
+import io
+import re
+import sys
 import csv
-from decimal import Decimal, InvalidOperation
+import json
+import time
+import struct
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from collections.abc import MutableSequence, Sequence, Sized
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
 from datetime import datetime, date
+from functools import lru_cache
 
 FILENAME = "transaction.csv"
 
+#deletes are appended here and folded back into the ledger by compact_ledger.
+#a tombstone names the row and which of its identical copies it was (Occurrence)
+TOMBSTONE_SUFFIX = ".tombstones"
+TOMBSTONE_FIELDS = ["Date", "Amount", "Type", "Description", "Occurrence"]
+COMPACT_THRESHOLD = 1000
+
+#month x Type x Description -> sum and count, kept in step with the ledger by add and delete
+ROLLUP_SUFFIX = ".rollup"
+
+#binary copy of the parsed ledger, reused at startup while the CSV is unchanged
+SNAPSHOT_SUFFIX = ".snapshot"
+_SNAPSHOT_MAGIC = b"PFTSNAP1"
+
+#serialises every write to the ledger file against background compaction
+_ledger_lock = threading.RLock()
+
+#amounts are kept as integer paise (minor units) inside the store
+MINOR_UNITS = 100
+_MINOR_QUANTUM = Decimal("0.01")
+
+#set by metrics.enable(). loaders and writers report rows and bytes to it; while it is None
+#every report costs one check per call, never per row
+_metrics = None
+
+
+def _record(counter, amount):
+    if _metrics is not None:
+        _metrics.add(counter, amount)
+
+
 def call_info(msg,info_callback = None):
     if info_callback    :
         info_callback(msg)
 
-def load_transaction(info_callback = None):
-    
-    # check if file exits 
-    if not os.path.exists(FILENAME):
-        call_info("No file was found - Starting Fresh",info_callback)
-        return []
-    
-    expected_fields = ["Date", "Amount", "Type", "Description"]
-    transactions = []
 
+def to_minor_units(amount):
+    '''
+    converts an amount (Decimal, int or numeric string) to integer minor units. amounts that
+    are not a whole number of minor units (e.g. 1.005) raise InvalidOperation instead of being rounded
+    '''
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    if not amount.is_finite():
+        raise InvalidOperation(f"amount is not a finite number : {amount}")
+    quantized = amount.quantize(_MINOR_QUANTUM)
+    if quantized != amount:
+        raise InvalidOperation(f"amount has more than two decimal places : {amount}")
+    return int(quantized * MINOR_UNITS)
+
+
+def from_minor_units(minor):
+    '''converts integer minor units back to a Decimal with two places'''
+    return Decimal(minor).scaleb(-2)
+
+
+#a ledger only holds a few thousand distinct dates, so parsed dates are memoised
+DATE_CACHE_SIZE = 8192
+_DATE_RE = re.compile(r"([0-9]{1,2})-([0-9]{1,2})-([0-9]{4})")
+_AMOUNT_RE = re.compile(r"([0-9]+)(?:\.([0-9]{1,2}))?")
+
+
+@lru_cache(maxsize = DATE_CACHE_SIZE)
+def _parse_date_cached(text):
+    match = _DATE_RE.fullmatch(text)
+    if match:
+        return date(int(match[3]), int(match[2]), int(match[1]))
+    #anything unusual gets the exact strptime rules
+    return datetime.strptime(text, "%d-%m-%Y").date()
+
+
+def parse_date(text):
+    '''
+    parses a DD-MM-YYYY string, accepting and rejecting exactly what
+    datetime.strptime(text, "%d-%m-%Y") does (ValueError / TypeError)
+    '''
+    if not isinstance(text, str):
+        raise TypeError(f"date must be a string, not {type(text).__name__}")
+    return _parse_date_cached(text)
+
+
+def parse_amount(text):
+    '''parses an amount string to a Decimal, raising InvalidOperation like Decimal() does'''
+    return Decimal(text)
+
+
+def parse_amount_minor(text):
+    '''
+    parses an amount string straight to integer minor units. plain decimal strings
+    with at most two places skip Decimal entirely, everything else goes through parse_amount
+    '''
+    match = _AMOUNT_RE.fullmatch(text)
+    if match:
+        whole, frac = match.groups()
+        return int(whole) * MINOR_UNITS + (int(frac.ljust(2, "0")) if frac else 0)
+    return to_minor_units(parse_amount(text))
+
+
+def _to_ordinal(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.toordinal()
+    return parse_date(value).toordinal()
+
+
+class TransactionStore(MutableSequence):
+    '''
+    columnar in-memory ledger - one compact array per field instead of one dict per row.
+    amounts are integer minor units, dates are ordinal days and Type/Description are
+    dictionary encoded. indexing and iteration hand out the same dicts load_transaction
+    used to return, so the existing functions keep working on it unchanged.
+    '''
+
+    def __init__(self, rows = ()):
+        self.dates = array("i")
+        self.amounts = array("q")
+        self.types = array("I")
+        self.descs = array("I")
+        self.type_values = []
+        self.desc_values = []
+        self._type_codes = {}
+        self._desc_codes = {}
+        #running totals in minor units, kept in step with every insert and delete
+        self._type_kinds = []
+        self._type_keys = []
+        self.income = 0
+        self.expense = 0
+        #secondary indexes - normalised Type / exact Description -> sorted row positions
+        self._type_index = {}
+        self._desc_index = {}
+        #date index - ordinals in sorted order with the row position of each one.
+        #bulk loads that arrive out of date order only mark it dirty, it is rebuilt once on demand
+        self._date_keys = array("i")
+        self._date_rows = array("I")
+        self._date_dirty = False
+        #where the last parse of the ledger stopped, see reload_transaction
+        self.source = None
+        #bumped whenever rows move or go away, so a TransactionView knows its positions are stale
+        self.generation = 0
+        for row in rows:
+            self.append(row)
+
+    # --- encoding helpers ---
+    def _type_code(self, value):
+        code = self._type_codes.get(value)
+        if code is None:
+            code = len(self.type_values)
+            self._type_codes[value] = code
+            self.type_values.append(value)
+            kind = value.upper()
+            self._type_keys.append(kind)
+            self._type_kinds.append(1 if kind == "CREDIT" else -1 if kind == "DEBIT" else 0)
+        return code
+
+    def _account(self, type_code, minor, sign):
+        kind = self._type_kinds[type_code]
+        if kind == 1:
+            self.income += sign * minor
+        elif kind == -1:
+            self.expense += sign * minor
+
+    def _desc_code(self, value):
+        code = self._desc_codes.get(value)
+        if code is None:
+            code = len(self.desc_values)
+            self._desc_codes[value] = code
+            self.desc_values.append(value)
+        return code
+
+    def _widen_amounts(self):
+        #amounts beyond the int64 range fall back to a plain list of ints
+        if isinstance(self.amounts, array):
+            self.amounts = list(self.amounts)
+
+    def _index_insert(self, index, key, i, shift):
+        if shift:
+            #a row inserted before the end pushes every later position up by one
+            for positions in index.values():
+                k = bisect_left(positions, i)
+                positions[k:] = array("I", [p + 1 for p in positions[k:]])
+        positions = index.get(key)
+        if positions is None:
+            positions = index[key] = array("I")
+        if shift:
+            positions.insert(bisect_left(positions, i), i)
+        else:
+            positions.append(i)
+
+    def _index_delete(self, index, key, i):
+        positions = index[key]
+        del positions[bisect_left(positions, i)]
+        if not positions:
+            del index[key]
+        for positions in index.values():
+            k = bisect_right(positions, i)
+            positions[k:] = array("I", [p - 1 for p in positions[k:]])
+
+    def _date_slot(self, ordinal, i):
+        #equal dates are kept in ledger order, so look for i among them
+        lo = bisect_left(self._date_keys, ordinal)
+        hi = bisect_right(self._date_keys, ordinal)
+        return lo + bisect_left(self._date_rows[lo:hi], i)
+
+    def _date_insert(self, ordinal, i, shift, bulk):
+        if self._date_dirty:
+            return
+        keys = self._date_keys
+        if not shift and (not keys or ordinal >= keys[-1]):
+            keys.append(ordinal)
+            self._date_rows.append(i)
+            return
+        if bulk:
+            self._date_dirty = True
+            return
+        if shift:
+            self._date_rows = array("I", [p + 1 if p >= i else p for p in self._date_rows])
+        k = self._date_slot(ordinal, i)
+        keys.insert(k, ordinal)
+        self._date_rows.insert(k, i)
+
+    def _date_delete(self, ordinal, i):
+        if self._date_dirty:
+            return
+        k = self._date_slot(ordinal, i)
+        del self._date_keys[k]
+        del self._date_rows[k]
+        self._date_rows = array("I", [p - 1 if p > i else p for p in self._date_rows])
+
+    def build_date_index(self):
+        '''(re)builds the sorted date index if bulk appends left it out of date'''
+        if not self._date_dirty:
+            return
+        order = sorted(range(len(self.dates)), key = self.dates.__getitem__)
+        self._date_rows = array("I", order)
+        self._date_keys = array("i", [self.dates[p] for p in order])
+        self._date_dirty = False
+
+    def positions_between(self, start, end):
+        '''row positions dated between the start and end ordinals (inclusive), in date order'''
+        self.build_date_index()
+        lo = bisect_left(self._date_keys, start)
+        hi = bisect_right(self._date_keys, end)
+        return self._date_rows[lo:hi]
+
+    def positions_by_type(self, type_):
+        '''row positions whose Type matches type_ case-insensitively, in ledger order'''
+        return self._type_index.get(type_.upper(), array("I"))
+
+    def positions_by_desc(self, desc):
+        '''row positions whose Description equals desc, in ledger order'''
+        return self._desc_index.get(desc, array("I"))
+
+    def occurrence(self, i):
+        '''how many rows before row i are identical to it - only rows sharing its Description are looked at'''
+        key = (self.dates[i], self.amounts[i], self.types[i])
+        count = 0
+        for p in self.positions_by_desc(self.desc_values[self.descs[i]]):
+            if p >= i:
+                break
+            if (self.dates[p], self.amounts[p], self.types[p]) == key:
+                count += 1
+        return count
+
+    def _decode(self, i):
+        return {
+            "Date" : date.fromordinal(self.dates[i]),
+            "Amount" : from_minor_units(self.amounts[i]),
+            "Type" : self.type_values[self.types[i]],
+            "Description" : self.desc_values[self.descs[i]]
+        }
+
+    def merge(self, other):
+        '''appends every row of another store, remapping its dictionary codes onto ours'''
+        type_map = [self._type_code(value) for value in other.type_values]
+        desc_map = [self._desc_code(value) for value in other.desc_values]
+        base = len(self)
+        for index, other_index in ((self._type_index, other._type_index), (self._desc_index, other._desc_index)):
+            for key, positions in other_index.items():
+                index.setdefault(key, array("I")).extend(array("I", [p + base for p in positions]))
+        if self._date_dirty or other._date_dirty or (self._date_keys and other._date_keys
+                                                     and other._date_keys[0] < self._date_keys[-1]):
+            self._date_dirty = True
+        else:
+            self._date_keys.extend(other._date_keys)
+            self._date_rows.extend(array("I", [p + base for p in other._date_rows]))
+        if not isinstance(other.amounts, array):
+            self._widen_amounts()
+        self.amounts.extend(other.amounts)
+        self.dates.extend(other.dates)
+        self.types.extend(array("I", map(type_map.__getitem__, other.types)))
+        self.descs.extend(array("I", map(desc_map.__getitem__, other.descs)))
+        self.income += other.income
+        self.expense += other.expense
+
+    def append_parsed(self, ordinal, minor, type_, desc):
+        '''appends an already parsed row without building a dict (used by the loaders)'''
+        self.insert_parsed(len(self.dates), ordinal, minor, type_, desc, bulk = True)
+
+    def insert_parsed(self, i, ordinal, minor, type_, desc, bulk = False):
+        try:
+            self.amounts.insert(i, minor)
+        except OverflowError:
+            self._widen_amounts()
+            self.amounts.insert(i, minor)
+        shift = i < len(self.dates)
+        if shift:
+            self.generation += 1
+        type_code = self._type_code(type_)
+        self.dates.insert(i, ordinal)
+        self.types.insert(i, type_code)
+        self.descs.insert(i, self._desc_code(desc))
+        self._account(type_code, minor, 1)
+        self._index_insert(self._type_index, self._type_keys[type_code], i, shift)
+        self._index_insert(self._desc_index, desc, i, shift)
+        self._date_insert(ordinal, i, shift, bulk)
+
+    # --- sequence protocol ---
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._decode(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("transaction index out of range")
+        return self._decode(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._decode(i)
+
+    def __setitem__(self, i, row):
+        if isinstance(i, slice):
+            raise TypeError("slice assignment is not supported")
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("transaction index out of range")
+        del self[i]
+        self.insert(i, row)
+
+    def __delitem__(self, i):
+        if isinstance(i, slice):
+            for j in sorted(range(*i.indices(len(self))), reverse=True):
+                del self[j]
+            return
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("transaction index out of range")
+        self._account(self.types[i], self.amounts[i], -1)
+        self._index_delete(self._type_index, self._type_keys[self.types[i]], i)
+        self._index_delete(self._desc_index, self.desc_values[self.descs[i]], i)
+        self._date_delete(self.dates[i], i)
+        self.generation += 1
+        del self.dates[i]
+        del self.amounts[i]
+        del self.types[i]
+        del self.descs[i]
+
+    def insert(self, i, row):
+        ordinal, minor = _to_ordinal(row["Date"]), to_minor_units(row["Amount"])
+        if i < 0:
+            i = max(0, i + len(self))
+        i = min(i, len(self))
+        self.insert_parsed(i, ordinal, minor, str(row["Type"]), str(row["Description"]))
+
+    def append(self, row):
+        self.insert(len(self), row)
+
+    def clear(self):
+        generation = self.generation
+        self.__init__()
+        self.generation = generation + 1
+
+    def totals(self):
+        '''income, expense and balance as Decimals in O(1)'''
+        return [from_minor_units(self.income), from_minor_units(self.expense),
+                from_minor_units(self.income - self.expense)]
+
+    def totals_of(self, positions):
+        '''income, expense and balance of the given rows only'''
+        income = expense = 0
+        for i in positions:
+            kind = self._type_kinds[self.types[i]]
+            if kind == 1:
+                income += self.amounts[i]
+            elif kind == -1:
+                expense += self.amounts[i]
+        return [from_minor_units(income), from_minor_units(expense), from_minor_units(income - expense)]
+
+    def verify_totals(self, info_callback = None):
+        '''recomputes the totals from the columns, reports and repairs any drift'''
+        income = expense = 0
+        for type_code, minor in zip(self.types, self.amounts):
+            kind = self._type_kinds[type_code]
+            if kind == 1:
+                income += minor
+            elif kind == -1:
+                expense += minor
+        if (income, expense) == (self.income, self.expense):
+            return True
+        call_info(f"Summary drift detected : income off by {from_minor_units(self.income - income)}, "
+                  f"expense off by {from_minor_units(self.expense - expense)} - totals rebuilt", info_callback)
+        self.income, self.expense = income, expense
+        return False
+
+    def __eq__(self, other):
+        if isinstance(other, (list, TransactionStore)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TransactionStore({len(self)} transactions)"
+
+
+class TransactionView(Sequence):
+    '''
+    read-only rows of a store at the given positions (e.g. positions_by_type), decoded one at a
+    time when accessed - lets the GUI page through a large search result without building every dict.
+    positions can also be the query itself (e.g. lambda : store.positions_by_type("debit")), the view
+    then re-runs it whenever the store changed. a view of fixed positions raises RuntimeError once
+    a delete or insert has moved the rows they point at
+    '''
+
+    def __init__(self, transactions, positions):
+        self.transactions = transactions
+        self.query = positions if callable(positions) else None
+        self.positions = array("I", positions() if self.query else positions)
+        self._state = (transactions.generation, len(transactions))
+
+    def _current(self):
+        #the positions, re-queried when the rows moved or grew since they were taken
+        state = (self.transactions.generation, len(self.transactions))
+        if state != self._state:
+            if self.query:
+                self.positions = array("I", self.query())
+            elif state[0] != self._state[0]:
+                raise RuntimeError("the store changed since this view was taken - pass the query to keep it current")
+            self._state = state
+        return self.positions
+
+    def __len__(self):
+        return len(self._current())
+
+    def __getitem__(self, i):
+        positions = self._current()
+        if isinstance(i, slice):
+            return [self.transactions[p] for p in positions[i]]
+        return self.transactions[positions[i]]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, TransactionView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+
+#compressed ledgers are told apart by their magic bytes, a ledger not written yet by its extension
+_CODECS = (("gzip", b"\x1f\x8b", ".gz"), ("bz2", b"BZh", ".bz2"), ("xz", b"\xfd7zXZ\x00", ".xz"))
+
+
+def _ledger_codec(path = None):
+    '''"gzip", "bz2" or "xz" for a compressed ledger, None for a plain CSV'''
+    path = path or FILENAME
+    #read with os.open so sniffing never counts as one of the ledger opens
     try:
-        #checks for different encoding type 
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
         try:
-            file = open(FILENAME,mode ="r", newline = "", encoding ="utf-8")
-            
-        except UnicodeDecodeError:
-             file = open(FILENAME, mode ="r", newline ="", encoding = "latin-1") 
-
-        with file :
-            reader = csv.DictReader(file)
-            #check for header
-            if not reader.fieldnames :
-                call_info("No header found - Starting Fresh",info_callback)
-                return []
-                    
-            #check for valid headers
-            if not set(expected_fields).issubset(reader.fieldnames):
-                call_info(f"Invalid header :{reader.fieldnames} - Starting Fresh!",info_callback)
-                return []
-
-            for row in reader :
-            #skip missing fields
-                if not all(row.get(field) and row.get(field).strip() != "" for field in expected_fields):
-                    call_info("missing values are skipped",info_callback)
-                    continue 
-
-                #parsing amount field
-                try:
-                    row["Amount"] = Decimal(row["Amount"])
-                except (ValueError, InvalidOperation):
-                    call_info("error with amounts",info_callback)
-                    continue
+            head = os.read(fd, 6)
+        finally:
+            os.close(fd)
+    except OSError:
+        head = b""
+    for name, magic, suffix in _CODECS:
+        if (head.startswith(magic) if head else path.endswith(suffix)):
+            return name
+    return None
+
+
+def _codec_module(codec):
+    #imported on first use - plain ledgers never pay for them
+    if codec == "gzip":
+        import gzip
+        return gzip
+    if codec == "bz2":
+        import bz2
+        return bz2
+    import lzma
+    return lzma
+
+
+def _open_codec(path, mode, codec):
+    '''
+    text stream through the codec - "r" decompresses as it is read, "a" adds a new
+    compressed member (gzip) or stream (bz2, xz) after the existing ones, "w" starts over
+    '''
+    return _codec_module(codec).open(path, mode = mode + "t", newline ="", encoding ="utf-8")
 
-                #parsing date field
-                try :
-                    row["Date"] = datetime.strptime(row["Date"],"%d-%m-%Y").date()
-                except (ValueError, TypeError):
-                    call_info("Error with date",info_callback)
-                    continue 
 
-                filter_row = {field :row[field] for field in expected_fields}
-                transactions.append(filter_row)
+def _fsync_path(path):
+    #compressed files only hold all their bytes once closed, so they are synced by path afterwards
+    fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-        return transactions 
-    
-    except PermissionError :
-        call_info(f"Error : No permission granted to read {FILENAME}",info_callback)
-        return []
-    except csv.Error as e :
+
+def _open_ledger(filename, codec = None):
+    if codec is not None:
+        return _open_codec(filename, "r", codec)
+    #checks for different encoding type
+    try:
+        return open(filename,mode ="r", newline = "", encoding ="utf-8")
+    except UnicodeDecodeError:
+        return open(filename, mode ="r", newline ="", encoding = "latin-1")
+
+
+EXPECTED_FIELDS = ["Date", "Amount", "Type", "Description"]
+
+#files smaller than this are always parsed on a single core
+PARALLEL_MIN_BYTES = 1024 * 1024
+
+
+def _check_header(fieldnames, info_callback = None):
+    #check for header
+    if not fieldnames :
+        call_info("No header found - Starting Fresh",info_callback)
+        return False
+
+    #check for valid headers
+    if not set(EXPECTED_FIELDS).issubset(fieldnames):
+        call_info(f"Invalid header :{fieldnames} - Starting Fresh!",info_callback)
+        return False
+    return True
+
+
+def _parse_row(row):
+    '''
+    applies the load skip rules to one csv row. returns ((ordinal, minor units, type, description), None)
+    for a valid row and (None, reason) for a skipped one
+    '''
+    #skip missing fields
+    if not all(row.get(field) and row.get(field).strip() != "" for field in EXPECTED_FIELDS):
+        return None, "missing values are skipped"
+
+    #parsing amount field
+    try:
+        amount = parse_amount_minor(row["Amount"])
+    except (ValueError, InvalidOperation):
+        return None, "error with amounts"
+
+    #parsing date field
+    try :
+        ordinal = parse_date(row["Date"]).toordinal()
+    except (ValueError, TypeError):
+        return None, "Error with date"
+
+    return (ordinal, amount, row["Type"], row["Description"]), None
+
+
+#a skipped row is counted in the load report, only the first few line numbers of each kind are kept
+SAMPLE_LINES = 5
+
+
+class LoadReport:
+    '''
+    what a load skipped and why - skipped rows counted per reason (the messages the loader used
+    to send once per row) with the line numbers of the first few, the rows loaded and the time
+    taken. the caller hears about it once, as one summary when the load is done. with interval
+    (seconds) a summary of what was skipped so far is also sent during a long load, at most once
+    per interval
+    '''
+
+    def __init__(self, interval = None):
+        self.interval = interval
+        self.loaded = 0
+        self.counts = Counter()
+        self.samples = {}
+        self.elapsed = 0.0
+        #physical lines read, used to number the lines of the next piece of the ledger
+        self.lines = 0
+        #the exception that stopped the load - load_transaction then hands back an empty store
+        self.error = None
+        self._started = time.perf_counter()
+        self._sent = self._started
+        self._reported = 0
+
+    @property
+    def skipped(self):
+        return sum(self.counts.values())
+
+    def skip(self, reason, line = None, info_callback = None):
+        self.counts[reason] += 1
+        samples = self.samples.setdefault(reason, [])
+        if line is not None and len(samples) < SAMPLE_LINES:
+            samples.append(line)
+        if self.interval is not None:
+            self.poll(info_callback)
+
+    def merge(self, other, line_base = 0):
+        '''adds the report of one piece of the ledger whose first line follows line_base'''
+        self.loaded += other.loaded
+        for reason, count in other.counts.items():
+            self.counts[reason] += count
+            samples = self.samples.setdefault(reason, [])
+            for line in other.samples.get(reason, [])[:SAMPLE_LINES - len(samples)]:
+                samples.append(line + line_base)
+
+    def message(self):
+        parts = []
+        for reason, count in self.counts.items():
+            lines = self.samples.get(reason)
+            where = ""
+            if lines:
+                more = ", ..." if count > len(lines) else ""
+                where = f" (line{'s' if len(lines) > 1 else ''} {', '.join(map(str, lines))}{more})"
+            parts.append(f"{reason} : {count}{where}")
+        return f"{self.skipped} rows skipped - " + "; ".join(parts)
+
+    def poll(self, info_callback = None):
+        if self.interval is not None and time.perf_counter() - self._sent >= self.interval:
+            self.send(info_callback)
+
+    def send(self, info_callback = None):
+        #a summary is only sent when something was skipped since the last one
+        self._sent = time.perf_counter()
+        if self.skipped > self._reported:
+            self._reported = self.skipped
+            call_info(self.message(),info_callback)
+
+    def finish(self, info_callback = None):
+        self.elapsed = time.perf_counter() - self._started
+        self.send(info_callback)
+
+    def to_dict(self):
+        return {
+            "loaded" : self.loaded,
+            "skipped" : self.skipped,
+            "reasons" : {reason : {"count" : count, "lines" : list(self.samples.get(reason, []))}
+                         for reason, count in self.counts.items()},
+            "elapsed" : round(self.elapsed, 6)
+        }
+
+    def __repr__(self):
+        return f"LoadReport({self.loaded} loaded, {self.skipped} skipped, {self.elapsed:.3f}s)"
+
+
+def _parse_records(reader, info_callback = None, tombstones = None, report = None, line_base = 0):
+    '''
+    yields (ordinal, minor units, type, description) for every valid row not cancelled by a tombstone.
+    skipped rows go to report, numbered line_base + the reader's line (unnumbered when line_base is None).
+    without a report they are summed up in one message once the rows run out
+    '''
+    own = report is None
+    if own:
+        report = LoadReport()
+    scanned = skipped = cancelled = 0
+    seen = Counter()
+    try:
+        for row in reader :
+            scanned += 1
+            parsed, error = _parse_row(row)
+            if error:
+                skipped += 1
+                report.skip(error, None if line_base is None else line_base + reader.line_num, info_callback)
+                continue
+            if tombstones and _is_cancelled(tombstones, seen, parsed):
+                cancelled += 1
+                continue
+            yield parsed
+        if own:
+            report.finish(info_callback)
+    finally:
+        report.loaded += scanned - skipped - cancelled
+        _record("rows_scanned", scanned)
+        _record("rows_skipped", skipped)
+
+
+def _read_rows(filename, info_callback = None, state = None, report = None):
+    '''
+    generator over the ledger at filename yielding (ordinal, minor units, type, description) tuples
+    for every valid row. compressed ledgers are decompressed as they are read.
+    file errors are raised to the caller. skipped rows go to report, see _parse_records.
+    when a state dict is given, state["position"]() returns how many bytes of the ledger file
+    were read so far, and once a plain ledger is done state["offset"] holds the byte offset
+    the parse stopped at and state["lines"] the lines read
+    '''
+    tombstones = _load_tombstones(filename)
+    codec = _ledger_codec(filename)
+    with _open_ledger(filename, codec) as file :
+        if codec is None:
+            position = file.buffer.tell
+        else:
+            #the position in the compressed file underneath, not in the decompressed text
+            fd = file.buffer.fileno()
+            position = lambda : os.lseek(fd, 0, os.SEEK_CUR)
+        if state is not None:
+            state["position"] = position
+        reader = csv.DictReader(file)
+        if not _check_header(reader.fieldnames, info_callback):
+            return
+        yield from _parse_records(reader, info_callback, tombstones, report)
+        if state is not None and codec is None:
+            state["offset"] = file.buffer.tell()
+            state["lines"] = reader.line_num
+        if _metrics is not None:
+            _metrics.add("bytes_read", position())
+
+
+def _decode_bytes(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def _split_ranges(file, start, end, parts):
+    '''splits [start, end) into up to parts byte ranges that each begin on a fresh line'''
+    bounds = [start]
+    for k in range(1, parts):
+        pos = start + (end - start) * k // parts
+        if pos <= bounds[-1]:
+            continue
+        #step back one byte so a boundary that already sits on a line start is kept
+        file.seek(pos - 1)
+        file.readline()
+        pos = file.tell()
+        if pos >= end:
+            break
+        if pos > bounds[-1]:
+            bounds.append(pos)
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_range(path, start, end, fieldnames):
+    '''worker for the parallel loader - parses one byte range into its own store'''
+    with open(path, mode ="rb") as file :
+        file.seek(start)
+        text = _decode_bytes(file.read(end - start))
+
+    report = LoadReport()
+    store = TransactionStore()
+    reader = csv.DictReader(io.StringIO(text, newline =""), fieldnames = fieldnames)
+    for parsed in _parse_records(reader, report = report):
+        store.append_parsed(*parsed)
+    report.lines = reader.line_num
+    return store, report
+
+
+class LoadCancelled(Exception):
+    '''raised inside the loaders when the cancel event passed to load_transaction is set'''
+
+
+def _check_progress(done, total, progress = None, cancel = None):
+    if cancel is not None and cancel.is_set():
+        raise LoadCancelled()
+    if progress:
+        progress(done, total)
+
+
+def _load_parallel(filename, workers, info_callback = None, progress = None, cancel = None, report = None):
+    '''
+    parses the ledger in newline aligned byte ranges on a process pool and merges the
+    pieces back in file order. rows are expected on a single line each, which is how
+    save_transaction writes them.
+    '''
+    transactions = TransactionStore()
+    report = report if report is not None else LoadReport()
+    path = os.path.abspath(filename)
+
+    with open(path, mode ="rb") as file :
+        header = _decode_bytes(file.readline())
+        fieldnames = next(csv.reader([header]), [])
+        if not _check_header(fieldnames, info_callback):
+            return transactions
+        start = file.tell()
+        end = os.fstat(file.fileno()).st_size
+        ranges = _split_ranges(file, start, end, workers)
+
+    #imported here - the process pool machinery is the slowest import of the module and only this path needs it
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers = workers) as pool :
+        futures = [pool.submit(_parse_range, path, lo, hi, fieldnames) for lo, hi in ranges]
+        #line 1 is the header, every range goes on from the lines of the ones before it
+        line_base = 1
+        for (lo, hi), future in zip(ranges, futures):
+            store, part = future.result()
+            report.merge(part, line_base)
+            report.poll(info_callback)
+            line_base += part.lines
+            transactions.merge(store)
+            #the workers count in their own process, so their rows are reported here
+            _record("rows_scanned", len(store) + part.skipped)
+            _record("rows_skipped", part.skipped)
+            _record("bytes_read", hi - lo)
+            try:
+                _check_progress(hi, end, progress, cancel)
+            except LoadCancelled:
+                pool.shutdown(cancel_futures = True)
+                raise
+    transactions.build_date_index()
+    _capture_source(transactions, filename, end, line_base)
+    return transactions
+
+
+def _report_load_error(e, filename, info_callback = None):
+    if isinstance(e, PermissionError):
+        call_info(f"Error : No permission granted to read {filename}",info_callback)
+    elif isinstance(e, csv.Error):
         call_info( f"Error : possibly corrupted csv - {e}",info_callback)
-        return []
-    except MemoryError:
+    elif isinstance(e, MemoryError):
         call_info(f"Error : File too huge to process !",info_callback)
-        return []
-    except Exception as e :
+    else:
         call_info(f"Error : unexpected error : {e}",info_callback)
-        return []
 
-      
 
-def save_transaction(new_transaction,info_callback = None):
+def iter_transactions(info_callback = None, chunk_size = None, filename = None):
+    '''
+    streams validated transactions from the ledger (filename, FILENAME by default) without holding
+    the whole file. yields one row dict at a time, or lists of up to chunk_size rows when chunk_size
+    is given. view_summary, the searches and aggregate take either form of the stream directly
+    '''
+    filename = filename or FILENAME
+    if not os.path.exists(filename):
+        call_info("No file was found - Starting Fresh",info_callback)
+        return
+
+    chunk = []
+    try:
+        for ordinal, amount, type_, desc in _read_rows(filename, info_callback):
+            row = {
+                "Date" : date.fromordinal(ordinal),
+                "Amount" : from_minor_units(amount),
+                "Type" : type_,
+                "Description" : desc
+            }
+            if not chunk_size:
+                yield row
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    except Exception as e :
+        _report_load_error(e, filename, info_callback)
+
+
+def _snapshot_path(filename):
+    return filename + SNAPSHOT_SUFFIX
+
+
+def _file_signature(path):
+    #size, mtime and a content hash - any of them changing invalidates the snapshot
+    if not os.path.isfile(path):
+        return None
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size = 16)
+    with open(path, mode ="rb") as file :
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+
+
+def _snapshot_key(filename):
+    return {"ledger" : _file_signature(filename), "tombstones" : _file_signature(_tombstone_path(filename))}
+
+
+_SNAPSHOT_ARRAYS = ("dates", "amounts", "types", "descs", "_date_keys", "_date_rows")
+
+
+def write_snapshot(transactions, key = None, info_callback = None, filename = None):
+    '''
+    writes the store next to the ledger (filename, FILENAME by default) as a compact binary
+    snapshot - a json header followed by the raw column and index arrays. key must describe the
+    ledger the store was parsed from (load_transaction passes it). returns True when the snapshot was written
+    '''
+    if not isinstance(transactions.amounts, array):
+        #amounts beyond int64 are kept as a plain list and are not snapshotted
+        return False
+    filename = filename or FILENAME
+    key = key or _snapshot_key(filename)
+    type_keys = list(transactions._type_index)
+    desc_keys = list(transactions._desc_index)
+    header = {
+        "key" : key,
+        "byteorder" : sys.byteorder,
+        "arrays" : {name : [getattr(transactions, name).typecode, getattr(transactions, name).itemsize,
+                            len(getattr(transactions, name))] for name in _SNAPSHOT_ARRAYS},
+        "type_values" : transactions.type_values,
+        "desc_values" : transactions.desc_values,
+        "type_index" : [[k, len(transactions._type_index[k])] for k in type_keys],
+        "desc_index" : [[k, len(transactions._desc_index[k])] for k in desc_keys],
+        "date_dirty" : transactions._date_dirty,
+        "income" : transactions.income,
+        "expense" : transactions.expense
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    temp_path = _snapshot_path(filename) + ".tmp"
+    try:
+        with open(temp_path, mode ="wb") as file :
+            file.write(_SNAPSHOT_MAGIC)
+            file.write(struct.pack("<Q", len(header_bytes)))
+            file.write(header_bytes)
+            for name in _SNAPSHOT_ARRAYS:
+                getattr(transactions, name).tofile(file)
+            for k in type_keys:
+                transactions._type_index[k].tofile(file)
+            for k in desc_keys:
+                transactions._desc_index[k].tofile(file)
+            _record("bytes_written", file.tell())
+        os.replace(temp_path, _snapshot_path(filename))
+    except OSError as e :
+        call_info(f"Warning : could not write the snapshot - {e}",info_callback)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def _read_array(file, typecode, count):
+    values = array(typecode)
+    values.fromfile(file, count)
+    return values
+
+
+def read_snapshot(key = None, filename = None):
+    '''returns the TransactionStore saved in the snapshot of filename, or None when it is missing, unreadable or stale'''
+    filename = filename or FILENAME
+    path = _snapshot_path(filename)
+    if not os.path.isfile(path):
+        return None
+    key = key or _snapshot_key(filename)
+    try:
+        with open(path, mode ="rb") as file :
+            if file.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+                return None
+            (size,) = struct.unpack("<Q", file.read(8))
+            header = json.loads(file.read(size).decode("utf-8"))
+            if header["key"] != key or header["byteorder"] != sys.byteorder:
+                return None
+
+            store = TransactionStore()
+            for name in _SNAPSHOT_ARRAYS:
+                typecode, itemsize, count = header["arrays"][name]
+                if array(typecode).itemsize != itemsize:
+                    return None
+                setattr(store, name, _read_array(file, typecode, count))
+            for k, count in header["type_index"]:
+                store._type_index[k] = _read_array(file, "I", count)
+            for k, count in header["desc_index"]:
+                store._desc_index[k] = _read_array(file, "I", count)
+            _record("bytes_read", file.tell())
+    except (OSError, EOFError, ValueError, KeyError, struct.error):
+        return None
+
+    for value in header["type_values"]:
+        store._type_code(value)
+    for value in header["desc_values"]:
+        store._desc_code(value)
+    store._date_dirty = header["date_dirty"]
+    store.income = header["income"]
+    store.expense = header["expense"]
+    return store
+
+
+#rows parsed between two progress reports / cancel checks
+PROGRESS_ROWS = 10000
+
+
+def _parse_ledger(filename, workers, info_callback = None, progress = None, cancel = None, report = None):
+    #pending tombstones have to be matched in file order, so they keep the load serial.
+    #compressed ledgers cannot be split into byte ranges and are always parsed as one stream
+    if (workers and workers > 1 and os.path.getsize(filename) >= PARALLEL_MIN_BYTES
+            and not os.path.isfile(_tombstone_path(filename)) and _ledger_codec(filename) is None):
+        return _load_parallel(filename, workers, info_callback, progress, cancel, report)
+
+    transactions = TransactionStore()
+    state = {}
+    if progress is None and cancel is None:
+        for parsed in _read_rows(filename, info_callback, state, report):
+            transactions.append_parsed(*parsed)
+    else:
+        total = os.path.getsize(filename)
+        for n, parsed in enumerate(_read_rows(filename, info_callback, state, report), start = 1):
+            transactions.append_parsed(*parsed)
+            if not n % PROGRESS_ROWS:
+                _check_progress(state["position"](), total, progress, cancel)
+        _check_progress(total, total, progress, cancel)
+    transactions.build_date_index()
+    if isinstance(state.get("offset"), int):
+        _capture_source(transactions, filename, state["offset"], state.get("lines"))
+    return transactions
+
+
+def load_transaction(info_callback = None, workers = None, snapshot = False, progress = None, cancel = None,
+                     report = None, filename = None):
+    '''
+    loads the ledger (filename, FILENAME by default) into a TransactionStore. with workers > 1
+    large files are parsed on that many processes, with the same skip rules and the same row order.
+    with snapshot = True a binary snapshot next to the ledger is used instead of parsing
+    while the ledger is unchanged, and rewritten after every full parse.
+    progress(bytes done, bytes total) is called every PROGRESS_ROWS rows while parsing, and
+    setting the cancel event (a threading.Event) stops the parse - the load then returns None.
+    skipped rows are summed up in a single message at the end. pass a LoadReport to read the
+    counts, sample lines and time taken afterwards, or to get summaries at an interval
+    '''
+
+    filename = filename or FILENAME
+    # check if file exits
+    if not os.path.exists(filename):
+        call_info("No file was found - Starting Fresh",info_callback)
+        return TransactionStore()
+
+    report = report if report is not None else LoadReport()
+    try:
+        if snapshot:
+            key = _snapshot_key(filename)
+            cached = read_snapshot(key, filename)
+            if cached is not None:
+                _capture_source(cached, filename, key["ledger"][0])
+                report.loaded = len(cached)
+                report.finish(info_callback)
+                return cached
+
+        transactions = _parse_ledger(filename, workers, info_callback, progress, cancel, report)
+        if snapshot:
+            write_snapshot(transactions, key, info_callback, filename)
+        report.finish(info_callback)
+        return transactions
+
+    except LoadCancelled:
+        return None
+    except Exception as e :
+        report.error = e
+        _report_load_error(e, filename, info_callback)
+        return TransactionStore()
+
+
+#how much of the ledger is hashed to notice it being rewritten in place
+SOURCE_PREFIX_BYTES = 64 * 1024
+#tails longer than this mark the date index dirty and rebuild it once
+TAIL_BULK_ROWS = 1024
+
+
+def _prefix_digest(file, length):
+    file.seek(0)
+    return hashlib.blake2b(file.read(length), digest_size = 16).hexdigest()
+
+
+def _tombstone_signature(filename):
+    path = _tombstone_path(filename)
+    if not os.path.isfile(path):
+        return None
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _capture_source(transactions, filename, offset, lines = None):
+    '''
+    remembers the ledger the store was parsed from and the byte offset the parse stopped at -
+    file identity, a hash of its first bytes, the tombstone log and the row count are what
+    reload_transaction checks before trusting the offset
+    '''
+    transactions.source = None
+    if _ledger_codec(filename) is not None:
+        #offsets into a compressed stream cannot be resumed, compressed ledgers are always reloaded in full
+        return
+    try:
+        with open(filename, mode ="rb") as file :
+            stat = os.fstat(file.fileno())
+            if offset > stat.st_size:
+                return
+            if offset:
+                file.seek(offset - 1)
+                if file.read(1) != b"\n":
+                    #the last row was still being written, only a full reload picks it up cleanly
+                    return
+            file.seek(0)
+            fieldnames = next(csv.reader([_decode_bytes(file.readline())]), [])
+            prefix_len = min(offset, SOURCE_PREFIX_BYTES)
+            transactions.source = {
+                "path" : os.path.abspath(filename),
+                "file_id" : (stat.st_dev, stat.st_ino),
+                "offset" : offset,
+                #lines up to the offset (None when unknown), numbers the lines of a tail that skips rows
+                "lines" : lines,
+                "rows" : len(transactions),
+                "fieldnames" : fieldnames,
+                "prefix_len" : prefix_len,
+                "prefix" : _prefix_digest(file, prefix_len),
+                "tombstones" : _tombstone_signature(filename)
+            }
+    except OSError:
+        pass
+
+
+def _read_tail(transactions, filename, info_callback = None):
+    '''
+    parses the rows appended after the remembered offset into the store. returns how many rows
+    were added, or None when the ledger is no longer the one the offset belongs to
+    '''
+    source = transactions.source
+    if source is None or source["path"] != os.path.abspath(filename) or source["rows"] != len(transactions):
+        return None
+    if _tombstone_signature(filename) != source["tombstones"]:
+        return None
+
+    with open(filename, mode ="rb") as file :
+        stat = os.fstat(file.fileno())
+        #compaction replaces the file, delete_all truncates it, anything else shows in the prefix
+        if (stat.st_dev, stat.st_ino) != source["file_id"] or stat.st_size < source["offset"]:
+            return None
+        if _prefix_digest(file, source["prefix_len"]) != source["prefix"]:
+            return None
+        file.seek(source["offset"])
+        data = file.read(stat.st_size - source["offset"])
+    _record("bytes_read", len(data))
+
+    #a row without its newline is still being written and is left for the next reload
+    data = data[:data.rfind(b"\n") + 1]
+    reader = csv.DictReader(io.StringIO(_decode_bytes(data), newline =""), fieldnames = source["fieldnames"])
+    before = len(transactions)
+    rows = list(_parse_records(reader, info_callback, line_base = source["lines"]))
+    #a short tail is slotted into the date index row by row instead of re-sorting the whole index
+    bulk = len(rows) > TAIL_BULK_ROWS
+    for parsed in rows:
+        transactions.insert_parsed(len(transactions), *parsed, bulk = bulk)
+    transactions.build_date_index()
+
+    source["offset"] += len(data)
+    source["rows"] = len(transactions)
+    if source["lines"] is not None:
+        source["lines"] += reader.line_num
+    return len(transactions) - before
+
+
+def reload_transaction(transactions, info_callback = None, filename = None):
+    '''
+    brings a store returned by load_transaction up to date with the ledger (filename, FILENAME by
+    default). while the ledger has only grown, just the appended bytes are read and validated.
+    a truncated, rewritten or compacted ledger, a changed tombstone log or a store edited behind
+    the ledger's back is reloaded in full, in place. returns the number of rows added (every row
+    after a full reload). a full reload that fails leaves transactions as they were and returns None
+    '''
+    filename = filename or FILENAME
+    try:
+        added = _read_tail(transactions, filename, info_callback)
+        if added is not None:
+            return added
+    except OSError:
+        pass
+
+    report = LoadReport()
+    fresh = load_transaction(info_callback, report = report, filename = filename)
+    if report.error is not None:
+        #the empty store of a failed load would wipe the rows every open window is using
+        return None
+    transactions.clear()
+    transactions.merge(fresh)
+    transactions.source = fresh.source
+    if transactions.source is not None:
+        transactions.source["rows"] = len(transactions)
+    return len(transactions)
+
+
+def _ledger_size(filename):
+    return os.path.getsize(filename) if os.path.exists(filename) else 0
+
+
+def _follow_append(transactions, before, filename):
+    '''moves the reload offset past rows this process appended itself, so a reload does not read them back'''
+    source = getattr(transactions, "source", None)
+    if source is None:
+        return
+    if before == source["offset"]:
+        source["offset"] = _ledger_size(filename)
+        source["rows"] = len(transactions)
+    else:
+        #another writer got in first - only a full reload can tell its rows from ours
+        transactions.source = None
+
+
+def _follow_delete(transactions, before, filename):
+    '''same as _follow_append for a tombstone this process wrote'''
+    source = getattr(transactions, "source", None)
+    if source is None:
+        return
+    if before == source["tombstones"]:
+        source["tombstones"] = _tombstone_signature(filename)
+        source["rows"] = len(transactions)
+    else:
+        transactions.source = None
+
+
+
+def save_transaction(new_transaction,info_callback = None, filename = None):
+    filename = filename or FILENAME
     clean_transactions = []
     expected_fields = ["Date", "Amount", "Type", "Description"]
 
@@ -97,16 +1239,22 @@ def save_transaction(new_transaction,info_callback = None):
         transaction_copy["Date"] = transaction_copy["Date"].strftime("%d-%m-%Y")
     clean_transactions.append(transaction_copy)
     try:
-        file_exists = os.path.exists(FILENAME)
-        with open (FILENAME, mode="a", newline = "", encoding = "utf-8") as file :
-            writer = csv.DictWriter(file, fieldnames= expected_fields)
-
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(clean_transactions)
+        with _ledger_lock:
+            file_exists = os.path.exists(filename)
+            codec = _ledger_codec(filename)
+            start = _ledger_size(filename) if _metrics is not None else 0
+            with (_open_codec(filename, "a", codec) if codec else
+                  open (filename, mode="a", newline = "", encoding = "utf-8")) as file :
+                writer = csv.DictWriter(file, fieldnames= expected_fields)
+
+                if not file_exists:
+                    writer.writeheader()
+                writer.writerows(clean_transactions)
+            if _metrics is not None:
+                _metrics.add("bytes_written", _ledger_size(filename) - start)
         
     except PermissionError:
-        call_info(f"Error : Permission not granted to write to the '{FILENAME}' ",info_callback)
+        call_info(f"Error : Permission not granted to write to the '{filename}' ",info_callback)
         return None
     except MemoryError:
         call_info(f"Error : Too many transaction to save .. system overload.",info_callback)
@@ -122,69 +1270,214 @@ def save_transaction(new_transaction,info_callback = None):
 
 
 
+#error codes of validate_dates / validate_amounts - each one stands for the message
+#valid_date / valid_amount report for the same input
+VALID = 0
+DATE_EMPTY = 1
+DATE_FORMAT = 2
+DATE_FUTURE = 3
+DATE_TOO_OLD = 4
+AMOUNT_EMPTY = 5
+AMOUNT_INVALID = 6
+AMOUNT_ZERO = 7
+AMOUNT_NEGATIVE = 8
+AMOUNT_TOO_HUGE = 9
+AMOUNT_PLACES = 10
+
+VALIDATION_MESSAGES = {
+    DATE_EMPTY : "Date cannot be empty",
+    DATE_FORMAT : "Invalid date : Use DD-MM-YYYY (e.g., 25-12-2024).",
+    DATE_FUTURE : "Invalid date : cannot be ahead of today",
+    DATE_TOO_OLD : "Invalid date :  too way back in the past",
+    AMOUNT_EMPTY : "Amount cannot be Empty",
+    AMOUNT_INVALID : "Invalid Amount !! enter only numbers ",
+    AMOUNT_ZERO : "Amount cannot be zero",
+    AMOUNT_NEGATIVE : "Amount cannot be Negative",
+    AMOUNT_TOO_HUGE : "Amount too huge! Maximum allowed is 1e20.",
+    AMOUNT_PLACES : "Amount can have at most two decimal places",
+}
+
+#currency marks and thousands separators valid_amount drops from typed amounts
+_CURRENCY_STRIP = str.maketrans("", "", ",$₹£")
+#the usual typed amount shapes - "1250", "$12.5", "₹1,250.50" - parsed and stripped in one match
+_TYPED_AMOUNT_RE = re.compile(r"[$₹£]?([0-9][0-9,]*)(?:\.([0-9]{1,2}))?")
+MIN_YEAR = 1920
+MAX_AMOUNT = Decimal("1e20")
+
+
 def valid_date(date_input,info_callback = None):
     if not date_input:
-        call_info("Date cannot be empty",info_callback)
+        call_info(VALIDATION_MESSAGES[DATE_EMPTY],info_callback)
         return None
 
     try :
 
-        parsed_date = datetime.strptime(date_input , "%d-%m-%Y").date()
+        parsed_date = parse_date(date_input)
         today = date.today()
 
         
 
         if parsed_date > today :
-            call_info("Invalid date : cannot be ahead of today",info_callback)
+            call_info(VALIDATION_MESSAGES[DATE_FUTURE],info_callback)
             return None
 
-        if parsed_date.year < 1920:
-            call_info("Invalid date :  too way back in the past",info_callback)
+        if parsed_date.year < MIN_YEAR:
+            call_info(VALIDATION_MESSAGES[DATE_TOO_OLD],info_callback)
             return None
-            
+
 
         return parsed_date
 
     except ValueError:
-        call_info("Invalid date : Use DD-MM-YYYY (e.g., 25-12-2024).",info_callback)
+        call_info(VALIDATION_MESSAGES[DATE_FORMAT],info_callback)
         return None
 
 def valid_amount(amt,info_callback = None):
 
 
     if not amt :
-        call_info("Amount cannot be Empty",info_callback)
+        call_info(VALIDATION_MESSAGES[AMOUNT_EMPTY],info_callback)
         return None
-        
 
+
+    #one typed value parses faster through Decimal than through the fast parser's regex,
+    #which only pays off over a batch (validate_amounts, the loader)
     amt_str = amt.replace(',','').replace("$","").replace("₹","").replace("£","")
 
     try:
-        amt = Decimal(amt_str)
+        amt = parse_amount(amt_str)
     except (InvalidOperation, ValueError):
-        call_info("Invalid Amount !! enter only numbers ",info_callback)
+        call_info(VALIDATION_MESSAGES[AMOUNT_INVALID],info_callback)
+        return None
+
+    if amt.is_nan() :
+        call_info(VALIDATION_MESSAGES[AMOUNT_INVALID],info_callback)
         return None
-        
+
 
     if amt == 0 :
-        call_info("Amount cannot be zero",info_callback)
+        call_info(VALIDATION_MESSAGES[AMOUNT_ZERO],info_callback)
         return None
-        
+
     if amt < 0 :
-        call_info("Amount cannot be Negative",info_callback)
+        call_info(VALIDATION_MESSAGES[AMOUNT_NEGATIVE],info_callback)
         return None
-        
-    if amt > Decimal("1e20") :
-        call_info("Amount too huge! Maximum allowed is 1e20.",info_callback)
+
+    if amt > MAX_AMOUNT :
+        call_info(VALIDATION_MESSAGES[AMOUNT_TOO_HUGE],info_callback)
         return None
-        
+
+    #the store keeps whole paise, a third decimal place would be lost
+    if amt != amt.quantize(_MINOR_QUANTUM) :
+        call_info(VALIDATION_MESSAGES[AMOUNT_PLACES],info_callback)
+        return None
+
 
     return amt
 
+
+def _check_date(value, today, first):
+    #(ordinal, VALID) or (0, error code) - the checks of valid_date, with today and the first allowed day as ordinals
+    if not value:
+        return 0, DATE_EMPTY
+    try:
+        ordinal = _to_ordinal(value)
+    except (ValueError, TypeError):
+        return 0, DATE_FORMAT
+    if ordinal > today:
+        return 0, DATE_FUTURE
+    if ordinal < first:
+        return 0, DATE_TOO_OLD
+    return ordinal, VALID
+
+
+def validate_dates(values, today = None):
+    '''
+    valid_date over a whole column (a list, tuple or NumPy array of DD-MM-YYYY strings or dates). today is
+    looked up once for the batch and every distinct string is parsed once. returns (ordinals, codes) -
+    array("i") of date ordinals (0 where invalid) and array("B") of error codes, VALID for good rows.
+    VALIDATION_MESSAGES[code] is what valid_date reports for the same value
+    '''
+    today = (today or date.today()).toordinal()
+    first = date(MIN_YEAR, 1, 1).toordinal()
+    ordinals = array("i")
+    codes = array("B")
+    seen = {}
+    for value in values:
+        try:
+            result = seen.get(value)
+        except TypeError:
+            #unhashable values are checked without the cache
+            result = _check_date(value, today, first)
+        if result is None:
+            result = seen[value] = _check_date(value, today, first)
+        ordinals.append(result[0])
+        codes.append(result[1])
+    return ordinals, codes
+
+
+def validate_amounts(values):
+    '''
+    valid_amount over a whole column (a list, tuple or NumPy array of typed amounts or Decimals). the usual
+    shapes are stripped and parsed by a single regex match without Decimal, anything else has its
+    currency marks dropped with one translate pass and goes through Decimal like valid_amount.
+    returns (minors, codes) - the amounts in minor units, as the store keeps them (0 where invalid),
+    and array("B") of error codes. minors is an array("q"), or a list when an amount is beyond int64.
+    VALIDATION_MESSAGES[code] is what valid_amount reports for the same value
+    '''
+    limit = to_minor_units(MAX_AMOUNT)
+    fullmatch = _TYPED_AMOUNT_RE.fullmatch
+    minors = []
+    codes = array("B")
+    for value in values:
+        minor, code = 0, VALID
+        if isinstance(value, (Decimal, int)):
+            #rows read back from a store carry Decimals
+            value = str(value)
+        if not value:
+            code = AMOUNT_EMPTY
+        else:
+            try:
+                match = fullmatch(value)
+                if match:
+                    whole, frac = match.groups()
+                    if "," in whole:
+                        whole = whole.replace(",", "")
+                    minor = int(whole) * MINOR_UNITS + (int(frac.ljust(2, "0")) if frac else 0)
+                    if not minor:
+                        code = AMOUNT_ZERO
+                    elif minor > limit:
+                        code = AMOUNT_TOO_HUGE
+                else:
+                    amount = parse_amount(value.translate(_CURRENCY_STRIP))
+                    if amount.is_nan():
+                        code = AMOUNT_INVALID
+                    elif amount == 0:
+                        code = AMOUNT_ZERO
+                    elif amount < 0:
+                        code = AMOUNT_NEGATIVE
+                    elif amount > MAX_AMOUNT:
+                        code = AMOUNT_TOO_HUGE
+                    elif amount != amount.quantize(_MINOR_QUANTUM):
+                        code = AMOUNT_PLACES
+                    else:
+                        minor = to_minor_units(amount)
+            except (InvalidOperation, ValueError, AttributeError, TypeError):
+                code = AMOUNT_INVALID
+            if code:
+                minor = 0
+        minors.append(minor)
+        codes.append(code)
+    try:
+        minors = array("q", minors)
+    except OverflowError:
+        pass
+    return minors, codes
+
     
 
 
-def add_transaction(transactions,date_input,amt,type_,desc,info_callback = None):
+def add_transaction(transactions,date_input,amt,type_,desc,info_callback = None, filename = None):
 
     #storing the input with the help of helper function
     date_input = valid_date(date_input,info_callback)
@@ -198,26 +1491,200 @@ def add_transaction(transactions,date_input,amt,type_,desc,info_callback = None)
     }
     
     transactions.append(new_transaction)
-    
-    save_transaction(new_transaction,info_callback)
+
+    ledger = filename or FILENAME
+    before = _ledger_size(ledger) if getattr(transactions, "source", None) else None
+    rollup_before = _rollup_begin(ledger)
+    save_transaction(new_transaction,info_callback, ledger)
+    _follow_append(transactions, before, ledger)
+    _rollup_apply(ledger, rollup_before, [new_transaction], 1)
 
     call_info("transaction added successfully ",info_callback)
-        
 
-def view_summary(transactions ,info_callback = None):
+
+def _format_row(transaction):
+    #the on-disk form of a transaction, as save_transaction writes it
+    row = {field : transaction[field] for field in EXPECTED_FIELDS}
+    if isinstance(row["Date"], date):
+        row["Date"] = row["Date"].strftime("%d-%m-%Y")
+    row["Description"] = str(row["Description"])
+    return row
+
+
+class LedgerWriter:
+    '''
+    buffered appender for the ledger (filename, FILENAME by default) - the file is opened once
+    for a whole batch and flushed (plus one optional fsync) on exit. use it as a context manager.
+    '''
+
+    def __init__(self, fsync = False, buffer_size = 1024 * 1024, filename = None):
+        self.filename = filename or FILENAME
+        self.fsync = fsync
+        self.buffer_size = buffer_size
+        self.written = 0
+        self._file = None
+        self._writer = None
+
+    def __enter__(self):
+        _ledger_lock.acquire()
+        try:
+            needs_header = not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0
+            self._codec = _ledger_codec(self.filename)
+            self._start = _ledger_size(self.filename)
+            if self._codec:
+                self._file = _open_codec(self.filename, "a", self._codec)
+            else:
+                self._file = open(self.filename, mode ="a", newline ="", encoding ="utf-8", buffering = self.buffer_size)
+            self._writer = csv.DictWriter(self._file, fieldnames = EXPECTED_FIELDS)
+            if needs_header:
+                self._writer.writeheader()
+        except BaseException:
+            _ledger_lock.release()
+            raise
+        return self
+
+    def write(self, transaction):
+        self._writer.writerow(_format_row(transaction))
+        self.written += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._file.flush()
+            if self.fsync and exc_type is None and not self._codec:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            if self.fsync and exc_type is None and self._codec:
+                _fsync_path(self.filename)
+            _record("bytes_written", _ledger_size(self.filename) - self._start)
+        finally:
+            _ledger_lock.release()
+        return False
+
+
+def _validate_entries(entries):
+    '''
+    the checks of add_transaction over a whole batch - dates and amounts are validated column-wise
+    by validate_dates and validate_amounts. returns one (transaction, None) or (None, message) per entry,
+    the message being the first check the entry failed
+    '''
+    rows = []
+    for entry in entries:
+        try:
+            if isinstance(entry, dict):
+                rows.append(tuple(entry.get(field) for field in EXPECTED_FIELDS))
+            else:
+                date_input, amt, type_, desc = entry
+                rows.append((date_input, amt, type_, desc))
+        except (TypeError, ValueError) as e :
+            rows.append(f"Invalid entry : {e}")
+
+    valid = [row for row in rows if not isinstance(row, str)]
+    ordinals, date_codes = validate_dates([row[0] for row in valid])
+    minors, amount_codes = validate_amounts([row[1] for row in valid])
+
+    results = []
+    i = 0
+    for row in rows:
+        if isinstance(row, str):
+            results.append((None, row))
+            continue
+        type_, desc = row[2], row[3]
+        if date_codes[i]:
+            message = VALIDATION_MESSAGES[date_codes[i]]
+        elif amount_codes[i]:
+            message = VALIDATION_MESSAGES[amount_codes[i]]
+        elif not type_ or not str(type_).strip():
+            message = "Type cannot be empty"
+        elif not desc or not str(desc).strip():
+            message = "Description cannot be empty"
+        else:
+            message = None
+        if message:
+            results.append((None, message))
+        else:
+            results.append(({
+                "Date" : date.fromordinal(ordinals[i]).strftime("%d-%m-%Y"),
+                "Amount" : from_minor_units(minors[i]),
+                "Type" : str(type_).upper(),
+                "Description" : str(desc).lower()
+            }, None))
+        i += 1
+    return results
+
+
+def add_transactions(transactions, entries, info_callback = None, fsync = False, filename = None):
+    '''
+    bulk version of add_transaction. entries are (date, amount, type, description) tuples or
+    dicts with the ledger fields. every entry is validated, the valid ones are appended to
+    transactions and written with a single open of the ledger. failures do not stop the batch,
+    they are returned as a list of (entry number, message)
+    '''
+    failures = []
+    added = []
+    checked = _validate_entries(entries)
+    filename = filename or FILENAME
+    before = _ledger_size(filename) if getattr(transactions, "source", None) else None
+    rollup_before = _rollup_begin(filename)
+    try:
+        with LedgerWriter(fsync = fsync, filename = filename) as writer :
+            for number, (new_transaction, message) in enumerate(checked, start = 1):
+                if new_transaction is None:
+                    failures.append((number, message))
+                    continue
+                writer.write(new_transaction)
+                transactions.append(new_transaction)
+                added.append(new_transaction)
+    except PermissionError:
+        call_info(f"Error : Permission not granted to write to the '{filename}' ",info_callback)
+        return failures
+    except OSError as e :
+        call_info(f"OS error occured while saving the file : {e}",info_callback)
+        return failures
+
+    _follow_append(transactions, before, filename)
+    _rollup_apply(filename, rollup_before, added, 1)
+    call_info(f"{len(added)} transactions added, {len(failures)} failed",info_callback)
+    return failures
+
+
+def _is_empty(transactions):
+    #generators cannot be tested for emptiness up front, they are counted while scanning
+    return transactions is None or (isinstance(transactions, Sized) and len(transactions) == 0)
+
+
+def _flatten(transactions):
+    #iter_transactions(chunk_size = N) yields lists of rows, the scans take them one row at a time
+    for item in transactions:
+        if isinstance(item, list):
+            yield from item
+        else:
+            yield item
+
+
+def view_summary(transactions ,info_callback = None, verify = False):
     '''
     displays a summary of total income, total expense and net balance.
+    a TransactionStore answers from its running totals, verify = True rechecks them with a full scan.
     '''
 
     income = Decimal("0.00")
     expense = Decimal("0.00")
 
-    if not transactions:
+    if _is_empty(transactions):
         call_info("No transaction records found",info_callback)
         return None
-    
-    corrupted_transactions = []
-    for transaction in transactions:
+
+    if isinstance(transactions, TransactionStore):
+        if verify:
+            transactions.verify_totals(info_callback)
+            _record("rows_scanned", len(transactions))
+        return transactions.totals()
+
+    #works on lists, stores and iter_transactions() streams (chunked or not) alike
+    seen = 0
+    corrupted = 0
+    for transaction in _flatten(transactions):
+        seen += 1
         try:
             amt = Decimal(transaction["Amount"])
             if transaction["Type"].upper() == "Credit".upper():
@@ -225,12 +1692,17 @@ def view_summary(transactions ,info_callback = None):
             elif transaction["Type"].upper() == "Debit".upper():
                 expense += amt
 
-        except (KeyError, ValueError, InvalidOperation) as e:
-            corrupted_transactions.append((transaction, str(e)))
-    
+        except (KeyError, ValueError, InvalidOperation):
+            corrupted += 1
+
+    if not seen:
+        call_info("No transaction records found",info_callback)
+        return None
 
-    if corrupted_transactions:
-        call_info(f"{len(corrupted_transactions)} corrupted transactions skipped", info_callback) 
+    _record("rows_scanned", seen)
+    _record("rows_skipped", corrupted)
+    if corrupted:
+        call_info(f"{corrupted} corrupted transactions skipped", info_callback)
     result = [income, expense, (income- expense)]
     return result 
     
@@ -238,19 +1710,38 @@ def view_summary(transactions ,info_callback = None):
 def search_by_type(transactions,type_,info_callback = None):
     '''search and print all transaction of the given type'''
 
-    if not transactions:
+    if _is_empty(transactions):
         call_info("No transaction found",info_callback)
         return None
+
+    if isinstance(transactions, TransactionStore):
+        match = [transactions[i] for i in transactions.positions_by_type(type_)]
+        _record("rows_scanned", len(match))
+        if not match:
+            call_info("No records found of the type",info_callback)
+            return None
+        return match
+
     match = []
     found = False
-    for transaction in transactions:
-        try: 
-            if transaction["Type"].upper() == type_.upper():
+    seen = 0
+    corrupted = 0
+    wanted = type_.upper()
+    for transaction in _flatten(transactions):
+        seen += 1
+        try:
+            if transaction["Type"].upper() == wanted:
                 match.append(transaction)
                 found = True
-        except (KeyError, ValueError, TypeError) as e:
-            call_info(f"Error occurred while searching by type: {e}",info_callback)
-            return None
+        except (KeyError, AttributeError, TypeError):
+            corrupted += 1
+    _record("rows_scanned", seen)
+    _record("rows_skipped", corrupted)
+    if corrupted:
+        call_info(f"{corrupted} corrupted transactions skipped while searching by type",info_callback)
+    if not seen:
+        call_info("No transaction found",info_callback)
+        return None
     if not found :
         call_info("No records found of the type",info_callback)
         return None
@@ -261,15 +1752,30 @@ def search_by_type(transactions,type_,info_callback = None):
 def search_by_desc(transactions,desc,info_callback= None):
     '''search and print all transaction of the given description'''
 
-    if not transactions:
+    if _is_empty(transactions):
         call_info("No transaction found",info_callback)
         return None
+
+    if isinstance(transactions, TransactionStore):
+        match = [transactions[i] for i in transactions.positions_by_desc(desc)]
+        _record("rows_scanned", len(match))
+        if not match:
+            call_info("No records found of the given decription",info_callback)
+            return None
+        return match
+
     match = []
     found = False
-    for transaction in transactions:
+    seen = 0
+    for transaction in _flatten(transactions):
+        seen += 1
         if desc == transaction["Description"]:
             match.append(transaction)
             found = True
+    _record("rows_scanned", seen)
+    if not seen:
+        call_info("No transaction found",info_callback)
+        return None
     if not found :
         call_info("No records found of the given decription",info_callback)
         return  None
@@ -277,6 +1783,432 @@ def search_by_desc(transactions,desc,info_callback= None):
     return match 
 
 
+def month_bounds(year, month):
+    '''first and last day of the given month'''
+    first = date(year, month, 1)
+    following = date(year + month // 12, month % 12 + 1, 1)
+    return first, date.fromordinal(following.toordinal() - 1)
+
+
+def year_bounds(year):
+    '''first and last day of the given year'''
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def _date_range(start, end, info_callback = None):
+    #accepts date objects or DD-MM-YYYY strings for either end of the range
+    try:
+        start, end = _to_ordinal(start), _to_ordinal(end)
+    except (ValueError, TypeError):
+        call_info("Invalid date : Use DD-MM-YYYY (e.g., 25-12-2024).",info_callback)
+        return None
+    if start > end:
+        call_info("Invalid range : start date is after end date",info_callback)
+        return None
+    return start, end
+
+
+def _rows_between(transactions, start, end):
+    #linear fallback for plain lists and streams, returns matches in date order
+    found = []
+    corrupted = 0
+    position = -1
+    for position, transaction in enumerate(_flatten(transactions)):
+        try:
+            ordinal = _to_ordinal(transaction["Date"])
+        except (KeyError, ValueError, TypeError):
+            corrupted += 1
+            continue
+        if start <= ordinal <= end:
+            found.append((ordinal, position, transaction))
+    _record("rows_scanned", position + 1)
+    _record("rows_skipped", corrupted)
+    found.sort(key = lambda item: item[:2])
+    return [item[2] for item in found], corrupted
+
+
+def search_by_date_range(transactions, start, end, info_callback = None):
+    '''search all transactions dated between start and end (both inclusive), oldest first'''
+
+    if _is_empty(transactions):
+        call_info("No transaction found",info_callback)
+        return None
+    bounds = _date_range(start, end, info_callback)
+    if bounds is None:
+        return None
+
+    if isinstance(transactions, TransactionStore):
+        match = [transactions[i] for i in transactions.positions_between(*bounds)]
+        _record("rows_scanned", len(match))
+    else:
+        match, corrupted = _rows_between(transactions, *bounds)
+        if corrupted:
+            call_info(f"{corrupted} corrupted transactions skipped",info_callback)
+
+    if not match:
+        call_info("No records found in the given date range",info_callback)
+        return None
+    return match
+
+
+def summary_between(transactions, start, end, info_callback = None):
+    '''income, expense and balance of the transactions dated between start and end'''
+
+    if _is_empty(transactions):
+        call_info("No transaction records found",info_callback)
+        return None
+    bounds = _date_range(start, end, info_callback)
+    if bounds is None:
+        return None
+
+    if isinstance(transactions, TransactionStore):
+        positions = transactions.positions_between(*bounds)
+        if not positions:
+            call_info("No records found in the given date range",info_callback)
+            return None
+        return transactions.totals_of(positions)
+
+    match, corrupted = _rows_between(transactions, *bounds)
+    if corrupted:
+        call_info(f"{corrupted} corrupted transactions skipped",info_callback)
+    if not match:
+        call_info("No records found in the given date range",info_callback)
+        return None
+    return view_summary(match, info_callback)
+
+
+#group keys and metrics understood by aggregate, matched case-insensitively
+GROUP_KEYS = ("date", "month", "year", "Type", "Description")
+METRICS = ("sum", "count", "mean", "min", "max")
+
+
+#date group keys - (date -> sortable int, that int -> label)
+_DATE_GROUPS = {
+    "date" : (date.toordinal, date.fromordinal),
+    "month" : (lambda d : d.year * 12 + d.month - 1, lambda m : f"{m % 12 + 1:02d}-{m // 12}"),
+    "year" : (lambda d : d.year, lambda y : y),
+}
+
+
+def _date_group(transactions, to_key, to_label):
+    #every row with the same date lands in the same group, so the key is worked out once per distinct date
+    keys = {ordinal : to_key(date.fromordinal(ordinal)) for ordinal in set(transactions.dates)}
+    base = min(keys.values())
+    codes = {ordinal : key - base for ordinal, key in keys.items()}
+    return map(codes.__getitem__, transactions.dates), max(keys.values()) - base + 1, lambda code : to_label(code + base)
+
+
+def _group_codes(transactions, key):
+    '''(integer code of every row, number of codes, code -> label) for one group key'''
+    if key in _DATE_GROUPS:
+        return _date_group(transactions, *_DATE_GROUPS[key])
+    if key == "Type":
+        #types are grouped case-insensitively, like search_by_type
+        groups = {}
+        type_group = [groups.setdefault(k, len(groups)) for k in transactions._type_keys]
+        labels = list(groups)
+        return map(type_group.__getitem__, transactions.types), len(labels), labels.__getitem__
+    return transactions.descs, len(transactions.desc_values), transactions.desc_values.__getitem__
+
+
+def _store_groups(transactions, by, metrics):
+    '''(labels, sum, count, min, max) of every group of a TransactionStore in key order'''
+    #combine the group codes of each row into one int - the last key varies fastest
+    keys = None
+    radixes = []
+    labels = []
+    for key in by:
+        codes, radix, label = _group_codes(transactions, key)
+        keys = list(codes) if keys is None else [k * radix + c for k, c in zip(keys, codes)]
+        radixes.append(radix)
+        labels.append(label)
+    if keys is None:
+        keys = [0] * len(transactions)
+
+    amounts = transactions.amounts
+    counts = Counter(keys)
+    sums = defaultdict(int)
+    lows, highs = {}, {}
+    if "min" in metrics or "max" in metrics:
+        for k, amount in zip(keys, amounts):
+            sums[k] += amount
+            if k not in lows or amount < lows[k]:
+                lows[k] = amount
+            if k not in highs or amount > highs[k]:
+                highs[k] = amount
+    elif "sum" in metrics or "mean" in metrics:
+        for k, amount in zip(keys, amounts):
+            sums[k] += amount
+
+    groups = []
+    for k in sorted(counts):
+        names = []
+        rest = k
+        for radix, label in zip(reversed(radixes), reversed(labels)):
+            rest, code = divmod(rest, radix)
+            names.append(label(code))
+        groups.append((names[::-1], sums[k], counts[k], lows.get(k), highs.get(k)))
+    return groups
+
+
+def _stream_code(key):
+    '''((ordinal, type, description) -> code, code -> label) for one group key of a streamed row'''
+    if key in _DATE_GROUPS:
+        to_key, to_label = _DATE_GROUPS[key]
+        keys = {}
+        def code(ordinal, type_, desc):
+            k = keys.get(ordinal)
+            if k is None:
+                k = keys[ordinal] = to_key(date.fromordinal(ordinal))
+            return k
+        return code, to_label
+    #Type and Description are coded in order of first appearance, like the store's dictionaries
+    codes = {}
+    labels = []
+    def code(ordinal, type_, desc):
+        value = type_.upper() if key == "Type" else desc
+        c = codes.get(value)
+        if c is None:
+            c = codes[value] = len(labels)
+            labels.append(value)
+        return c
+    return code, labels.__getitem__
+
+
+def _stream_groups(transactions, by, info_callback = None):
+    '''
+    (labels, sum, count, min, max) of every group of a list or iter_transactions stream in key order.
+    rows are hashed straight into their group, so only one entry per group is held in memory
+    '''
+    coders = [_stream_code(key) for key in by]
+    cells = {}
+    scanned = corrupted = 0
+    for transaction in _flatten(transactions):
+        scanned += 1
+        try:
+            ordinal = _to_ordinal(transaction["Date"])
+            minor = to_minor_units(transaction["Amount"])
+            type_, desc = str(transaction["Type"]), str(transaction["Description"])
+        except (KeyError, ValueError, TypeError, AttributeError, InvalidOperation):
+            corrupted += 1
+            continue
+        k = tuple(code(ordinal, type_, desc) for code, _ in coders)
+        cell = cells.get(k)
+        if cell is None:
+            cells[k] = [minor, 1, minor, minor]
+        else:
+            cell[0] += minor
+            cell[1] += 1
+            if minor < cell[2]:
+                cell[2] = minor
+            if minor > cell[3]:
+                cell[3] = minor
+    _record("rows_scanned", scanned)
+    if corrupted:
+        call_info(f"{corrupted} corrupted transactions skipped",info_callback)
+    return [([label(c) for c, (_, label) in zip(k, coders)], *cells[k]) for k in sorted(cells)]
+
+
+def group_keys(by):
+    '''the group names in by spelled as aggregate spells them in its rows - "Month" is "month", "type" is "Type"'''
+    names = {name.lower() : name for name in GROUP_KEYS}
+    return [names.get(str(key).lower(), key) for key in by]
+
+
+def aggregate(transactions, by = ("month",), metrics = ("sum", "count"), info_callback = None):
+    '''
+    group-by over the transactions. by names the group keys (date, month, year, Type, Description)
+    and metrics what is computed per group (sum, count, mean, min, max of Amount).
+    a TransactionStore gives every row one integer key (the mixed radix of its group codes) and the
+    groups are hashed on that in a single pass. a list or stream is hashed row by row on its group
+    codes without being loaded into a store. returns a list of dicts, one per group in key order,
+    e.g. {"month" : "01-2025", "Description" : "rent", "sum" : Decimal("1200.00"), "count" : 1}
+    '''
+    by = group_keys(by)
+    metrics = [str(metric).lower() for metric in metrics]
+    for key in by:
+        if key not in GROUP_KEYS:
+            call_info(f"Invalid group : {key} - use one of {', '.join(GROUP_KEYS)}",info_callback)
+            return None
+    for metric in metrics:
+        if metric not in METRICS:
+            call_info(f"Invalid metric : {metric} - use one of {', '.join(METRICS)}",info_callback)
+            return None
+
+    if isinstance(transactions, TransactionStore):
+        _record("rows_scanned", len(transactions))
+        groups = _store_groups(transactions, by, metrics) if transactions else []
+    else:
+        groups = _stream_groups(transactions, by, info_callback)
+    if not groups:
+        call_info("No transaction records found",info_callback)
+        return None
+
+    result = []
+    for names, total, count, low, high in groups:
+        row = dict(zip(by, names))
+        for metric in metrics:
+            if metric == "count":
+                row[metric] = count
+            elif metric == "sum":
+                row[metric] = from_minor_units(total)
+            elif metric == "mean":
+                mean = (Decimal(total) / count).quantize(Decimal(1), rounding = ROUND_HALF_EVEN)
+                row[metric] = from_minor_units(int(mean))
+            elif metric == "min":
+                row[metric] = from_minor_units(low)
+            else:
+                row[metric] = from_minor_units(high)
+        result.append(row)
+    return result
+
+
+def _rollup_path(filename):
+    return filename + ROLLUP_SUFFIX
+
+
+def _ledger_state(filename):
+    #size and mtime of the ledger and the tombstone log - the rollup is in sync while they match its key
+    state = []
+    for path in (filename, _tombstone_path(filename)):
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            state.extend([stat.st_size, stat.st_mtime_ns])
+        else:
+            state.extend([None, None])
+    return state
+
+
+def _month_key(value):
+    day = date.fromordinal(_to_ordinal(value))
+    return day.year * 12 + day.month - 1
+
+
+def _read_rollup(filename):
+    '''(key, cells) from the rollup file, cells keyed by (month key, TYPE, description). None when missing or unreadable'''
+    try:
+        with open(_rollup_path(filename), mode ="r", encoding ="utf-8") as file :
+            data = json.load(file)
+        cells = {(month, type_, desc) : [total, count] for month, type_, desc, total, count in data["cells"]}
+        return data["key"], cells
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_rollup(filename, cells, key = None):
+    data = {
+        "key" : key or _ledger_state(filename),
+        "cells" : [[month, type_, desc, total, count] for (month, type_, desc), (total, count) in sorted(cells.items())]
+    }
+    temp_path = _rollup_path(filename) + ".tmp"
+    try:
+        with open(temp_path, mode ="w", encoding ="utf-8") as file :
+            json.dump(data, file)
+        os.replace(temp_path, _rollup_path(filename))
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def build_rollup(transactions = None, info_callback = None, filename = None):
+    '''
+    (re)builds the rollup file of the ledger (filename, FILENAME by default) from the transactions,
+    or from the ledger when none are given. from then on add and delete keep it up to date.
+    returns the number of cells
+    '''
+    filename = filename or FILENAME
+    with _ledger_lock:
+        key = _ledger_state(filename)
+        if transactions is None:
+            transactions = load_transaction(info_callback, filename = filename)
+        cells = {}
+        for row in aggregate(transactions, by = ("month", "Type", "Description"), metrics = ("sum", "count")) or []:
+            month, year = row["month"].split("-")
+            cells[(int(year) * 12 + int(month) - 1, row["Type"], row["Description"])] = [
+                to_minor_units(row["sum"]), row["count"]]
+        try:
+            _write_rollup(filename, cells, key)
+        except OSError as e :
+            call_info(f"Warning : could not write the rollup - {e}",info_callback)
+    return len(cells)
+
+
+def _rollup_begin(filename):
+    #ledger state before a write, only worth taking while a rollup file exists
+    return _ledger_state(filename) if os.path.isfile(_rollup_path(filename)) else None
+
+
+def _rollup_apply(filename, before, rows, sign):
+    '''
+    adds (sign = 1) or removes (sign = -1) rows from the rollup. when the rollup did not match
+    the ledger before the write it is left alone - rollup() rebuilds it on the next read
+    '''
+    if before is None:
+        return
+    with _ledger_lock:
+        after = _ledger_state(filename)
+        current = _read_rollup(filename)
+        if current is None or current[0] != before or after == before:
+            return
+        cells = current[1]
+        for row in rows:
+            cell_key = (_month_key(row["Date"]), str(row["Type"]).upper(), str(row["Description"]))
+            cell = cells.setdefault(cell_key, [0, 0])
+            cell[0] += sign * to_minor_units(row["Amount"])
+            cell[1] += sign
+            if cell[1] <= 0:
+                del cells[cell_key]
+        try:
+            _write_rollup(filename, cells, after)
+        except OSError:
+            #a rollup that could not be updated no longer matches and is rebuilt when read
+            pass
+
+
+def rollup(by = ("month", "Type", "Description"), info_callback = None, filename = None):
+    '''
+    sums and counts from the persisted rollup of the ledger (filename, FILENAME by default),
+    grouped by any of month, year, Type and Description.
+    answers from the few hundred stored cells instead of the ledger rows - the rollup is only
+    rebuilt when it is missing or out of sync with the ledger. same row format as aggregate
+    '''
+    names = {name.lower() : name for name in ("month", "year", "Type", "Description")}
+    by = [names.get(str(key).lower(), key) for key in by]
+    for key in by:
+        if key not in names.values():
+            call_info(f"Invalid group : {key} - use one of month, year, Type, Description",info_callback)
+            return None
+
+    filename = filename or FILENAME
+    current = _read_rollup(filename)
+    if current is None or current[0] != _ledger_state(filename):
+        build_rollup(info_callback = info_callback, filename = filename)
+        current = _read_rollup(filename)
+        if current is None:
+            return None
+
+    groups = defaultdict(lambda : [0, 0])
+    for (month, type_, desc), (total, count) in current[1].items():
+        parts = {"month" : month, "year" : month // 12, "Type" : type_, "Description" : desc}
+        group = groups[tuple(parts[key] for key in by)]
+        group[0] += total
+        group[1] += count
+    if not groups:
+        call_info("No transaction records found",info_callback)
+        return None
+
+    result = []
+    for group in sorted(groups):
+        row = {}
+        for key, value in zip(by, group):
+            row[key] = f"{value % 12 + 1:02d}-{value // 12}" if key == "month" else value
+        total, count = groups[group]
+        row["sum"] = from_minor_units(total)
+        row["count"] = count
+        result.append(row)
+    return result
+
+
 def valid_choice(choice,info_callback = None):
     #take a choice from user
         if not choice :
@@ -291,7 +2223,169 @@ def valid_choice(choice,info_callback = None):
             call_info("Invalid choice",info_callback)
             return None
 
-def delete_transaction(transactions,index_val,info_callback = None):
+def _tombstone_path(filename):
+    return filename + TOMBSTONE_SUFFIX
+
+
+def _load_tombstones(filename):
+    '''
+    the deleted rows keyed like the parsed rows - for each, the set of its identical copies
+    (numbered in file order from 0) that were deleted. empty when nothing is pending
+    '''
+    occurrences = defaultdict(list)
+    path = _tombstone_path(filename)
+    if not os.path.isfile(path):
+        return {}
+    with open(path, mode ="r", newline ="", encoding ="utf-8") as file :
+        for row in csv.DictReader(file):
+            parsed, error = _parse_row(row)
+            if not error:
+                #logs written before the Occurrence column cancel the first copy
+                occurrences[parsed].append(int(row.get("Occurrence") or 0))
+
+    tombstones = {}
+    for parsed, numbers in occurrences.items():
+        #each number counts the copies still there when it was written, so earlier deletes are skipped over
+        deleted = []
+        for number in numbers:
+            for earlier in deleted:
+                if earlier > number:
+                    break
+                number += 1
+            insort(deleted, number)
+        tombstones[parsed] = set(deleted)
+    return tombstones
+
+
+def _is_cancelled(tombstones, seen, parsed):
+    #whether a tombstone deleted this row - seen counts the copies of each deleted row met so far
+    deleted = tombstones.get(parsed)
+    if not deleted:
+        return False
+    number = seen[parsed]
+    seen[parsed] = number + 1
+    return number in deleted
+
+
+#rows in each tombstone log, keyed by its path, with the log size they were counted at
+_tombstone_counts = {}
+
+
+def _append_tombstone(filename, transaction, occurrence = 0):
+    row = {field : transaction[field] for field in EXPECTED_FIELDS}
+    if isinstance(row["Date"], date):
+        row["Date"] = row["Date"].strftime("%d-%m-%Y")
+    row["Occurrence"] = occurrence
+    path = _tombstone_path(filename)
+    with _ledger_lock:
+        file_exists = os.path.isfile(path)
+        with open(path, mode ="a", newline ="", encoding ="utf-8") as file :
+            start = file.tell()
+            writer = csv.DictWriter(file, fieldnames = TOMBSTONE_FIELDS)
+            if not file_exists:
+                writer.writeheader()
+            writer.writerow(row)
+            _record("bytes_written", file.tell() - start)
+            known = _tombstone_counts.get(path)
+            if not file_exists:
+                _tombstone_counts[path] = (file.tell(), 1)
+            elif known and known[0] == start:
+                _tombstone_counts[path] = (file.tell(), known[1] + 1)
+
+
+def _tombstone_count(filename):
+    '''rows in the tombstone log - counted once, then kept up by _append_tombstone without re-reading the log'''
+    path = _tombstone_path(filename)
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        _tombstone_counts.pop(path, None)
+        return 0
+    known = _tombstone_counts.get(path)
+    if known and known[0] == size:
+        return known[1]
+    #a log this process has not counted yet, or one written by someone else
+    with open(path, mode ="r", encoding ="utf-8") as file :
+        count = max(sum(1 for _ in file) - 1, 0)
+    _tombstone_counts[path] = (size, count)
+    return count
+
+
+def compact_ledger(info_callback = None, filename = None):
+    '''
+    folds the tombstone log back into the ledger (filename, FILENAME by default) - the surviving
+    rows are written to a temp file which then atomically replaces the ledger (os.replace) and
+    the log is dropped. returns the number of rows removed, or None when nothing could be compacted
+    '''
+    filename = filename or FILENAME
+    path = _tombstone_path(filename)
+    with _ledger_lock:
+        if not os.path.isfile(path):
+            return 0
+        if not os.path.exists(filename):
+            os.remove(path)
+            return 0
+
+        tombstones = _load_tombstones(filename)
+        seen = Counter()
+        rollup_before = _rollup_begin(filename)
+        codec = _ledger_codec(filename)
+        temp_path = filename + ".tmp"
+        removed = 0
+        try:
+            #a compressed ledger is rewritten with its own codec, as a single member
+            with _open_ledger(filename, codec) as source, (_open_codec(temp_path, "w", codec) if codec else
+                                                 open(temp_path, mode ="w", newline ="", encoding ="utf-8")) as target :
+                reader = csv.DictReader(source)
+                if not reader.fieldnames or not set(EXPECTED_FIELDS).issubset(reader.fieldnames):
+                    call_info("Error : ledger header is invalid - compaction skipped",info_callback)
+                    return None
+                writer = csv.DictWriter(target, fieldnames = EXPECTED_FIELDS, extrasaction ="ignore")
+                writer.writeheader()
+                for row in reader:
+                    parsed, error = _parse_row(row)
+                    #rows the loader would skip are kept as they are
+                    if not error and _is_cancelled(tombstones, seen, parsed):
+                        removed += 1
+                        continue
+                    writer.writerow(row)
+                target.flush()
+                if not codec:
+                    os.fsync(target.fileno())
+            if codec:
+                _fsync_path(temp_path)
+            _record("bytes_written", os.path.getsize(temp_path))
+            os.replace(temp_path, filename)
+            os.remove(path)
+        except (OSError, csv.Error) as e :
+            call_info(f"Error : could not compact {filename} - {e}",info_callback)
+            return None
+        else:
+            #the deleted rows already left the rollup when they were tombstoned, only its key moves on
+            current = _read_rollup(filename)
+            if rollup_before is not None and current is not None and current[0] == rollup_before:
+                try:
+                    _write_rollup(filename, current[1])
+                except OSError:
+                    pass
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    call_info(f"Ledger compacted : {removed} deleted transactions removed",info_callback)
+    return removed
+
+
+def compact_in_background(info_callback = None, filename = None):
+    '''runs compact_ledger on a daemon thread and returns the thread'''
+    #the path is taken here, on the caller's thread, so the compaction never reads FILENAME later
+    worker = threading.Thread(target = compact_ledger, args = (info_callback, filename or FILENAME), daemon = True)
+    worker.start()
+    return worker
+
+
+def _check_index(transactions, index_val, info_callback = None):
+    #the index typed by the user as an int, None when it does not name a transaction
     index_val = str(index_val)
 
     for i in index_val:
@@ -313,17 +2407,47 @@ def delete_transaction(transactions,index_val,info_callback = None):
     
     index_val = int(index_val)
 
-    if int(index_val) > len(transactions):
+    if int(index_val) >= len(transactions):
         call_info("Invalid Index: Index is greater than the length of transaction",info_callback)
         return None
+    return index_val
 
-    
-    
-    transactions.pop(int(index_val))
 
-    with open(FILENAME, mode ="w", newline ="", encoding ="utf-8") as file :
-        writer = csv.writer(file)
-        writer.writerows(transactions)
+def _occurrence(transactions, index):
+    #which of its identical copies transactions[index] is, so the tombstone cancels that copy and not the first
+    if isinstance(transactions, TransactionStore):
+        return transactions.occurrence(index)
+    key = _row_key(transactions[index])
+    return sum(1 for row in transactions[:index] if _row_key(row) == key)
+
+
+def _row_key(row):
+    return (_to_ordinal(row["Date"]), to_minor_units(row["Amount"]), str(row["Type"]), str(row["Description"]))
+
+
+def delete_transaction(transactions,index_val,info_callback = None, filename = None):
+    index_val = _check_index(transactions, index_val, info_callback)
+    if index_val is None:
+        return None
+
+    filename = filename or FILENAME
+    before = _tombstone_signature(filename) if getattr(transactions, "source", None) else None
+    rollup_before = _rollup_begin(filename)
+    occurrence = _occurrence(transactions, index_val)
+
+    #the ledger itself is not rewritten, the delete is one append to the tombstone log.
+    #the row leaves memory only once that is on disk, so a failed append leaves both in step
+    try:
+        _append_tombstone(filename, transactions[int(index_val)], occurrence)
+    except (OSError, csv.Error) as e :
+        call_info(f"Error : could not record the deletion - {e}",info_callback)
+        return None
+    removed = transactions.pop(int(index_val))
+    _follow_delete(transactions, before, filename)
+    _rollup_apply(filename, rollup_before, [removed], -1)
+
+    if _tombstone_count(filename) >= COMPACT_THRESHOLD:
+        compact_in_background(filename = filename)
 
     if info_callback:
         call_info("Transaction deleted successfully",info_callback)
@@ -332,16 +2456,24 @@ def delete_transaction(transactions,index_val,info_callback = None):
     
 
 
-def delete_all(transactions, info_callback = None):
+def delete_all(transactions, info_callback = None, filename = None):
     if not transactions:
         call_info("No transactions found", info_callback)
         return None
     transactions.clear()
+    filename = filename or FILENAME
 
     try :
-        with open(FILENAME , mode ="w", newline = "", encoding ="utf-8") as file :
-            writer = csv.writer(file)
-            writer.writerow([])
+        with _ledger_lock:
+            codec = _ledger_codec(filename)
+            with (_open_codec(filename, "w", codec) if codec else
+                  open(filename , mode ="w", newline = "", encoding ="utf-8")) as file :
+                writer = csv.writer(file)
+                writer.writerow(EXPECTED_FIELDS)
+            if os.path.isfile(_tombstone_path(filename)):
+                os.remove(_tombstone_path(filename))
+            if os.path.isfile(_rollup_path(filename)):
+                _write_rollup(filename, {})
         call_info("All transactions deleted successfully ",info_callback)
     except Exception as e :
         if info_callback:
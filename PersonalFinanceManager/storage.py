@@ -0,0 +1,261 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - Pluggable storage backends for the tracker. A backend covers load, append, delete, clear and the summary/search queries, so the rest of the app does not care whether the ledger lives in the CSV file or in an indexed SQLite database
+'''
+
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import date
+
+import pft
+
+
+class StorageBackend(ABC):
+    '''
+    interface every backend implements. rows go in and come out as the usual
+    {"Date", "Amount", "Type", "Description"} dicts, queries answer like the pft functions
+    (None plus an info message when nothing matches). a backend missing any of the abstract
+    methods cannot be created
+    '''
+
+    @abstractmethod
+    def load(self, info_callback = None):
+        '''returns the whole ledger as a TransactionStore'''
+        raise NotImplementedError
+
+    @abstractmethod
+    def append(self, transactions, info_callback = None):
+        '''appends transactions, returns how many were written'''
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, index, info_callback = None):
+        '''deletes the transaction at the given ledger position'''
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self, info_callback = None):
+        '''deletes every transaction'''
+        raise NotImplementedError
+
+    @abstractmethod
+    def summary(self, start = None, end = None, info_callback = None):
+        '''[income, expense, balance], optionally limited to a date range'''
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_by_type(self, type_, info_callback = None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_by_desc(self, desc, info_callback = None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_by_date_range(self, start, end, info_callback = None):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class CSVBackend(StorageBackend):
+    '''the existing CSV ledger - loads into a TransactionStore once and answers queries from its indexes'''
+
+    def __init__(self, filename = None):
+        self.filename = filename or pft.FILENAME
+        self.transactions = None
+
+    def _store(self, info_callback = None):
+        if self.transactions is None:
+            self.load(info_callback)
+        return self.transactions
+
+    def load(self, info_callback = None):
+        self.transactions = pft.load_transaction(info_callback, filename = self.filename)
+        return self.transactions
+
+    def append(self, transactions, info_callback = None):
+        #add_transactions also moves the reload offset and the rollup along with the write
+        store = self._store(info_callback)
+        before = len(store)
+        pft.add_transactions(store, transactions, info_callback, filename = self.filename)
+        return len(store) - before
+
+    def delete(self, index, info_callback = None):
+        return pft.delete_transaction(self._store(info_callback), index, info_callback, self.filename)
+
+    def clear(self, info_callback = None):
+        return pft.delete_all(self._store(info_callback), info_callback, self.filename)
+
+    def summary(self, start = None, end = None, info_callback = None):
+        if start is None and end is None:
+            return pft.view_summary(self._store(info_callback), info_callback)
+        return pft.summary_between(self._store(info_callback), start or date.min, end or date.max, info_callback)
+
+    def search_by_type(self, type_, info_callback = None):
+        return pft.search_by_type(self._store(info_callback), type_, info_callback)
+
+    def search_by_desc(self, desc, info_callback = None):
+        return pft.search_by_desc(self._store(info_callback), desc, info_callback)
+
+    def search_by_date_range(self, start, end, info_callback = None):
+        return pft.search_by_date_range(self._store(info_callback), start, end, info_callback)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    type_key TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_type ON transactions (type_key);
+CREATE INDEX IF NOT EXISTS idx_transactions_desc ON transactions (description);
+"""
+
+_COLUMNS = "date, amount, type, description"
+
+
+def _row(record):
+    ordinal, minor, type_, desc = record
+    return {
+        "Date" : date.fromordinal(ordinal),
+        "Amount" : pft.from_minor_units(minor),
+        "Type" : type_,
+        "Description" : desc
+    }
+
+
+class SQLiteBackend(StorageBackend):
+    '''
+    stdlib sqlite3 ledger in WAL mode. dates are ordinals and amounts integer paise like in
+    TransactionStore, with indexes on date, type and description, so summaries and searches
+    run as SQL instead of loading the ledger into Python
+    '''
+
+    def __init__(self, path = "transaction.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread = False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def _query(self, sql, params = ()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _rows(self, sql, params, empty_msg, info_callback = None):
+        records = self._query(f"SELECT {_COLUMNS} FROM transactions {sql}", params)
+        if not records:
+            pft.call_info(empty_msg, info_callback)
+            return None
+        return [_row(record) for record in records]
+
+    def _count(self):
+        return self._query("SELECT COUNT(*) FROM transactions")[0][0]
+
+    def load(self, info_callback = None):
+        store = pft.TransactionStore()
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT {_COLUMNS} FROM transactions ORDER BY id")
+            for record in cursor:
+                store.append_parsed(*record)
+        store.build_date_index()
+        return store
+
+    def append(self, transactions, info_callback = None):
+        records = []
+        for transaction in transactions:
+            type_ = str(transaction["Type"])
+            records.append((pft._to_ordinal(transaction["Date"]), pft.to_minor_units(transaction["Amount"]),
+                            type_, type_.upper(), str(transaction["Description"])))
+        try:
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "INSERT INTO transactions (date, amount, type, type_key, description) VALUES (?, ?, ?, ?, ?)",
+                    records)
+        except (sqlite3.Error, OverflowError) as e :
+            pft.call_info(f"Error : could not save to {self.path} - {e}",info_callback)
+            return 0
+        return len(records)
+
+    def delete(self, index, info_callback = None):
+        index = str(index)
+        if not index.isdigit():
+            pft.call_info("Invalid Index : Index cannot be special characters or negative characters", info_callback)
+            return None
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM transactions WHERE id = (SELECT id FROM transactions ORDER BY id LIMIT 1 OFFSET ?)",
+                (int(index),))
+        if cursor.rowcount == 0:
+            pft.call_info("Invalid Index: Index is greater than the length of transaction",info_callback)
+            return None
+        pft.call_info("Transaction deleted successfully",info_callback)
+        return None
+
+    def clear(self, info_callback = None):
+        if not self._count():
+            pft.call_info("No transactions found", info_callback)
+            return None
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM transactions")
+        pft.call_info("All transactions deleted successfully ",info_callback)
+        return None
+
+    def summary(self, start = None, end = None, info_callback = None):
+        where, params = "", ()
+        if start is not None or end is not None:
+            start, end = pft._to_ordinal(start or date.min), pft._to_ordinal(end or date.max)
+            where, params = "WHERE date BETWEEN ? AND ?", (start, end)
+        count, income, expense = self._query(
+            "SELECT COUNT(*), "
+            "COALESCE(SUM(CASE WHEN type_key = 'CREDIT' THEN amount END), 0), "
+            "COALESCE(SUM(CASE WHEN type_key = 'DEBIT' THEN amount END), 0) "
+            f"FROM transactions {where}", params)[0]
+        if not count:
+            pft.call_info("No transaction records found",info_callback)
+            return None
+        return [pft.from_minor_units(income), pft.from_minor_units(expense), pft.from_minor_units(income - expense)]
+
+    def search_by_type(self, type_, info_callback = None):
+        return self._rows("WHERE type_key = ? ORDER BY id", (type_.upper(),),
+                          "No records found of the type", info_callback)
+
+    def search_by_desc(self, desc, info_callback = None):
+        return self._rows("WHERE description = ? ORDER BY id", (desc,),
+                          "No records found of the given decription", info_callback)
+
+    def search_by_date_range(self, start, end, info_callback = None):
+        try:
+            start, end = pft._to_ordinal(start), pft._to_ordinal(end)
+        except (ValueError, TypeError):
+            pft.call_info("Invalid date : Use DD-MM-YYYY (e.g., 25-12-2024).",info_callback)
+            return None
+        return self._rows("WHERE date BETWEEN ? AND ? ORDER BY date, id", (start, end),
+                          "No records found in the given date range", info_callback)
+
+
+def open_backend(path = None):
+    '''picks the backend from the file name - .db / .sqlite files use SQLite, anything else the CSV ledger'''
+    path = path or pft.FILENAME
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteBackend(path)
+    return CSVBackend(path)
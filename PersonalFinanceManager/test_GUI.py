@@ -0,0 +1,84 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - A pytest test file to integrate unittesting for the file - GUI.py
+'''
+
+import pft
+import GUI
+from datetime import date
+from unittest.mock import patch
+
+
+class TestBreakdown:
+
+    rows = [
+        {"Date": date(2025, 1, 5), "Amount": "100", "Type": "CREDIT", "Description": "salary"},
+        {"Date": date(2025, 1, 9), "Amount": "20.25", "Type": "DEBIT", "Description": "fun"},
+        {"Date": date(2024, 12, 31), "Amount": "10", "Type": "DEBIT", "Description": "rent"},
+    ]
+
+    def test_columns_follow_aggregate_keys(self):
+        #the comboboxes offer "Month" and "Year", aggregate answers with "month" and "year"
+        by, metrics = ["Month", "Type"], ["sum", "count", "mean"]
+        columns = GUI.breakdown_columns(by, metrics)
+        assert columns == ["month", "Type", "sum", "count", "mean"]
+        result = pft.aggregate(pft.TransactionStore(self.rows), by, metrics)
+        assert [GUI.breakdown_values(row, columns) for row in result] == [
+            ("12-2024", "DEBIT", "10.00", "1", "10.00"),
+            ("01-2025", "CREDIT", "100.00", "1", "100.00"),
+            ("01-2025", "DEBIT", "20.25", "1", "20.25"),
+        ]
+
+    def test_year_and_description(self):
+        columns = GUI.breakdown_columns(["Year", "Description"], ["count"])
+        result = pft.aggregate(self.rows, ["Year", "Description"], ["count"])
+        assert GUI.breakdown_values(result[0], columns) == ("2024", "rent", "1")
+
+
+class TestWorker:
+
+    class Root:
+        #stands in for tk.Tk - the poll is never scheduled, the test drains the queue itself
+        def after(self, ms, func):
+            pass
+
+    def test_jobs_hold_the_store_lock(self):
+        worker = GUI.Worker(self.Root())
+        try:
+            worker.submit(lambda : worker.lock.locked(), lambda result : result).result(timeout = 5)
+            func, args = worker._results.get_nowait()
+            assert func(*args) is True
+            #the Tk thread can take the lock again once the job is done
+            assert worker.lock.acquire(blocking = False)
+            worker.lock.release()
+        finally:
+            worker.shutdown()
+
+
+class TestPagedTable:
+
+    class Style:
+        #stands in for ttk.Style - no display is needed to look up the theme
+        def __init__(self, values):
+            self.values = values
+
+        def lookup(self, style, option):
+            return self.values.get(option, "")
+
+    class Table:
+        ROW_HEIGHT = GUI.PagedTable.ROW_HEIGHT
+
+    def row_height(self, values, linespace = 0):
+        with patch.object(GUI.ttk, "Style", lambda master : self.Style(values)), \
+                patch.object(GUI.tkfont, "Font") as font:
+            font.return_value.metrics.return_value = linespace
+            return GUI.PagedTable._row_height(self.Table())
+
+    def test_theme_row_height(self):
+        #a HiDPI theme's 30 px rows must not be paged as 20 px ones
+        assert self.row_height({"rowheight": "30"}) == 30
+
+    def test_falls_back_to_the_font(self):
+        assert self.row_height({}, linespace = 24) == 24
+        assert self.row_height({}) == GUI.PagedTable.ROW_HEIGHT
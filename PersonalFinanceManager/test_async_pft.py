@@ -0,0 +1,107 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - A pytest test file to integrate unittesting for the file - async_pft.py
+'''
+
+import time
+import asyncio
+import threading
+import pft
+import async_pft
+from decimal import Decimal
+from unittest.mock import patch
+
+
+class TestAsyncPft:
+
+    rows = ["01-01-2025,10.00,DEBIT,fun", "03-01-2025,25.50,CREDIT,salary"]
+
+    def teardown_method(self):
+        async_pft.shutdown()
+
+    def test_load_add_and_summary(self, ledger, info_msg):
+        ledger(self.rows)
+
+        async def main():
+            transactions = await async_pft.async_load_transaction(info_msg.append)
+            await asyncio.gather(*(
+                async_pft.async_add_transaction(transactions, "05-01-2025", "1", "debit", "fun", info_msg.append)
+                for _ in range(200)))
+            return transactions, await async_pft.async_view_summary(transactions)
+
+        transactions, summary = asyncio.run(main())
+        assert len(transactions) == 202
+        assert summary == [Decimal("25.50"), Decimal("210.00"), Decimal("-184.50")]
+        #every concurrent add reached the file exactly once
+        assert len(pft.load_transaction()) == 202
+
+    def test_searches_run_off_the_loop(self, ledger):
+        ledger(self.rows)
+        loop_thread = []
+        original = pft.search_by_desc
+
+        def search(transactions, desc, info_callback=None):
+            loop_thread.append(threading.current_thread())
+            return original(transactions, desc, info_callback)
+
+        async def main():
+            transactions = await async_pft.async_load_transaction()
+            with patch.object(pft, "search_by_desc", search):
+                return await async_pft.async_search_by_desc(transactions, "fun")
+
+        assert len(asyncio.run(main())) == 1
+        assert loop_thread and loop_thread[0] is not threading.main_thread()
+
+    def test_readers_share_writers_exclude(self):
+        active = {"read": 0, "write": 0, "max_read": 0, "overlap": False}
+
+        def reader():
+            active["read"] += 1
+            active["max_read"] = max(active["max_read"], active["read"])
+            active["overlap"] |= active["write"] > 0
+            time.sleep(0.02)
+            active["read"] -= 1
+
+        def writer():
+            active["write"] += 1
+            active["overlap"] |= active["read"] > 0 or active["write"] > 1
+            time.sleep(0.02)
+            active["write"] -= 1
+
+        async def main():
+            jobs = [async_pft._read(reader) for _ in range(8)]
+            jobs += [async_pft._write(writer) for _ in range(3)]
+            jobs += [async_pft._read(reader) for _ in range(8)]
+            await asyncio.gather(*jobs)
+
+        asyncio.run(main())
+        assert active["max_read"] > 1
+        assert not active["overlap"]
+
+    def test_cancelled_write_keeps_the_lock(self):
+        active = {"write": 0, "overlap": False}
+
+        def writer():
+            active["write"] += 1
+            active["overlap"] |= active["write"] > 1
+            time.sleep(0.2)
+            active["write"] -= 1
+
+        async def main():
+            try:
+                await asyncio.wait_for(async_pft._write(writer), 0.05)
+            except asyncio.TimeoutError:
+                pass
+            #the first job is still running on its thread, this one has to wait for it
+            await async_pft._write(writer)
+
+        asyncio.run(main())
+        assert not active["overlap"]
+
+    def test_each_loop_gets_its_own_lock(self, ledger):
+        ledger(self.rows)
+        #the lock is bound to the loop that made it, so separate asyncio.run calls must not share one
+        first = asyncio.run(async_pft.async_load_transaction())
+        second = asyncio.run(async_pft.async_load_transaction())
+        assert len(first) == len(second) == 2
@@ -0,0 +1,91 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - A pytest test file to integrate unittesting for the file - benchmark.py
+'''
+
+import json
+import pft
+import benchmark
+from unittest.mock import patch
+
+
+class TestGenerateLedger:
+
+    def test_generator_is_deterministic(self, tmp_path):
+        first, second = tmp_path / "a.csv", tmp_path / "b.csv"
+        bad = benchmark.generate_ledger(str(first), 2000, malformed=0.05, seed=7)
+        assert benchmark.generate_ledger(str(second), 2000, malformed=0.05, seed=7) == bad
+        assert first.read_bytes() == second.read_bytes()
+        assert 40 < bad < 160
+        benchmark.generate_ledger(str(second), 2000, malformed=0.05, seed=8)
+        assert first.read_bytes() != second.read_bytes()
+
+    def test_malformed_rows_are_skipped(self, ledger, info_msg):
+        path = ledger()
+        bad = benchmark.generate_ledger(str(path), 3000, malformed=0.02, seed=1)
+        report = pft.LoadReport()
+        transactions = pft.load_transaction(info_msg.append, report=report)
+        assert len(transactions) == report.loaded == 3000 - bad
+        assert report.skipped == bad
+        #one summary for the whole load, not one message per bad row
+        assert len(info_msg) == 1
+        #the skew favours debits and the first descriptions
+        assert len(transactions.positions_by_type("debit")) > len(transactions.positions_by_type("credit"))
+        assert len(transactions.positions_by_desc("fun")) > len(transactions.positions_by_desc("others"))
+
+
+class TestRunBenchmark:
+
+    def test_run_benchmark(self):
+        results = benchmark.run_benchmark(300, seed=3)
+        assert list(results) == list(benchmark.OPERATIONS)
+        assert results["load_transaction"]["work"] < 300
+        assert results["add_transaction"]["work"] == benchmark.CALLS
+        for result in results.values():
+            assert result["seconds"] >= 0 and result["peak_bytes"] >= 0
+
+    def test_compare(self):
+        baseline = {"runs": {"1000": {"load_transaction": {"seconds": 0.1}, "view_summary": {"seconds": 0.001}}}}
+        report = {"runs": {"1000": {"load_transaction": {"seconds": 0.2}, "view_summary": {"seconds": 0.003}},
+                           "5000": {"load_transaction": {"seconds": 9.0}}}}
+        regressions = benchmark.compare(report, baseline)
+        #tiny absolute differences and sizes missing from the baseline are not regressions
+        assert len(regressions) == 1
+        assert regressions[0].startswith("load_transaction at 1000 rows")
+
+    def test_compare_peak_memory(self):
+        baseline = {"runs": {"1000": {"load_transaction": {"seconds": 0.1, "peak_bytes": 1000000},
+                                      "view_summary": {"seconds": 0.1, "peak_bytes": 1000},
+                                      "search_by_type": {"seconds": 0.1}}}}
+        report = {"runs": {"1000": {"load_transaction": {"seconds": 0.1, "peak_bytes": 2000000},
+                                    "view_summary": {"seconds": 0.1, "peak_bytes": 40000},
+                                    "search_by_type": {"seconds": 0.1, "peak_bytes": 9000000}}}}
+        regressions = benchmark.compare(report, baseline)
+        #a small absolute growth and a run missing its peak in the baseline are not regressions
+        assert regressions == ["load_transaction at 1000 rows : 2,000,000 bytes peak against 1,000,000 bytes in the baseline"]
+        report["runs"]["1000"]["load_transaction"]["peak_bytes"] = 1200000
+        assert benchmark.compare(report, baseline) == []
+
+
+class TestMain:
+
+    def test_main_fails_on_regression(self, tmp_path):
+        output, baseline = tmp_path / "out.json", tmp_path / "base.json"
+        args = ["--rows", "200", "--ops", "load_transaction", "view_summary", "--no-memory"]
+        assert benchmark.main(args + ["--output", str(output)]) == 0
+        report = json.loads(output.read_text())
+        assert set(report["runs"]["200"]) == {"load_transaction", "view_summary"}
+        report["runs"]["200"]["load_transaction"]["seconds"] = 0.0
+        baseline.write_text(json.dumps(report))
+        with patch.object(benchmark, "MIN_DELTA", 0.0):
+            assert benchmark.main(args + ["--baseline", str(baseline)]) == 1
+
+    def test_compressed_runs(self, tmp_path):
+        output = tmp_path / "out.json"
+        args = ["--rows", "500", "--codec", "none", "gzip", "--ops", "load_transaction", "--no-memory"]
+        assert benchmark.main(args + ["--output", str(output)]) == 0
+        runs = json.loads(output.read_text())["runs"]
+        assert set(runs) == {"500", "500-gzip"}
+        assert runs["500-gzip"]["load_transaction"]["work"] == runs["500"]["load_transaction"]["work"]
+        assert runs["500-gzip"]["load_transaction"]["ledger_bytes"] < runs["500"]["load_transaction"]["ledger_bytes"]
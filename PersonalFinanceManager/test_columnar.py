@@ -0,0 +1,65 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - A pytest test file to integrate unittesting for the file - columnar.py
+'''
+
+import pft
+import columnar
+import pytest
+from decimal import Decimal
+from datetime import date
+
+ROWS = [
+    {"Date": date(2025, 3, 5), "Amount": Decimal("1000"), "Type": "CREDIT", "Description": "salary"},
+    {"Date": date(2025, 1, 5), "Amount": Decimal("250.50"), "Type": "DEBIT", "Description": "rent"},
+    {"Date": date(2025, 2, 3), "Amount": Decimal("40"), "Type": "debit", "Description": "fun"},
+    {"Date": date(2025, 1, 20), "Amount": Decimal("60"), "Type": "DEBIT", "Description": "fun"},
+]
+
+
+@pytest.fixture
+def exported(tmp_path):
+    path = str(tmp_path / "ledger.col")
+    assert columnar.export_columnar(ROWS, path)
+    with columnar.ColumnarLedger(path) as opened:
+        yield opened
+
+
+class TestColumnarLedger:
+
+    def test_rows_in_date_order(self, exported):
+        assert len(exported) == 4
+        assert [exported[i]["Date"] for i in range(len(exported))] == sorted(row["Date"] for row in ROWS)
+        assert exported[0] == ROWS[1]
+
+    def test_columns_are_mapped(self, exported):
+        assert isinstance(exported.amounts, memoryview)
+        assert exported.amounts.format == "q"
+        assert list(exported.amounts) == [25050, 6000, 4000, 100000]
+
+    def test_summaries(self, exported, info_msg):
+        assert exported.view_summary(info_msg.append) == pft.view_summary(ROWS)
+        assert exported.summary_between("01-01-2025", "31-01-2025", info_msg.append) == [Decimal("0"), Decimal("310.50"), Decimal("-310.50")]
+        assert exported.summary_between("01-01-2024", "31-01-2024", info_msg.append) is None
+        assert "No records found in the given date range" in info_msg
+
+    def test_searches(self, exported, info_msg):
+        assert len(exported.search_by_type("debit", info_msg.append)) == 3
+        assert [row["Amount"] for row in exported.search_by_desc("fun", info_msg.append)] == [Decimal("60"), Decimal("40")]
+        assert [row["Description"] for row in exported.search_by_date_range(*pft.month_bounds(2025, 2), info_callback=info_msg.append)] == ["fun"]
+        assert exported.search_by_type("refund", info_msg.append) is None
+        assert "No records found of the type" in info_msg
+
+    def test_empty_export(self, tmp_path, info_msg):
+        path = str(tmp_path / "empty.col")
+        assert columnar.export_columnar([], path)
+        with columnar.ColumnarLedger(path) as opened:
+            assert len(opened) == 0
+            assert opened.view_summary(info_msg.append) is None
+
+    def test_not_columnar(self, tmp_path):
+        path = tmp_path / "transaction.csv"
+        path.write_text("Date,Amount,Type,Description\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            columnar.ColumnarLedger(str(path))
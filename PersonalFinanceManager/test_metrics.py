@@ -0,0 +1,87 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - A pytest test file to integrate unittesting for the file - metrics.py
+'''
+
+import json
+import pft
+import metrics
+import pytest
+from unittest.mock import patch
+
+
+@pytest.fixture
+def enabled():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+class TestMetrics:
+
+    rows = ["01-01-2025,10.00,DEBIT,fun", "02-01-2025,abc,DEBIT,fun", "03-01-2025,25.50,CREDIT,salary"]
+
+    def test_disabled_leaves_pft_alone(self):
+        original = pft.load_transaction
+        metrics.enable()
+        assert pft.load_transaction is not original
+        assert pft._metrics is not None
+        metrics.disable()
+        assert pft.load_transaction is original
+        assert pft._metrics is None
+        assert not metrics.is_enabled()
+
+    def test_load_counts_rows_and_bytes(self, ledger, enabled, info_msg):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction(info_msg.append)
+        assert len(transactions) == 2
+        load = metrics.snapshot()["functions"]["load_transaction"]
+        assert load["calls"] == 1
+        assert load["errors"] == 0
+        assert load["rows_scanned"] == 3
+        assert load["rows_skipped"] == 1
+        assert load["bytes_read"] == path.stat().st_size
+        assert load["buckets"]["+Inf"] == 1
+
+    def test_writes_and_nested_calls_are_attributed(self, ledger, enabled, info_msg):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction(info_msg.append)
+        size = path.stat().st_size
+        pft.add_transaction(transactions, "04-01-2025", "5", "debit", "fun", info_msg.append)
+        functions = metrics.snapshot()["functions"]
+        assert functions["add_transaction"]["calls"] == 1
+        #the write is done by save_transaction, called from inside add_transaction
+        assert functions["save_transaction"]["calls"] == 1
+        assert functions["save_transaction"]["bytes_written"] == path.stat().st_size - size
+        assert functions["add_transaction"]["bytes_written"] == 0
+
+    def test_streams_and_list_scans(self, ledger, enabled, info_msg):
+        ledger(self.rows)
+        assert pft.view_summary(pft.iter_transactions(info_msg.append), info_msg.append)
+        pft.search_by_desc([{"Date": "01-01-2025", "Amount": "1", "Type": "DEBIT", "Description": "fun"}] * 4, "fun")
+        functions = metrics.snapshot()["functions"]
+        assert functions["iter_transactions"]["calls"] == 1
+        assert functions["iter_transactions"]["rows_scanned"] == 3
+        assert functions["view_summary"]["rows_scanned"] == 2
+        assert functions["search_by_desc"]["rows_scanned"] == 4
+
+    def test_errors_are_counted(self, enabled):
+        with patch.object(pft, "_stream_groups", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                pft.aggregate([])
+        assert metrics.snapshot()["functions"]["aggregate"]["errors"] == 1
+
+    def test_dumps(self, ledger, enabled, info_msg):
+        ledger(self.rows)
+        pft.load_transaction(info_msg.append)
+        data = json.loads(metrics.to_json())
+        assert data["enabled"] is True
+        assert data["functions"]["load_transaction"]["calls"] == 1
+        text = metrics.to_prometheus()
+        assert '# TYPE pft_call_duration_seconds histogram' in text
+        assert 'pft_calls_total{function="load_transaction"} 1' in text
+        assert 'pft_call_duration_seconds_bucket{function="load_transaction",le="+Inf"} 1' in text
+        assert 'pft_rows_skipped_total{function="load_transaction"} 1' in text
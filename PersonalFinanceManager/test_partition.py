@@ -0,0 +1,118 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - A pytest test file to integrate unittesting for the file - partition.py
+'''
+
+import json
+import partition
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+
+
+@pytest.fixture
+def parts(ledger, tmp_path, monkeypatch):
+    #the partitions of the sample ledger go under tmp_path/ledger
+    ledger(["05-03-2023,100.00,CREDIT,salary", "10-06-2024,20.00,DEBIT,fun", "15-01-2025,5.50,DEBIT,grocery",
+            "20-01-2025,200.00,CREDIT,salary", "02-02-2025,abc,DEBIT,fun", "25-02-2025,10.00,DEBIT,rent"])
+    monkeypatch.setattr(partition, "LEDGER_DIR", str(tmp_path / "ledger"))
+    return tmp_path / "ledger"
+
+
+class TestPartitionLedger:
+
+    def test_split_and_manifest(self, parts, info_msg):
+        assert partition.partition_ledger("year", info_msg.append) == 3
+        assert sorted(p.name for p in parts.iterdir()) == ["2023.csv", "2024.csv", "2025.csv", "manifest.json"]
+        manifest = json.loads((parts / "manifest.json").read_text())
+        assert manifest["partitions"]["2025"]["rows"] == 3
+        assert manifest["partitions"]["2025"]["income"] == 20000
+        assert manifest["partitions"]["2025"]["expense"] == 1550
+        assert len(partition.load_partitions()) == 5
+        assert partition.view_summary() == [Decimal("300.00"), Decimal("35.50"), Decimal("264.50")]
+
+    def test_month_partitions(self, parts, info_msg):
+        assert partition.partition_ledger("month", info_msg.append) == 4
+        assert (parts / "2025-01.csv").exists()
+        assert partition.partition_ledger("week", info_msg.append) is None
+        assert "Invalid granularity" in info_msg[-1]
+
+    def test_explicit_paths(self, tmp_path, monkeypatch, info_msg):
+        source = tmp_path / "other.csv"
+        source.write_text("Date,Amount,Type,Description\n05-03-2023,100.00,CREDIT,salary\n"
+                          "15-01-2025,5.50,DEBIT,grocery\n", encoding="utf-8")
+        target = str(tmp_path / "other")
+        #neither pft.FILENAME nor LEDGER_DIR is touched
+        monkeypatch.setattr(partition.pft, "FILENAME", str(tmp_path / "default.csv"))
+        monkeypatch.setattr(partition, "LEDGER_DIR", str(tmp_path / "default"))
+        assert partition.partition_ledger("year", info_msg.append, filename=str(source), ledger_dir=target) == 2
+        transactions = partition.load_partitions(ledger_dir=target)
+        partition.add_transaction(transactions, "01-03-2025", "4", "debit", "fun", info_msg.append, ledger_dir=target)
+        partition.delete_transaction(transactions, 0, info_msg.append, ledger_dir=target)
+        assert partition.load_partitions(ledger_dir=target) == transactions
+        assert partition.view_summary(ledger_dir=target) == [Decimal("0.00"), Decimal("9.50"), Decimal("-9.50")]
+        assert partition.summary_between("01-01-2025", "31-01-2025", ledger_dir=target)[1] == Decimal("5.50")
+        assert len(partition.search_by_date_range("01-01-2025", "31-03-2025", ledger_dir=target)) == 2
+        assert not list(tmp_path.glob("default*"))
+
+
+class TestPartitionQueries:
+
+    def test_pruning_opens_only_needed_partitions(self, parts, info_msg):
+        partition.partition_ledger("year", info_msg.append)
+        with patch.object(partition, "_read_partition", wraps=partition._read_partition) as read:
+            result = partition.search_by_date_range("01-01-2025", "31-01-2025", info_msg.append)
+            assert [row["Amount"] for row in result] == [Decimal("5.50"), Decimal("200.00")]
+            assert [c.args[1] for c in read.call_args_list] == ["2025"]
+
+            read.reset_mock()
+            #2024 is wholly inside the range and comes from the manifest, only 2023 is read
+            summary = partition.summary_between("01-06-2023", "31-12-2024", info_msg.append)
+            assert summary == [Decimal("0.00"), Decimal("20.00"), Decimal("-20.00")]
+            assert [c.args[1] for c in read.call_args_list] == ["2023"]
+
+    def test_manifest_recounts_edited_partition(self, parts, info_msg):
+        partition.partition_ledger("year", info_msg.append)
+        with open(parts / "2024.csv", "a", encoding="utf-8") as file:
+            file.write("11-06-2024,1.00,DEBIT,fun\n")
+        assert partition.view_summary() == [Decimal("300.00"), Decimal("36.50"), Decimal("263.50")]
+
+
+class TestPartitionWrites:
+
+    def test_add_and_delete_touch_one_partition(self, parts, info_msg):
+        partition.partition_ledger("year", info_msg.append)
+        before = (parts / "2023.csv").stat().st_mtime_ns, (parts / "2024.csv").stat().st_mtime_ns
+        transactions = partition.load_partitions()
+        partition.add_transaction(transactions, "01-03-2025", "4", "debit", "fun", info_msg.append)
+        assert len(transactions) == 6
+        with open(parts / "2025.csv", "a", encoding="utf-8") as file:
+            file.write("02-02-2025,abc,DEBIT,fun\n")
+
+        index = next(i for i, row in enumerate(transactions) if row["Description"] == "grocery")
+        partition.delete_transaction(transactions, index, info_msg.append)
+        assert info_msg[-1] == "Transaction deleted successfully"
+        assert len(transactions) == 5
+        assert ((parts / "2023.csv").stat().st_mtime_ns, (parts / "2024.csv").stat().st_mtime_ns) == before
+        #rows the loader skips are kept by the rewrite
+        assert "abc" in (parts / "2025.csv").read_text()
+        assert partition.load_partitions() == transactions
+        assert partition.view_summary() == [Decimal("300.00"), Decimal("34.00"), Decimal("266.00")]
+
+    def test_invalid_index(self, parts, info_msg):
+        partition.partition_ledger("year", info_msg.append)
+        transactions = partition.load_partitions()
+        assert partition.delete_transaction(transactions, 9, info_msg.append) is None
+        assert info_msg[-1] == "Invalid Index: Index is greater than the length of transaction"
+
+    def test_delete_keeps_the_order_of_identical_rows(self, parts, info_msg):
+        partition.partition_ledger("year", info_msg.append)
+        transactions = partition.load_partitions()
+        partition.add_transaction(transactions, "01-03-2025", "4", "debit", "fun", info_msg.append)
+        partition.add_transaction(transactions, "01-03-2025", "9", "debit", "gift", info_msg.append)
+        partition.add_transaction(transactions, "01-03-2025", "4", "debit", "fun", info_msg.append)
+        #the second copy goes, the first keeps its place ahead of the gift
+        partition.delete_transaction(transactions, len(transactions) - 1, info_msg.append)
+        assert [row["Description"] for row in transactions][-2:] == ["fun", "gift"]
+        assert partition.load_partitions() == transactions
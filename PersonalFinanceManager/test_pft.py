@@ -8,18 +8,11 @@ import pft
 from pft import FILENAME
 import pytest
 import csv
+import threading
 from unittest.mock import patch,mock_open
 from decimal import Decimal
 from datetime import date,timedelta,datetime
 
-@pytest.fixture
-def info_msg():
-    message = []
-    def callback(msg):
-        message.append(msg)
-    return message
-
-
 
 class TestValidAmount: 
     
@@ -144,7 +137,7 @@ class TestAddTransaction:
             "Description" : "travel"
         }
 
-        mock_save_transaction.assert_called_once_with(expected_transaction,info_msg.append)
+        mock_save_transaction.assert_called_once_with(expected_transaction,info_msg.append,FILENAME)
 
         mock_call_info.assert_called_once_with("transaction added successfully ",info_msg.append)
 
@@ -452,4 +445,868 @@ class TestSaveTransaction:
         }
         with patch("os.path.exists", return_value=True), patch("builtins.open", side_effect=OSError("disk full")):
             pft.save_transaction(transaction, info_msg.append)
-        assert any("OS error occured" in msg for msg in info_msg)      
\ No newline at end of file
+        assert any("OS error occured" in msg for msg in info_msg)      
+
+class TestTransactionStore:
+
+    def test_round_trip(self):
+        store = pft.TransactionStore()
+        store.append({"Date": date(2025, 1, 1), "Amount": Decimal("100.50"), "Type": "CREDIT", "Description": "salary"})
+        store.append({"Date": "02-01-2025", "Amount": "20", "Type": "DEBIT", "Description": "fun"})
+        assert len(store) == 2
+        assert store[0] == {"Date": date(2025, 1, 1), "Amount": Decimal("100.50"), "Type": "CREDIT", "Description": "salary"}
+        assert store[-1]["Date"] == date(2025, 1, 2)
+        assert store[1]["Amount"] == Decimal("20")
+
+    def test_columns_are_encoded(self):
+        store = pft.TransactionStore([
+            {"Date": date(2025, 1, 1), "Amount": "10.25", "Type": "DEBIT", "Description": "fun"},
+            {"Date": date(2025, 1, 2), "Amount": "5", "Type": "DEBIT", "Description": "fun"}
+        ])
+        assert list(store.amounts) == [1025, 500]
+        assert list(store.dates) == [date(2025, 1, 1).toordinal(), date(2025, 1, 2).toordinal()]
+        assert store.type_values == ["DEBIT"]
+        assert list(store.descs) == [0, 0]
+
+    def test_delete_and_clear(self):
+        store = pft.TransactionStore([
+            {"Date": date(2025, 1, 1), "Amount": "1", "Type": "DEBIT", "Description": "a"},
+            {"Date": date(2025, 1, 2), "Amount": "2", "Type": "CREDIT", "Description": "b"}
+        ])
+        removed = store.pop(0)
+        assert removed["Description"] == "a"
+        assert [row["Description"] for row in store] == ["b"]
+        store.clear()
+        assert store == []
+        assert not store
+
+    def test_huge_amount(self):
+        store = pft.TransactionStore()
+        store.append({"Date": date(2025, 1, 1), "Amount": Decimal("1e20"), "Type": "CREDIT", "Description": "lottery"})
+        assert store[0]["Amount"] == Decimal("1e20")
+
+    def test_existing_functions_accept_store(self, info_msg):
+        store = pft.TransactionStore([
+            {"Date": date(2025, 1, 1), "Amount": "100", "Type": "CREDIT", "Description": "salary"},
+            {"Date": date(2025, 1, 2), "Amount": "40", "Type": "DEBIT", "Description": "fun"}
+        ])
+        assert pft.view_summary(store, info_msg.append) == [Decimal("100"), Decimal("40"), Decimal("60")]
+        assert pft.search_by_desc(store, "fun", info_msg.append)[0]["Amount"] == Decimal("40")
+
+    def test_load_returns_store(self, info_msg):
+        csv_data = "Date,Amount,Type,Description\n01-01-2025,100,CREDIT,salary\n01-01-2025,NaN,DEBIT,fun"
+        with patch("os.path.exists", return_value=True), patch("builtins.open", mock_open(read_data=csv_data)):
+            result = pft.load_transaction(info_msg.append)
+        assert isinstance(result, pft.TransactionStore)
+        assert len(result) == 1
+        assert any("error with amounts" in msg for msg in info_msg)
+
+
+class TestIterTransactions:
+
+    csv_data = (
+        "Date,Amount,Type,Description\n"
+        "01-01-2025,100,CREDIT,salary\n"
+        "02-01-2025,abc,DEBIT,fun\n"
+        "03-01-2025,30,DEBIT,fun\n"
+        "04-01-2025,20,DEBIT,travel"
+    )
+
+    def test_yields_rows(self, info_msg):
+        with patch("os.path.exists", return_value=True), patch("builtins.open", mock_open(read_data=self.csv_data)):
+            rows = list(pft.iter_transactions(info_msg.append))
+        assert [row["Amount"] for row in rows] == [Decimal("100"), Decimal("30"), Decimal("20")]
+        assert rows[0]["Date"] == date(2025, 1, 1)
+        assert any("error with amounts" in msg for msg in info_msg)
+
+    def test_chunks(self, info_msg):
+        with patch("os.path.exists", return_value=True), patch("builtins.open", mock_open(read_data=self.csv_data)):
+            chunks = list(pft.iter_transactions(info_msg.append, chunk_size=2))
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+
+    def test_chunks_consumed_directly(self, info_msg):
+        def chunks():
+            return pft.iter_transactions(chunk_size=2)
+        with patch("os.path.exists", return_value=True), patch("builtins.open", mock_open(read_data=self.csv_data)):
+            assert pft.view_summary(chunks(), info_msg.append) == [Decimal("100"), Decimal("50"), Decimal("50")]
+            assert [row["Amount"] for row in pft.search_by_type(chunks(), "debit", info_msg.append)] == [Decimal("30"), Decimal("20")]
+            assert [row["Description"] for row in pft.search_by_desc(chunks(), "travel", info_msg.append)] == ["travel"]
+            assert len(pft.search_by_date_range(chunks(), "01-01-2025", "03-01-2025", info_msg.append)) == 2
+            assert pft.aggregate(chunks(), by=["Type"], metrics=["count"]) == [{"Type": "CREDIT", "count": 1}, {"Type": "DEBIT", "count": 2}]
+
+    def test_summary_from_stream(self, info_msg):
+        with patch("os.path.exists", return_value=True), patch("builtins.open", mock_open(read_data=self.csv_data)):
+            result = pft.view_summary(pft.iter_transactions(), info_msg.append)
+        assert result == [Decimal("100"), Decimal("50"), Decimal("50")]
+
+    def test_search_from_stream(self, info_msg):
+        with patch("os.path.exists", return_value=True), patch("builtins.open", mock_open(read_data=self.csv_data)):
+            result = pft.search_by_desc(pft.iter_transactions(), "fun", info_msg.append)
+        assert len(result) == 1
+
+    def test_empty_stream(self, info_msg):
+        with patch("os.path.exists", return_value=False):
+            result = pft.view_summary(pft.iter_transactions(), info_msg.append)
+        assert result is None
+        assert "No transaction records found" in info_msg
+
+    def test_error_stops_stream(self, info_msg):
+        with patch("os.path.exists", return_value=True), patch("builtins.open", side_effect=PermissionError):
+            rows = list(pft.iter_transactions(info_msg.append))
+        assert rows == []
+        assert any("No permission granted" in msg for msg in info_msg)
+
+
+class TestParallelLoad:
+
+    rows = [f"{i % 28 + 1:02d}-01-2025,{i + 1},{'CREDIT' if i % 3 else 'DEBIT'},desc{i % 7}" for i in range(200)]
+    rows[49:49] = ["01-01-2025,abc,DEBIT,bad"]
+    rows[119:119] = ["45-01-2025,10,DEBIT,bad"]
+    rows[149:149] = [",,DEBIT,bad"]
+
+    def test_matches_serial_load(self, ledger):
+        ledger(self.rows)
+        serial_msgs, parallel_msgs = [], []
+        with patch.object(pft, "PARALLEL_MIN_BYTES", 0):
+            serial = pft.load_transaction(serial_msgs.append)
+            parallel = pft.load_transaction(parallel_msgs.append, workers=3)
+        assert len(parallel) == 200
+        assert parallel == serial
+        assert parallel_msgs == serial_msgs
+
+    def test_invalid_header(self, ledger, info_msg):
+        ledger(["Wrong,Header", "1,2"], header=False)
+        with patch.object(pft, "PARALLEL_MIN_BYTES", 0):
+            result = pft.load_transaction(info_msg.append, workers=2)
+        assert result == []
+        assert any("Invalid header" in msg for msg in info_msg)
+
+    def test_ranges_start_on_lines(self, tmp_path):
+        path = tmp_path / "lines.csv"
+        path.write_bytes(b"aaa\nbb\ncccc\nd\n")
+        with open(path, "rb") as file:
+            ranges = pft._split_ranges(file, 0, 15, 4)
+        assert ranges[0][0] == 0 and ranges[-1][1] == 15
+        for lo, hi in ranges[1:]:
+            assert path.read_bytes()[lo - 1:lo] == b"\n"
+
+
+class TestFastParsers:
+
+    date_samples = ["17-10-2024", "1-1-2025", "01-1-2025", "29-02-2024", "29-02-2023", "00-01-2025", "32-01-2025",
+                    "10-13-2025", "10-00-2025", "10-10-0000", " 1-01-2025", "1-01-2025 ", "2025-01-01", "abcd", "",
+                    "01-01-25", "01-01-20255", "١-01-2025"]
+
+    amount_samples = ["100", "100.5", "100.25", "100.255", "0.01", "007", "-5", "+5", " 12 ", "1e3", "1_000",
+                      "12.", ".5", "abc", "", "NaN", "1,000"]
+
+    @pytest.mark.parametrize("text", date_samples)
+    def test_date_matches_strptime(self, text):
+        try:
+            expected = datetime.strptime(text, "%d-%m-%Y").date()
+        except ValueError:
+            with pytest.raises(ValueError):
+                pft.parse_date(text)
+        else:
+            assert pft.parse_date(text) == expected
+
+    def test_date_type_error(self):
+        with pytest.raises(TypeError):
+            pft.parse_date(None)
+
+    @pytest.mark.parametrize("text", amount_samples)
+    def test_amount_matches_decimal(self, text):
+        try:
+            expected = pft.to_minor_units(Decimal(text))
+        except (ValueError, ArithmeticError):
+            with pytest.raises((ValueError, ArithmeticError)):
+                pft.parse_amount_minor(text)
+        else:
+            assert pft.parse_amount_minor(text) == expected
+
+    def test_valid_functions_share_parsers(self, info_msg):
+        assert pft.valid_date("1-1-2020", info_msg.append) == date(2020, 1, 1)
+        assert pft.valid_amount("₹1,000.50", info_msg.append) == Decimal("1000.50")
+        assert not info_msg
+
+    @pytest.mark.parametrize("text", amount_samples + ["₹1,250.50", "$12.5", "sNaN", "-0"])
+    def test_valid_amount_agrees_with_batch(self, text):
+        #valid_amount keeps the Decimal path for one value, it must still judge like validate_amounts
+        messages = []
+        amount = pft.valid_amount(text.strip(), messages.append)
+        minors, codes = pft.validate_amounts([text.strip()])
+        if codes[0]:
+            assert amount is None and messages == [pft.VALIDATION_MESSAGES[codes[0]]]
+        else:
+            assert pft.to_minor_units(amount) == minors[0] and not messages
+
+
+class TestRunningTotals:
+
+    rows = [(date(2025, 1, 1), "100", "CREDIT", "salary"), (date(2025, 1, 2), "40.50", "Debit", "fun"),
+            (date(2025, 1, 3), "10", "OTHER", "fun")]
+
+    def test_totals_follow_changes(self, make_store, info_msg):
+        store = make_store(self.rows)
+        assert pft.view_summary(store, info_msg.append) == [Decimal("100"), Decimal("40.50"), Decimal("59.50")]
+        del store[1]
+        assert store.totals() == [Decimal("100"), Decimal("0"), Decimal("100")]
+        store.clear()
+        assert store.income == 0 and store.expense == 0
+
+    def test_merge_adds_totals(self, make_store):
+        store = make_store(self.rows)
+        store.merge(make_store(self.rows))
+        assert store.totals()[2] == Decimal("119.00")
+
+    def test_verify_reports_drift(self, make_store, info_msg):
+        store = make_store(self.rows)
+        store.income += 5
+        result = pft.view_summary(store, info_msg.append, verify=True)
+        assert result[0] == Decimal("100")
+        assert any("Summary drift detected" in msg for msg in info_msg)
+
+    def test_verify_clean(self, make_store, info_msg):
+        store = make_store(self.rows)
+        assert store.verify_totals(info_msg.append)
+        assert not info_msg
+
+
+class TestSearchIndexes:
+
+    rows = [(date(2025, 1, i + 1), str(i + 1), ["CREDIT", "Debit", "DEBIT"][i % 3], ["fun", "rent", "travel", "salary"][i % 4])
+            for i in range(12)]
+
+    def assert_consistent(self, store):
+        rows = list(store)
+        for type_ in ("credit", "debit"):
+            expected = [i for i, row in enumerate(rows) if row["Type"].upper() == type_.upper()]
+            assert list(store.positions_by_type(type_)) == expected
+        for desc in ("fun", "rent", "travel", "salary"):
+            expected = [i for i, row in enumerate(rows) if row["Description"] == desc]
+            assert list(store.positions_by_desc(desc)) == expected
+
+    def test_indexes_follow_changes(self, make_store):
+        store = make_store(self.rows)
+        self.assert_consistent(store)
+        del store[3]
+        del store[0]
+        store.insert(2, {"Date": date(2025, 2, 1), "Amount": "9", "Type": "credit", "Description": "travel"})
+        store.append({"Date": date(2025, 2, 2), "Amount": "9", "Type": "DEBIT", "Description": "fun"})
+        self.assert_consistent(store)
+        store.merge(make_store(self.rows))
+        self.assert_consistent(store)
+
+    def test_search_uses_index(self, make_store, info_msg):
+        store = make_store(self.rows)
+        result = pft.search_by_type(store, "debit", info_msg.append)
+        assert len(result) == 8
+        assert all(row["Type"].upper() == "DEBIT" for row in result)
+        assert [row["Amount"] for row in pft.search_by_desc(store, "rent", info_msg.append)] == [Decimal("2"), Decimal("6"), Decimal("10")]
+        assert pft.search_by_desc(store, "medicine", info_msg.append) is None
+        assert "No records found of the given decription" in info_msg
+
+    def test_view_matches_search(self, make_store, info_msg):
+        store = make_store(self.rows)
+        view = pft.TransactionView(store, store.positions_by_type("debit"))
+        assert len(view) == 8
+        assert view == pft.search_by_type(store, "debit", info_msg.append)
+        assert view[-1] == store[11]
+        assert view[1:3] == [store[2], store[4]]
+        #fixed positions cannot follow a delete, a view of the query follows it
+        live = pft.TransactionView(store, lambda : store.positions_by_type("debit"))
+        del store[0]
+        with pytest.raises(RuntimeError):
+            view[0]
+        assert len(live) == 8
+        assert live == pft.search_by_type(store, "debit", info_msg.append)
+        debit = next(i for i, row in enumerate(store) if row["Type"].upper() == "DEBIT")
+        del store[debit]
+        assert len(live) == 7
+        assert list(live) == pft.search_by_type(store, "debit", info_msg.append)
+        store.append({"Date": date(2025, 3, 1), "Amount": "1", "Type": "DEBIT", "Description": "fun"})
+        assert live[-1] == store[-1]
+
+    def test_malformed_rows_do_not_abort(self, info_msg):
+        test_list = [{"Date":"16-10-2025","Amount":"100","Type":None,"Description":"fun"},{"Date":"17-10-2025","Amount":"200","Type":"CREDIT","Description":"fun"}]
+        result = pft.search_by_type(test_list, "CREDIT", info_msg.append)
+        assert len(result) == 1
+        assert "1 corrupted transactions skipped while searching by type" in info_msg
+
+
+class TestDateRange:
+
+    #appended out of date order like a load, so the index starts dirty
+    rows = [(date(2025, 3, 15), "10", "DEBIT", "fun"), (date(2025, 3, 1), "100", "CREDIT", "fun"),
+            (date(2025, 3, 28), "5", "DEBIT", "fun"), (date(2025, 3, 3), "7", "DEBIT", "fun"),
+            (date(2025, 4, 2), "9", "DEBIT", "rent"), (date(2024, 12, 31), "1", "CREDIT", "gift")]
+
+    def assert_index(self, store):
+        store.build_date_index()
+        expected = sorted(range(len(store)), key=lambda i: (store.dates[i], i))
+        assert list(store._date_rows) == expected
+
+    def test_month_helpers(self):
+        assert pft.month_bounds(2024, 2) == (date(2024, 2, 1), date(2024, 2, 29))
+        assert pft.month_bounds(2025, 12) == (date(2025, 12, 1), date(2025, 12, 31))
+        assert pft.year_bounds(2025) == (date(2025, 1, 1), date(2025, 12, 31))
+
+    def test_search_month(self, make_store, info_msg):
+        store = make_store(self.rows, bulk=True)
+        result = pft.search_by_date_range(store, *pft.month_bounds(2025, 3), info_callback=info_msg.append)
+        assert [row["Date"].day for row in result] == [1, 3, 15, 28]
+
+    def test_summary_between(self, make_store, info_msg):
+        store = make_store(self.rows, bulk=True)
+        assert pft.summary_between(store, "01-03-2025", "30-04-2025", info_msg.append) == [Decimal("100"), Decimal("31"), Decimal("69")]
+        assert pft.summary_between(store, "01-01-2020", "31-12-2020", info_msg.append) is None
+        assert "No records found in the given date range" in info_msg
+
+    def test_index_follows_changes(self, make_store):
+        store = make_store(self.rows, bulk=True)
+        self.assert_index(store)
+        store.append({"Date": date(2025, 3, 2), "Amount": "1", "Type": "DEBIT", "Description": "fun"})
+        store.insert(0, {"Date": date(2025, 3, 15), "Amount": "1", "Type": "DEBIT", "Description": "fun"})
+        del store[3]
+        self.assert_index(store)
+        store.merge(make_store(self.rows, bulk=True))
+        self.assert_index(store)
+
+    def test_plain_list(self, info_msg):
+        test_list = [{"Date":"16-10-2025","Amount":"100","Type":"DEBIT","Description":"travel"},
+                     {"Date":"01-10-2025","Amount":"200","Type":"CREDIT","Description":"fun"},
+                     {"Date":"01-11-2025","Amount":"5","Type":"CREDIT","Description":"fun"}]
+        result = pft.search_by_date_range(test_list, "01-10-2025", "31-10-2025", info_msg.append)
+        assert [row["Amount"] for row in result] == ["200", "100"]
+        assert pft.summary_between(test_list, "01-10-2025", "31-10-2025", info_msg.append)[2] == Decimal("100")
+
+    def test_invalid_range(self, make_store, info_msg):
+        store = make_store(self.rows, bulk=True)
+        assert pft.search_by_date_range(store, "31-03-2025", "01-03-2025", info_msg.append) is None
+        assert "Invalid range : start date is after end date" in info_msg
+        assert pft.search_by_date_range(store, "2025-03-01", "01-03-2025", info_msg.append) is None
+        assert "Invalid date : Use DD-MM-YYYY (e.g., 25-12-2024)." in info_msg
+
+
+class TestTombstones:
+
+    rows = ["01-01-2025,100,CREDIT,salary", "02-01-2025,20,DEBIT,fun", "bad,row,DEBIT,fun",
+            "02-01-2025,20,DEBIT,fun", "03-01-2025,5,DEBIT,\"travel, bus\""]
+
+    def test_delete_appends_tombstone(self, tmp_path, ledger, info_msg):
+        path = ledger(self.rows)
+        before = path.read_text(encoding="utf-8")
+        transactions = pft.load_transaction()
+        pft.delete_transaction(transactions, 3, info_msg.append)
+        pft.delete_transaction(transactions, 1, info_msg.append)
+        reloaded = pft.load_transaction()
+        assert path.read_text(encoding="utf-8") == before
+        assert (tmp_path / "transaction.csv.tombstones").exists()
+        assert "Transaction deleted successfully" in info_msg
+        assert reloaded == transactions
+        assert [row["Description"] for row in reloaded] == ["salary", "fun"]
+
+    def test_compaction_rewrites_ledger(self, tmp_path, ledger, info_msg):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction()
+        pft.delete_transaction(transactions, 0, info_msg.append)
+        assert pft.compact_ledger(info_msg.append) == 1
+        reloaded = pft.load_transaction()
+        assert not (tmp_path / "transaction.csv.tombstones").exists()
+        assert not (tmp_path / "transaction.csv.tmp").exists()
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "Date,Amount,Type,Description"
+        assert "bad,row,DEBIT,fun" in lines
+        assert len(lines) == 5
+        assert reloaded == transactions
+
+    def test_background_compaction(self, ledger):
+        ledger(self.rows)
+        with patch.object(pft, "COMPACT_THRESHOLD", 2):
+            transactions = pft.load_transaction()
+            pft.delete_transaction(transactions, 0)
+            with patch("pft.compact_in_background") as mock_compact:
+                pft.delete_transaction(transactions, 0)
+            mock_compact.assert_called_once()
+
+    def test_delete_all_writes_header(self, tmp_path, ledger, info_msg):
+        ledger(self.rows)
+        transactions = pft.load_transaction()
+        pft.delete_transaction(transactions, 0)
+        pft.delete_all(transactions, info_msg.append)
+        pft.save_transaction({"Date": date(2025, 1, 1), "Amount": 5, "Type": "DEBIT", "Description": "fun"})
+        reloaded = pft.load_transaction(info_msg.append)
+        assert not (tmp_path / "transaction.csv.tombstones").exists()
+        assert len(reloaded) == 1
+
+    def test_index_equal_to_length(self, info_msg):
+        test_list = [{"Date":"16-10-2025","Amount":"100","Type":"DEBIT","Description":"travel"}]
+        assert pft.delete_transaction(test_list, 1, info_msg.append) is None
+        assert "Invalid Index: Index is greater than the length of transaction" in info_msg
+
+    def test_delete_keeps_the_order_of_identical_rows(self, tmp_path, ledger, info_msg):
+        #the tombstone cancels the copy that was deleted, not the first identical row
+        ledger(["01-01-2025,5,DEBIT,fun", "02-01-2025,20,DEBIT,rent", "01-01-2025,5,DEBIT,fun",
+                "03-01-2025,8,DEBIT,food", "01-01-2025,5,DEBIT,fun"])
+        transactions = pft.load_transaction()
+        pft.delete_transaction(transactions, 4, info_msg.append)
+        pft.delete_transaction(transactions, 0, info_msg.append)
+        expected = ["rent", "fun", "food"]
+        assert [row["Description"] for row in transactions] == expected
+        assert pft.load_transaction() == transactions
+        assert pft.compact_ledger(info_msg.append) == 2
+        assert [row["Description"] for row in pft.load_transaction()] == expected
+
+    def test_tombstone_count_is_not_reread(self, tmp_path, ledger):
+        ledger(self.rows)
+        transactions = pft.load_transaction()
+        pft.delete_transaction(transactions, 0)
+        tombstones = str(tmp_path / "transaction.csv.tombstones")
+        with patch("builtins.open", wraps=open) as opened:
+            pft.delete_transaction(transactions, 0)
+            pft.delete_transaction(transactions, 0)
+        assert [c.args[1] if len(c.args) > 1 else c.kwargs.get("mode") for c in opened.call_args_list
+                if c.args[0] == tombstones] == ["a", "a"]
+        assert pft._tombstone_count(pft.FILENAME) == 3
+        #a log grown behind the process's back is counted again
+        with open(tombstones, "a", encoding="utf-8") as file:
+            file.write("04-01-2025,1,DEBIT,fun,0\n")
+        assert pft._tombstone_count(pft.FILENAME) == 4
+
+    def test_failed_tombstone_keeps_the_row(self, ledger, info_msg):
+        ledger(self.rows)
+        transactions = pft.load_transaction()
+        with patch("pft._append_tombstone", side_effect=OSError("disk full")):
+            assert pft.delete_transaction(transactions, 0, info_msg.append) is None
+        assert info_msg == ["Error : could not record the deletion - disk full"]
+        #memory still agrees with the ledger, which still holds the row
+        assert transactions == pft.load_transaction()
+        assert transactions.totals() == [Decimal("100"), Decimal("45"), Decimal("55")]
+
+
+class TestAddTransactions:
+
+    def test_batch_with_failures(self, tmp_path, monkeypatch, info_msg):
+        path = tmp_path / "transaction.csv"
+        monkeypatch.setattr(pft, "FILENAME", str(path))
+        entries = [
+            ("01-01-2025", "100", "credit", "Salary"),
+            ("01-01-2099", "100", "credit", "salary"),
+            {"Date": "02-01-2025", "Amount": "₹1,250.50", "Type": "debit", "Description": "rent"},
+            ("03-01-2025", "abc", "debit", "fun"),
+            ("04-01-2025", "10", "", "fun"),
+            ("05-01-2025", "10"),
+        ]
+        transactions = pft.TransactionStore()
+        failures = pft.add_transactions(transactions, entries, info_msg.append, fsync=True)
+        reloaded = pft.load_transaction()
+        assert failures == [
+            (2, "Invalid date : cannot be ahead of today"),
+            (4, "Invalid Amount !! enter only numbers "),
+            (5, "Type cannot be empty"),
+            (6, "Invalid entry : not enough values to unpack (expected 4, got 2)"),
+        ]
+        assert "2 transactions added, 4 failed" in info_msg
+        assert len(transactions) == 2
+        assert reloaded == transactions
+        assert path.read_text(encoding="utf-8").splitlines()[0] == "Date,Amount,Type,Description"
+
+    def test_single_open_per_batch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pft, "FILENAME", str(tmp_path / "transaction.csv"))
+        entries = [("01-01-2025", str(i + 1), "DEBIT", "fun") for i in range(50)]
+        real_open = open
+        with patch("builtins.open", side_effect=real_open) as mock_file:
+            pft.add_transactions([], entries)
+        assert mock_file.call_count == 1
+
+    def test_batch_is_validated_by_column(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(pft, "FILENAME", str(tmp_path / "transaction.csv"))
+        entries = [("01-01-2025", str(i + 1), "DEBIT", "fun") for i in range(20)]
+        entries += [{"Date": "02-01-2025", "Type": "DEBIT", "Description": "fun"}, ("03-01-2025", "1.005", "DEBIT", "fun"),
+                    ("04-01-2025", "7", "DEBIT", " ")]
+        with patch.object(pft, "validate_dates", wraps=pft.validate_dates) as dates, \
+                patch.object(pft, "validate_amounts", wraps=pft.validate_amounts) as amounts, \
+                patch.object(pft, "valid_date", side_effect=AssertionError), \
+                patch.object(pft, "valid_amount", side_effect=AssertionError):
+            failures = pft.add_transactions([], entries)
+        assert dates.call_count == amounts.call_count == 1
+        assert failures == [(21, pft.VALIDATION_MESSAGES[pft.AMOUNT_EMPTY]), (22, pft.VALIDATION_MESSAGES[pft.AMOUNT_PLACES]),
+                            (23, "Description cannot be empty")]
+
+    def test_writer_appends_without_second_header(self, tmp_path, monkeypatch):
+        path = tmp_path / "transaction.csv"
+        monkeypatch.setattr(pft, "FILENAME", str(path))
+        with pft.LedgerWriter() as writer:
+            writer.write({"Date": date(2025, 1, 1), "Amount": Decimal("5"), "Type": "DEBIT", "Description": "fun"})
+        with pft.LedgerWriter() as writer:
+            writer.write({"Date": "02-01-2025", "Amount": Decimal("6"), "Type": "DEBIT", "Description": "fun"})
+        assert writer.written == 1
+        assert path.read_text(encoding="utf-8").count("Date,Amount") == 1
+
+
+class TestSnapshot:
+
+    rows = ["05-01-2025,100,CREDIT,salary", "02-01-2025,20.25,DEBIT,fun", "03-01-2025,5,DEBIT,travel"]
+
+    def test_snapshot_reused(self, tmp_path, ledger):
+        ledger(self.rows)
+        first = pft.load_transaction(snapshot=True)
+        assert (tmp_path / "transaction.csv.snapshot").exists()
+        with patch("pft._read_rows", side_effect=AssertionError("ledger was re-parsed")):
+            second = pft.load_transaction(snapshot=True)
+        assert second == first
+        assert second.totals() == first.totals()
+        assert list(second.positions_by_type("debit")) == [1, 2]
+        assert [row["Description"] for row in pft.search_by_date_range(second, "01-01-2025", "03-01-2025")] == ["fun", "travel"]
+
+    def test_stale_snapshot(self, ledger):
+        ledger(self.rows)
+        first = pft.load_transaction(snapshot=True)
+        pft.save_transaction({"Date": date(2025, 1, 9), "Amount": 7, "Type": "DEBIT", "Description": "fun"})
+        second = pft.load_transaction(snapshot=True)
+        assert len(first) == 3 and len(second) == 4
+        pft.delete_transaction(second, 0)
+        third = pft.load_transaction(snapshot=True)
+        assert third == second
+
+    def test_corrupt_snapshot(self, tmp_path, ledger):
+        ledger(self.rows)
+        first = pft.load_transaction(snapshot=True)
+        snap = tmp_path / "transaction.csv.snapshot"
+        snap.write_bytes(snap.read_bytes()[:40])
+        assert pft.read_snapshot() is None
+        assert pft.load_transaction(snapshot=True) == first
+
+
+class TestReload:
+
+    rows = ["05-01-2025,100,CREDIT,salary", "02-01-2025,20.25,DEBIT,fun"]
+
+    def test_tail_only(self, ledger):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction()
+        assert pft.reload_transaction(transactions) == 0
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("01-01-2025,5,DEBIT,travel\nbad,row,DEBIT,x\n07-01-2025,1")
+        with patch("pft.load_transaction", side_effect=AssertionError("full reload")):
+            assert pft.reload_transaction(transactions) == 1
+            #the half written row is picked up once its newline arrives
+            with open(path, "a", encoding="utf-8") as file:
+                file.write("0,DEBIT,fun\n")
+            assert pft.reload_transaction(transactions) == 1
+        assert transactions == pft.TransactionStore([
+        {"Date": date(2025, 1, 5), "Amount": Decimal("100"), "Type": "CREDIT", "Description": "salary"},
+        {"Date": date(2025, 1, 2), "Amount": Decimal("20.25"), "Type": "DEBIT", "Description": "fun"},
+        {"Date": date(2025, 1, 1), "Amount": Decimal("5"), "Type": "DEBIT", "Description": "travel"},
+        {"Date": date(2025, 1, 7), "Amount": Decimal("10"), "Type": "DEBIT", "Description": "fun"}])
+        assert transactions.totals() == [Decimal("100"), Decimal("35.25"), Decimal("64.75")]
+        assert list(transactions.positions_between(date(2025, 1, 1).toordinal(), date(2025, 1, 2).toordinal())) == [2, 1]
+
+    def test_own_writes_not_read_back(self, ledger):
+        ledger(self.rows)
+        transactions = pft.load_transaction()
+        pft.add_transaction(transactions, "03-01-2025", "7", "debit", "fun")
+        pft.add_transactions(transactions, [("04-01-2025", "8", "debit", "fun")])
+        pft.delete_transaction(transactions, 0)
+        with patch("pft.load_transaction", side_effect=AssertionError("full reload")):
+            assert pft.reload_transaction(transactions) == 0
+        assert len(transactions) == 3
+
+    def test_rewrite_triggers_full_reload(self, ledger):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction()
+        other = pft.load_transaction()
+        pft.delete_transaction(other, 1)
+        assert pft.reload_transaction(transactions) == 1
+        assert transactions == other
+
+        pft.compact_ledger()
+        assert pft.reload_transaction(transactions) == 1
+        path.write_text("Date,Amount,Type,Description\n09-09-2025,1,CREDIT,gift\n", encoding="utf-8")
+        assert pft.reload_transaction(transactions) == 1
+        assert transactions[0]["Description"] == "gift"
+
+        pft.delete_all(other)
+        assert pft.reload_transaction(transactions) == 0
+        assert len(transactions) == 0
+
+    def test_failed_full_reload_keeps_the_rows(self, ledger, info_msg):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction()
+        path.write_text("Date,Amount,Type,Description\n09-09-2025,1,CREDIT,gift\n", encoding="utf-8")
+        with patch("pft._parse_ledger", side_effect=PermissionError("locked")):
+            assert pft.reload_transaction(transactions, info_msg.append) is None
+        assert info_msg == [f"Error : No permission granted to read {pft.FILENAME}"]
+        assert len(transactions) == 2 and transactions.totals() == [Decimal("100"), Decimal("20.25"), Decimal("79.75")]
+        assert pft.reload_transaction(transactions) == 1
+        assert transactions[0]["Description"] == "gift"
+
+
+class TestLoadProgress:
+
+    rows = ["05-01-2025,1,DEBIT,fun"] * 25
+
+    def test_progress_reaches_total(self, ledger):
+        path = ledger(self.rows)
+        seen = []
+        with patch.object(pft, "PROGRESS_ROWS", 10):
+            transactions = pft.load_transaction(progress=lambda done, total: seen.append((done, total)))
+        assert len(transactions) == 25
+        assert len(seen) == 3
+        assert seen[-1] == (path.stat().st_size, path.stat().st_size)
+
+    def test_cancel(self, ledger, info_msg):
+        ledger(self.rows)
+        cancel = threading.Event()
+        def progress(done, total):
+            cancel.set()
+        with patch.object(pft, "PROGRESS_ROWS", 10):
+            assert pft.load_transaction(info_msg.append, progress=progress, cancel=cancel) is None
+            assert not info_msg
+            cancel.clear()
+            assert len(pft.load_transaction(cancel=cancel)) == 25
+
+
+class TestAggregate:
+
+    rows = [
+        {"Date": date(2025, 1, 5), "Amount": "100", "Type": "CREDIT", "Description": "salary"},
+        {"Date": date(2025, 1, 9), "Amount": "20.25", "Type": "debit", "Description": "fun"},
+        {"Date": date(2025, 2, 1), "Amount": "5", "Type": "DEBIT", "Description": "fun"},
+        {"Date": date(2024, 12, 31), "Amount": "10", "Type": "DEBIT", "Description": "rent"},
+    ]
+
+    def test_by_month_and_type(self):
+        store = pft.TransactionStore(self.rows)
+        result = pft.aggregate(store, by=["month", "type"], metrics=["sum", "count", "mean"])
+        assert result == [
+            {"month": "12-2024", "Type": "DEBIT", "sum": Decimal("10.00"), "count": 1, "mean": Decimal("10.00")},
+            {"month": "01-2025", "Type": "CREDIT", "sum": Decimal("100.00"), "count": 1, "mean": Decimal("100.00")},
+            {"month": "01-2025", "Type": "DEBIT", "sum": Decimal("20.25"), "count": 1, "mean": Decimal("20.25")},
+            {"month": "02-2025", "Type": "DEBIT", "sum": Decimal("5.00"), "count": 1, "mean": Decimal("5.00")},
+        ]
+
+    def test_matches_search(self):
+        store = pft.TransactionStore(self.rows)
+        result = pft.aggregate(store, by=["Description"], metrics=["sum", "min", "max", "mean"])
+        fun = next(row for row in result if row["Description"] == "fun")
+        assert fun["sum"] == sum(row["Amount"] for row in pft.search_by_desc(store, "fun"))
+        assert (fun["min"], fun["max"], fun["mean"]) == (Decimal("5.00"), Decimal("20.25"), Decimal("12.62"))
+
+    def test_lists_and_grand_total(self, info_msg):
+        rows = self.rows + [{"Date": "bad", "Amount": "1", "Type": "DEBIT", "Description": "fun"}]
+        assert pft.aggregate(rows, by=[], metrics=["count", "sum"], info_callback=info_msg.append) == [
+            {"count": 4, "sum": Decimal("135.25")}]
+        assert "1 corrupted transactions skipped" in info_msg
+        assert [row["year"] for row in pft.aggregate(rows, by=["year"])] == [2024, 2025]
+
+    def test_stream_is_hashed_without_a_store(self):
+        rows = [dict(row, Date=row["Date"].strftime("%d-%m-%Y")) for row in self.rows] * 3
+        expected = pft.aggregate(pft.TransactionStore(rows), by=["month", "Type", "Description"], metrics=list(pft.METRICS))
+        #rows out of date order used to be inserted one by one into a TransactionStore
+        with patch.object(pft.TransactionStore, "insert_parsed", side_effect=AssertionError("store built")):
+            assert pft.aggregate(iter(rows), by=["month", "Type", "Description"], metrics=list(pft.METRICS)) == expected
+            assert pft.aggregate([rows[:5], rows[5:]], by=["Type"], metrics=["count"]) == [
+                {"Type": "CREDIT", "count": 3}, {"Type": "DEBIT", "count": 9}]
+
+    def test_invalid(self, info_msg):
+        assert pft.aggregate(self.rows, by=["week"], info_callback=info_msg.append) is None
+        assert pft.aggregate(self.rows, metrics=["median"], info_callback=info_msg.append) is None
+        assert pft.aggregate([], info_callback=info_msg.append) is None
+        assert info_msg[0].startswith("Invalid group : week")
+        assert info_msg[1].startswith("Invalid metric : median")
+        assert info_msg[2] == "No transaction records found"
+
+
+class TestRollup:
+
+    rows = ["05-01-2025,100,CREDIT,salary", "09-01-2025,20.25,DEBIT,fun", "01-02-2025,5,DEBIT,fun"]
+
+    def test_matches_aggregate(self, tmp_path, ledger):
+        ledger(self.rows)
+        transactions = pft.load_transaction()
+        assert pft.rollup() == pft.aggregate(transactions, by=["month", "Type", "Description"], metrics=["sum", "count"])
+        assert (tmp_path / "transaction.csv.rollup").exists()
+        assert pft.rollup(by=["year"]) == [{"year": 2025, "sum": Decimal("125.25"), "count": 3}]
+
+    def test_incremental_updates(self, ledger):
+        ledger(self.rows)
+        transactions = pft.load_transaction()
+        pft.build_rollup(transactions)
+        pft.add_transaction(transactions, "10-01-2025", "4.75", "debit", "fun")
+        pft.add_transactions(transactions, [("03-03-2025", "1", "debit", "rent")])
+        pft.delete_transaction(transactions, 0)
+        pft.compact_ledger()
+        with patch("pft.build_rollup", side_effect=AssertionError("rollup was rebuilt")):
+            result = pft.rollup(by=["month", "Description"])
+        assert result == [
+            {"month": "01-2025", "Description": "fun", "sum": Decimal("25.00"), "count": 2},
+            {"month": "02-2025", "Description": "fun", "sum": Decimal("5.00"), "count": 1},
+            {"month": "03-2025", "Description": "rent", "sum": Decimal("1.00"), "count": 1}]
+
+    def test_rebuilt_when_out_of_sync(self, ledger, info_msg):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction()
+        pft.build_rollup(transactions)
+        #another process appends without going through add_transaction
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("02-02-2025,10,DEBIT,fun\n")
+        assert pft.rollup(by=["Type"]) == [
+            {"Type": "CREDIT", "sum": Decimal("100.00"), "count": 1},
+            {"Type": "DEBIT", "sum": Decimal("35.25"), "count": 3}]
+        pft.delete_all(transactions)
+        assert pft.rollup(info_callback=info_msg.append) is None
+        assert "No transaction records found" in info_msg
+        assert pft.rollup(by=["week"], info_callback=info_msg.append) is None
+
+
+class TestCompressedLedger:
+
+    rows = ["01-01-2025,100,CREDIT,salary", "02-01-2025,20.5,DEBIT,fun", "03-01-2025,oops,DEBIT,fun"]
+
+    @pytest.mark.parametrize("codec, suffix", [("gzip", ".gz"), ("bz2", ".bz2"), ("xz", ".xz")])
+    def test_round_trip(self, ledger, info_msg, codec, suffix):
+        ledger(self.rows, "transaction.csv" + suffix, codec)
+        transactions = pft.load_transaction(info_msg.append)
+        assert len(transactions) == 2
+        assert any("error with amounts" in msg for msg in info_msg)
+        assert transactions.source is None
+        pft.add_transaction(transactions, "04-01-2025", "5", "debit", "fun")
+        pft.add_transactions(transactions, [("05-01-2025", "7", "debit", "rent")])
+        pft.delete_transaction(transactions, 1)
+        assert pft.load_transaction() == transactions
+        assert pft.compact_ledger() == 1
+        assert pft._ledger_codec() == codec
+        pft.reload_transaction(transactions)
+        assert transactions == pft.load_transaction()
+        assert pft.view_summary(transactions) == [Decimal("100.00"), Decimal("12.00"), Decimal("88.00")]
+        pft.delete_all(transactions)
+        assert pft._ledger_codec() == codec
+        assert len(pft.load_transaction()) == 0
+
+    def test_detected_by_magic_not_name(self, tmp_path, monkeypatch, ledger):
+        #a gzip ledger that kept the plain name is still read through the codec
+        ledger(self.rows, codec="gzip")
+        assert pft._ledger_codec() == "gzip"
+        assert len(pft.load_transaction(workers=4)) == 2
+        #and a new ledger named .xz is started compressed
+        monkeypatch.setattr(pft, "FILENAME", str(tmp_path / "new.csv.xz"))
+        pft.add_transactions([], [("01-01-2025", "1", "debit", "fun")])
+        assert (tmp_path / "new.csv.xz").read_bytes().startswith(b"\xfd7zXZ\x00")
+        assert len(pft.load_transaction()) == 1
+
+    def test_progress_counts_compressed_bytes(self, ledger):
+        path = ledger([f"01-01-2025,{i % 97 + 1},DEBIT,fun" for i in range(25000)], "transaction.csv.gz", "gzip")
+        seen = []
+        transactions = pft.load_transaction(progress=lambda done, total: seen.append((done, total)))
+        assert len(transactions) == 25000
+        assert seen[-1][0] == seen[-1][1] == path.stat().st_size
+        assert all(done <= total for done, total in seen)
+
+
+class TestBatchValidation:
+
+    dates = ["01-01-2025", "", None, "31-02-2024", "2024/01/05", "01-01-1900", "01-01-2999",
+             "1-1-2025", "01-01-2025", " 01-01-2025", "15-08-1947"]
+    amounts = ["100", "1,250.50", "$12", "₹ 5", "£7.25", "", None, "abc", "0", "0.00", "-5",
+               "1e21", "1e3", "12.345", "Infinity", "99999999999999999999.99", "100000000000000000001"]
+
+    def test_dates_match_valid_date(self):
+        ordinals, codes = pft.validate_dates(self.dates)
+        assert len(ordinals) == len(codes) == len(self.dates)
+        for value, ordinal, code in zip(self.dates, ordinals, codes):
+            messages = []
+            expected = pft.valid_date(value, messages.append)
+            if expected is None:
+                assert messages == [pft.VALIDATION_MESSAGES[code]]
+                assert ordinal == 0
+            else:
+                assert code == pft.VALID and ordinal == expected.toordinal()
+
+    def test_amounts_match_valid_amount(self):
+        minors, codes = pft.validate_amounts(self.amounts)
+        for value, minor, code in zip(self.amounts, minors, codes):
+            messages = []
+            expected = pft.valid_amount(value, messages.append)
+            if expected is None:
+                assert messages == [pft.VALIDATION_MESSAGES[code]], value
+                assert minor == 0
+            else:
+                assert code == pft.VALID and minor == pft.to_minor_units(expected), value
+
+    def test_today_is_fixed_per_batch(self):
+        ordinals, codes = pft.validate_dates(["01-06-2025", "02-06-2025"], today=date(2025, 6, 1))
+        assert list(codes) == [pft.VALID, pft.DATE_FUTURE]
+        assert ordinals[0] == date(2025, 6, 1).toordinal()
+
+    def test_plain_amounts_stay_int64(self):
+        minors, codes = pft.validate_amounts(("10", "0.5", "abc"))
+        assert minors.typecode == "q"
+        assert list(minors) == [1000, 50, 0]
+        assert list(codes) == [pft.VALID, pft.VALID, pft.AMOUNT_INVALID]
+
+
+class TestLoadReport:
+
+    rows = ["01-01-2025,10,DEBIT,fun", "02-01-2025,,DEBIT,fun", "03-01-2025,abc,DEBIT,fun",
+            "31-02-2025,5,DEBIT,fun", "04-01-2025,7,CREDIT,salary", "05-01-2025,x,DEBIT,fun"]
+
+    def test_one_summary_per_load(self, ledger, info_msg):
+        ledger(self.rows)
+        report = pft.LoadReport()
+        transactions = pft.load_transaction(info_msg.append, report=report)
+        assert len(transactions) == 2
+        assert info_msg == ["4 rows skipped - missing values are skipped : 1 (line 3); "
+                            "error with amounts : 2 (lines 4, 7); Error with date : 1 (line 5)"]
+        data = report.to_dict()
+        assert (data["loaded"], data["skipped"]) == (2, 4)
+        assert data["reasons"]["error with amounts"] == {"count": 2, "lines": [4, 7]}
+        assert data["elapsed"] >= 0
+
+    def test_samples_are_capped(self, ledger, info_msg):
+        ledger(["01-01-2025,bad,DEBIT,fun"] * 8)
+        pft.load_transaction(info_msg.append)
+        assert info_msg == ["8 rows skipped - error with amounts : 8 (lines 2, 3, 4, 5, 6, ...)"]
+
+    def test_parallel_lines_match_serial(self, ledger):
+        ledger([f"01-01-2025,{i + 1},DEBIT,fun" if i % 7 else "01-01-2025,bad,DEBIT,fun" for i in range(3000)])
+        serial, parallel = pft.LoadReport(), pft.LoadReport()
+        with patch.object(pft, "PARALLEL_MIN_BYTES", 0):
+            pft.load_transaction(report=serial)
+            pft.load_transaction(workers=3, report=parallel)
+        assert serial.to_dict()["reasons"] == parallel.to_dict()["reasons"]
+        assert serial.samples["error with amounts"] == [2, 9, 16, 23, 30]
+        assert parallel.loaded == serial.loaded == 3000 - 429
+
+    def test_interval_sends_progress_summaries(self, ledger, info_msg):
+        ledger(["01-01-2025,bad,DEBIT,fun"] * 3)
+        pft.load_transaction(info_msg.append, report=pft.LoadReport(interval=0))
+        assert [msg.split(" - ")[0] for msg in info_msg] == ["1 rows skipped", "2 rows skipped", "3 rows skipped"]
+
+    def test_reload_numbers_tail_lines(self, ledger, info_msg):
+        path = ledger(self.rows)
+        transactions = pft.load_transaction()
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("06-01-2025,3,DEBIT,fun\n06-01-2025,,DEBIT,fun\n")
+        assert pft.reload_transaction(transactions, info_msg.append) == 1
+        assert info_msg == ["1 rows skipped - missing values are skipped : 1 (line 9)"]
+
+
+class TestSubPaiseAmounts:
+
+    def test_validators_reject_a_third_place(self, info_msg):
+        assert pft.valid_amount("0.001", info_msg.append) is None
+        assert info_msg == ["Amount can have at most two decimal places"]
+        assert pft.valid_amount("1.500", info_msg.append) == Decimal("1.500")
+        minors, codes = pft.validate_amounts(["1.005", "0.001", "1.500", "₹2.25"])
+        assert list(codes) == [pft.AMOUNT_PLACES, pft.AMOUNT_PLACES, pft.VALID, pft.VALID]
+        assert list(minors) == [0, 0, 150, 225]
+        with pytest.raises(ArithmeticError):
+            pft.to_minor_units("1.005")
+
+    def test_loader_skips_instead_of_rounding(self, ledger, info_msg):
+        ledger(["01-01-2025,1.005,DEBIT,fun", "02-01-2025,0.004,DEBIT,fun", "03-01-2025,2.500,DEBIT,fun"])
+        transactions = pft.load_transaction(info_msg.append)
+        assert [row["Amount"] for row in transactions] == [Decimal("2.50")]
+        assert info_msg == ["2 rows skipped - error with amounts : 2 (lines 2, 3)"]
+        assert pft.view_summary(pft.iter_transactions()) == [Decimal("0.00"), Decimal("2.50"), Decimal("-2.50")]
@@ -0,0 +1,118 @@
+'''
+Author - CodeVaanar
+Date - 18-10-2026
+Desc - A pytest test file to integrate unittesting for the file - storage.py
+'''
+
+import pft
+import storage
+import pytest
+from decimal import Decimal
+from datetime import date
+from unittest.mock import patch
+
+ROWS = [
+    {"Date": date(2025, 1, 1), "Amount": Decimal("1000"), "Type": "CREDIT", "Description": "salary"},
+    {"Date": date(2025, 1, 5), "Amount": Decimal("250.50"), "Type": "DEBIT", "Description": "rent"},
+    {"Date": date(2025, 2, 3), "Amount": Decimal("40"), "Type": "DEBIT", "Description": "fun"},
+    {"Date": date(2025, 1, 20), "Amount": Decimal("60"), "Type": "debit", "Description": "fun"},
+]
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "csv":
+        store = storage.CSVBackend(str(tmp_path / "transaction.csv"))
+    else:
+        store = storage.SQLiteBackend(str(tmp_path / "transaction.db"))
+    store.append(ROWS)
+    yield store
+    store.close()
+
+
+class TestBackends:
+
+    def test_load(self, backend):
+        if isinstance(backend, storage.CSVBackend):
+            #the CSV ledger is written by add_transactions, which upper-cases the type
+            assert backend.load() == [dict(row, Type=row["Type"].upper()) for row in ROWS]
+        else:
+            assert backend.load() == ROWS
+
+    def test_summary(self, backend, info_msg):
+        assert backend.summary(info_callback=info_msg.append) == [Decimal("1000"), Decimal("350.50"), Decimal("649.50")]
+        assert backend.summary(date(2025, 1, 1), date(2025, 1, 31), info_msg.append)[1] == Decimal("310.50")
+
+    def test_searches(self, backend, info_msg):
+        assert [row["Amount"] for row in backend.search_by_type("debit", info_msg.append)] == [Decimal("250.50"), Decimal("40"), Decimal("60")]
+        assert [row["Date"] for row in backend.search_by_desc("fun", info_msg.append)] == [date(2025, 2, 3), date(2025, 1, 20)]
+        assert [row["Description"] for row in backend.search_by_date_range("01-01-2025", "31-01-2025", info_msg.append)] == ["salary", "rent", "fun"]
+        assert backend.search_by_desc("medicine", info_msg.append) is None
+        assert "No records found of the given decription" in info_msg
+
+    def test_delete_and_clear(self, backend, info_msg):
+        backend.delete(1, info_msg.append)
+        assert "Transaction deleted successfully" in info_msg
+        assert [row["Description"] for row in backend.load()] == ["salary", "fun", "fun"]
+        backend.clear(info_msg.append)
+        assert "All transactions deleted successfully " in info_msg
+        assert backend.load() == []
+        assert backend.summary(info_callback=info_msg.append) is None
+
+
+class TestOpenBackend:
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class Partial(storage.StorageBackend):
+            def load(self, info_callback=None):
+                return pft.TransactionStore()
+
+        with pytest.raises(TypeError):
+            Partial()
+
+    def test_picks_backend(self, tmp_path):
+        with storage.open_backend(str(tmp_path / "ledger.db")) as backend:
+            assert isinstance(backend, storage.SQLiteBackend)
+            assert backend.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert isinstance(storage.open_backend(str(tmp_path / "ledger.csv")), storage.CSVBackend)
+
+    def test_csv_backend_leaves_global_alone(self, tmp_path):
+        backend = storage.CSVBackend(str(tmp_path / "other.csv"))
+        backend.append(ROWS[:1])
+        assert pft.FILENAME == "transaction.csv"
+        assert (tmp_path / "other.csv").exists()
+
+    def test_compaction_follows_the_backend_file(self, tmp_path, monkeypatch, info_msg):
+        path = tmp_path / "other.csv"
+        backend = storage.CSVBackend(str(path))
+        backend.append(ROWS)
+        #the delete starts the compaction on another thread, which must still fold the backend's own log
+        monkeypatch.setattr(pft, "FILENAME", str(tmp_path / "default.csv"))
+        monkeypatch.setattr(pft, "COMPACT_THRESHOLD", 1)
+        threads = []
+        background = pft.compact_in_background
+        monkeypatch.setattr(pft, "compact_in_background", lambda **kwargs: threads.append(background(**kwargs)))
+        backend.delete(1, info_msg.append)
+        for thread in threads:
+            thread.join(timeout=5)
+        assert len(threads) == 1
+        assert not (tmp_path / "other.csv.tombstones").exists()
+        assert "250.50" not in path.read_text(encoding="utf-8")
+        assert not list(tmp_path.glob("default.csv*"))
+        assert storage.CSVBackend(str(path)).load() == backend.load()
+
+    def test_csv_append_keeps_reload_and_rollup_current(self, tmp_path, info_msg):
+        path = str(tmp_path / "other.csv")
+        storage.CSVBackend(path).append(ROWS[:2])
+        backend = storage.CSVBackend(path)
+        backend.load()
+        pft.build_rollup(filename=path)
+        assert backend.append(ROWS[2:], info_msg.append) == 2
+        assert "2 transactions added, 0 failed" in info_msg
+        #the backend's own rows are neither read back by a reload nor make the rollup stale
+        with patch.object(pft, "load_transaction", side_effect=AssertionError("full reload")), \
+                patch.object(pft, "build_rollup", side_effect=AssertionError("rollup rebuilt")):
+            assert pft.reload_transaction(backend.transactions, filename=path) == 0
+            assert pft.rollup(by=["Type"], filename=path) == [
+                {"Type": "CREDIT", "sum": Decimal("1000.00"), "count": 1},
+                {"Type": "DEBIT", "sum": Decimal("350.50"), "count": 3}]